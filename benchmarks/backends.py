@@ -0,0 +1,77 @@
+"""
+Compare the execution backends on recursive numeric code.
+
+    python -m benchmarks.backends
+"""
+from time import perf_counter
+from typing import (
+    Callable,
+    Optional,
+)
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.machine import Machine
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.transpiler import compile_program
+
+
+SOURCE = '''
+    fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+    fun count(n, acc) {
+        if (n == 0) { return acc; }
+        return count(n - 1, acc + n * 2);
+    };
+    fib(20) + count(100000, 0);
+'''
+
+
+def _program() -> Program:
+    program = Parser(Lexer(SOURCE)).parse_program()
+    Resolver().resolve(program)
+
+    return program
+
+
+def _evaluator() -> Optional[Object]:
+    return evaluate(_program(), Environment())
+
+
+def _machine() -> Optional[Object]:
+    machine = Machine(_program(), Environment())
+    machine.run()
+
+    return machine.result
+
+
+def _transpiler() -> Optional[Object]:
+    return compile_program(_program()).run()
+
+
+def _measure(name: str, run: Callable[[], Optional[Object]]) -> float:
+    start = perf_counter()
+    result = run()
+    elapsed = perf_counter() - start
+
+    assert result is not None
+    print(f'{name:<12} {elapsed * 1000:10.1f} ms   result {result.inspect()}')
+
+    return elapsed
+
+
+def main() -> None:
+    baseline = _measure('evaluator', _evaluator)
+    _measure('machine', _machine)
+    compiled = _measure('transpiler', _transpiler)
+
+    print(f'transpiler speedup over evaluator: {baseline / compiled:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Throughput of many small independent programs evaluated in this process
+and on a pool with one worker per CPU.
+
+    python -m benchmarks.batch
+"""
+from os import cpu_count
+
+from frl.batch import evaluate_batch
+
+
+PROGRAMS = 2000
+
+SOURCES = [
+    f'fun f(n) {{ if (n < 2) {{ n }} else {{ f(n - 1) + f(n - 2) }} }}; '
+    f'f({index % 12}) + {index}'
+    for index in range(PROGRAMS)
+]
+
+
+def main() -> None:
+    workers = cpu_count() or 1
+
+    single = evaluate_batch(SOURCES, workers=1)
+    print(f'1 worker    {single}')
+
+    if workers == 1:
+        print('only one CPU: nothing to compare against')
+        return
+
+    pool = evaluate_batch(SOURCES, workers=workers)
+    assert [result.value for result in pool.results] == \
+        [result.value for result in single.results]
+
+    print(f'{workers} workers   {pool}')
+    print(f'speedup     {pool.throughput / single.throughput:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
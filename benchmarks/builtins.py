@@ -0,0 +1,66 @@
+"""
+Time the sum of a vector computed by a recursive FRostri function and by
+the built-in sum, which runs its loop in NumPy or C.
+
+    python -m benchmarks.builtins
+"""
+from time import perf_counter
+from typing import Optional
+
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.vector import BACKEND
+
+
+RECURSIVE_SIZE = 50000
+BUILTIN_SIZE = 1000000
+
+RECURSIVE_SOURCE = f'''
+    var values = range({RECURSIVE_SIZE});
+    fun total(i, acc) {{
+        if (i == len(values)) {{ return acc; }}
+        return total(i + 1, acc + values[i]);
+    }};
+    total(0, 0.0);
+'''
+
+BUILTIN_SOURCE = f'''
+    var values = range({BUILTIN_SIZE});
+    sum(values);
+'''
+
+
+def _run(name: str, source: str, size: int) -> float:
+    program = Parser(Lexer(source)).parse_program()
+    Resolver().resolve(program)
+
+    start = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - start
+
+    assert result is not None
+    per_million = elapsed * 1000000 / size
+    print(f'{name:<9} {size:8} elements {elapsed * 1000:9.1f} ms   '
+          f'{per_million * 1000:10.1f} ms per million   '
+          f'result {result.inspect()}')
+
+    return per_million
+
+
+def main() -> None:
+    print(f'backend {BACKEND}')
+
+    recursive = _run('recursive', RECURSIVE_SOURCE, RECURSIVE_SIZE)
+    builtin = _run('builtin', BUILTIN_SOURCE, BUILTIN_SIZE)
+
+    print(f'speedup {recursive / builtin:.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Time running many small programs with one interpreter process each and
+through a single `main.py -` process reading them from standard input.
+
+    python -m benchmarks.cli
+"""
+from os.path import join
+from subprocess import run
+from sys import executable
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+SNIPPETS = 40
+
+SOURCES = [f'fun f(x) {{ x * {index} + 1 }}; f({index})'
+           for index in range(SNIPPETS)]
+
+
+def _one_process_each() -> float:
+    with TemporaryDirectory() as directory:
+        paths = []
+        for index, source in enumerate(SOURCES):
+            path = join(directory, f'{index}.frl')
+            with open(path, 'w') as file:
+                file.write(source)
+            paths.append(path)
+
+        start = perf_counter()
+
+        for path in paths:
+            run([executable, 'main.py', 'run', path],
+                check=True,
+                capture_output=True)
+
+        return perf_counter() - start
+
+
+def _one_stream() -> float:
+    start = perf_counter()
+
+    result = run([executable, 'main.py', '-'],
+                 input='\n'.join(SOURCES),
+                 text=True,
+                 check=True,
+                 capture_output=True)
+    assert len(result.stdout.splitlines()) == SNIPPETS
+
+    return perf_counter() - start
+
+
+def main() -> None:
+    each = _one_process_each()
+    stream = _one_stream()
+
+    print(f'{SNIPPETS} programs')
+    print(f'processes {each * 1000:9.1f} ms')
+    print(f'stream    {stream * 1000:9.1f} ms')
+    print(f'speedup   {each / stream:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Build a list and a map of a million elements one update at a time, with
+the persistent collections and by copying the whole collection on every
+update, which is what immutable values cost without structural sharing.
+
+    python -m benchmarks.collections
+
+Copying is quadratic, so it is timed on a smaller size and scaled up.
+"""
+from time import perf_counter
+from typing import (
+    Callable,
+    Optional,
+)
+
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    map_key,
+    new_integer,
+    Object,
+    PersistentList,
+    PersistentMap,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+SIZE = 1000000
+COPIED_SIZE = 20000
+INTERPRETED_SIZE = 200000
+
+INTERPRETED_SOURCE = f'''
+    fun build(n, l, m) {{
+        if (n == 0) {{ return len(l) + len(m); }}
+        return build(n - 1, push(l, n), put(m, n, n));
+    }};
+    build({INTERPRETED_SIZE}, list(), map());
+'''
+
+
+def _persistent_list(size: int) -> None:
+    values = PersistentList()
+    for index in range(size):
+        values = values.push(new_integer(index))
+
+
+def _copied_list(size: int) -> None:
+    values: list = []
+    for index in range(size):
+        values = [*values, new_integer(index)]
+
+
+def _persistent_map(size: int) -> None:
+    entries = PersistentMap()
+    for index in range(size):
+        key = new_integer(index)
+        entries = entries.put(map_key(key), key, key)
+
+
+def _copied_map(size: int) -> None:
+    entries: dict = {}
+    for index in range(size):
+        key = new_integer(index)
+        entries = {**entries, map_key(key): key}
+
+
+def _time(build: Callable[[int], None], size: int) -> float:
+    start = perf_counter()
+    build(size)
+
+    return perf_counter() - start
+
+
+def _compare(name: str,
+             persistent: Callable[[int], None],
+             copied: Callable[[int], None]) -> None:
+    shared = _time(persistent, SIZE)
+    copying = _time(copied, COPIED_SIZE) * (SIZE / COPIED_SIZE) ** 2
+
+    print(f'{name:<4} persistent {shared:8.2f} s   '
+          f'copying ~{copying:9.0f} s   speedup ~{copying / shared:.0f}x')
+
+
+def main() -> None:
+    print(f'{SIZE} updates')
+    _compare('list', _persistent_list, _copied_list)
+    _compare('map', _persistent_map, _copied_map)
+
+    program = Parser(Lexer(INTERPRETED_SOURCE)).parse_program()
+    Resolver().resolve(program)
+
+    start = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - start
+
+    assert result is not None
+    print(f'frostri recursion, {INTERPRETED_SIZE} pushes and puts: '
+          f'{elapsed:.2f} s   result {result.inspect()}')
+
+
+if __name__ == '__main__':
+    main()
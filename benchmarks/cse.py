@@ -0,0 +1,69 @@
+"""
+Evaluate a program that repeats the same arithmetic in several statements
+before and after common subexpression elimination.
+
+    python -m benchmarks.cse
+"""
+from time import perf_counter
+from typing import Optional
+
+from frl.ast import Program
+from frl.cse import eliminate_common_subexpressions
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+SOURCE = '''
+    fun step(a, b, c) {
+        var low = (a * b + c) - (a - c) * (b - c);
+        var high = (a * b + c) + (a - c) * (b - c);
+        var mid = (a * b + c) / 2;
+        low + high + mid + (a - c) * (b - c)
+    };
+    fun sum(n, acc) {
+        if (n == 0) { return acc; }
+        return sum(n - 1, acc + step(n, n + 1, 3) / 1000);
+    };
+    sum(20000, 0);
+'''
+
+
+def _program() -> Program:
+    program = Parser(Lexer(SOURCE)).parse_program()
+    Resolver().resolve(program)
+
+    return program
+
+
+def _measure(program: Program) -> float:
+    start = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - start
+
+    assert result is not None
+    print(f'    result {result.inspect()}')
+
+    return elapsed
+
+
+def main() -> None:
+    baseline = _measure(_program())
+
+    program = _program()
+    eliminated = eliminate_common_subexpressions(program)
+    optimized = _measure(program)
+
+    print(f'{eliminated} evaluations removed')
+    print(f'repeated {baseline * 1000:9.1f} ms')
+    print(f'cse      {optimized * 1000:9.1f} ms   '
+          f'speedup {baseline / optimized:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Evaluate a helper-heavy program before and after inlining small functions
+and folding constants.
+
+    python -m benchmarks.inlining
+"""
+from time import perf_counter
+from typing import Optional
+
+from frl.ast import Program
+from frl.constant_folding import fold_constants
+from frl.evaluator import evaluate
+from frl.inliner import inline_functions
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+SOURCE = '''
+    fun sq(x) { return x * x; };
+    fun cube(x) { x * x * x };
+    fun add(a, b) { a + b };
+    fun scale() { 2 * 3 };
+    fun norm(a, b) { add(sq(a), sq(b)) };
+    fun sum(n, acc) {
+        if (n == 0) { return acc; }
+        return sum(n - 1, add(acc, norm(n, cube(n)) / scale() + sq(2)));
+    };
+    sum(20000, 0);
+'''
+
+
+def _program() -> Program:
+    program = Parser(Lexer(SOURCE)).parse_program()
+    Resolver().resolve(program)
+
+    return program
+
+
+def _measure(program: Program) -> float:
+    start = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - start
+
+    assert result is not None
+    print(f'    result {result.inspect()}')
+
+    return elapsed
+
+
+def main() -> None:
+    baseline = _measure(_program())
+
+    program = _program()
+    inlined = inline_functions(program, closed_world=True)
+    folded = fold_constants(program)
+    optimized = _measure(program)
+
+    print(f'{inlined} calls inlined, {folded} expressions folded')
+    print(f'calls    {baseline * 1000:9.1f} ms')
+    print(f'inlined  {optimized * 1000:9.1f} ms   '
+          f'speedup {baseline / optimized:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
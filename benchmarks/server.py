@@ -0,0 +1,94 @@
+"""
+Latency of small programs evaluated by a new interpreter process each, by
+an evaluation server one request at a time, and by the same server with
+every request pipelined over one connection.
+
+    python -m benchmarks.server
+"""
+import asyncio
+from os import cpu_count
+from subprocess import run
+from sys import executable
+from time import perf_counter
+from typing import List
+
+from frl.client import EvaluationClient
+from frl.server import (
+    EvaluationServer,
+    percentile,
+)
+
+
+REQUESTS = 400
+PROCESSES = 20
+
+SOURCES = [f'fun f(x) {{ x * {index} + 1 }}; f({index})'
+           for index in range(REQUESTS)]
+
+
+def _report(name: str, latencies: List[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p50 = percentile(latencies, 50) * 1000
+    p99 = percentile(latencies, 99) * 1000
+
+    print(f'{name:<10} p50 {p50:8.2f} ms   p99 {p99:8.2f} ms   '
+          f'{len(latencies) / elapsed:8.0f} programs/s')
+
+
+def _processes() -> None:
+    latencies: List[float] = []
+    start = perf_counter()
+
+    for source in SOURCES[:PROCESSES]:
+        began = perf_counter()
+        run([executable, 'main.py', '-'],
+            input=source,
+            text=True,
+            check=True,
+            capture_output=True)
+        latencies.append(perf_counter() - began)
+
+    _report('processes', latencies, perf_counter() - start)
+
+
+async def _server() -> None:
+    server = EvaluationServer(cpu_count())
+    await server.start(port=0)
+
+    try:
+        client = await EvaluationClient.connect(port=server.address[1])
+
+        latencies: List[float] = []
+        start = perf_counter()
+        for source in SOURCES:
+            began = perf_counter()
+            await client.evaluate(source)
+            latencies.append(perf_counter() - began)
+        _report('sequential', latencies, perf_counter() - start)
+
+        latencies = []
+
+        async def timed(source: str) -> None:
+            began = perf_counter()
+            await client.evaluate(source)
+            latencies.append(perf_counter() - began)
+
+        start = perf_counter()
+        await asyncio.gather(*(timed(source) for source in SOURCES))
+        # Sent all at once, so each waits for the ones before it.
+        _report('pipelined', latencies, perf_counter() - start)
+
+        print(f'server     {await client.stats()}')
+
+        await client.close()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    _processes()
+    asyncio.run(_server())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Time calling into a library of functions from a REPL session that keeps
+it, and from fresh programs that have to define it again every time.
+
+    python -m benchmarks.session
+"""
+from time import perf_counter
+
+from frl.session import Session
+
+
+FUNCTIONS = 100
+CALLS = 50
+
+LIBRARY = '\n'.join(
+    f'fun f{index}(x) {{ if (x > {index}) {{ x - {index} }} else {{ x }} }};'
+    for index in range(FUNCTIONS))
+
+CALL = f'f{FUNCTIONS - 1}(1000)'
+
+
+def _fresh() -> float:
+    start = perf_counter()
+
+    for _ in range(CALLS):
+        Session().run(f'{LIBRARY}\n{CALL}')
+
+    return perf_counter() - start
+
+
+def _persistent() -> float:
+    session = Session()
+    session.run(LIBRARY)
+
+    start = perf_counter()
+
+    for _ in range(CALLS):
+        session.run(CALL)
+
+    return perf_counter() - start
+
+
+def main() -> None:
+    fresh = _fresh()
+    persistent = _persistent()
+
+    print(f'fresh      {fresh * 1000:9.1f} ms')
+    print(f'persistent {persistent * 1000:9.1f} ms')
+    print(f'speedup    {fresh / persistent:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Evaluate numeric programs with and without type-feedback specialization
+of Infix operators.
+
+    python -m benchmarks.specialization
+"""
+from time import perf_counter
+from typing import (
+    Optional,
+    Tuple,
+)
+
+from frl.evaluator import evaluate
+from frl.feedback import (
+    enable_type_feedback,
+    feedback_stats,
+)
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+PROGRAMS = {
+    'integers': '''
+        fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+        fib(22);
+    ''',
+    'floats': '''
+        fun integrate(x, step, acc) {
+            if (x >= 1.0) { return acc; }
+            return integrate(x + step, step, acc + x * x * step);
+        };
+        integrate(0.0, 0.00001, 0.0);
+    ''',
+}
+
+
+def _run(source: str, feedback: bool) -> Tuple[float, int]:
+    program = Parser(Lexer(source)).parse_program()
+    Resolver().resolve(program)
+
+    if feedback:
+        enable_type_feedback(program)
+
+    start = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - start
+
+    assert result is not None
+    deoptimizations = sum(stats.deoptimizations
+                          for stats in feedback_stats(program))
+
+    return elapsed, deoptimizations
+
+
+def main() -> None:
+    for name, source in PROGRAMS.items():
+        generic, _ = _run(source, feedback=False)
+        specialized, deoptimizations = _run(source, feedback=True)
+
+        print(f'{name:<9} generic {generic * 1000:9.1f} ms   '
+              f'specialized {specialized * 1000:9.1f} ms   '
+              f'speedup {generic / specialized:.2f}x   '
+              f'{deoptimizations} deoptimizations')
+
+
+if __name__ == '__main__':
+    main()
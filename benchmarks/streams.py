@@ -0,0 +1,65 @@
+"""
+Peak memory and time of the same map, filter and sum pipeline run over
+lazy streams and with every stage collected into a list first.
+
+    python -m benchmarks.streams
+"""
+from time import perf_counter
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop,
+)
+from typing import Optional
+
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+SIZES = (20000, 40000, 80000)
+
+LAZY_SOURCE = '''
+    var values = stream_map(stream_range(0, {size}), fun(x) {{ x * 3 }});
+    var odd = stream_filter(values, fun(x) {{ x / 2 * 2 != x }});
+    fold(odd, 0, fun(a, x) {{ a + x }});
+'''
+
+EAGER_SOURCE = '''
+    var values = collect(stream_map(stream_range(0, {size}),
+                                    fun(x) {{ x * 3 }}));
+    var odd = collect(stream_filter(stream(values),
+                                    fun(x) {{ x / 2 * 2 != x }}));
+    fold(stream(odd), 0, fun(a, x) {{ a + x }});
+'''
+
+
+def _run(name: str, source: str, size: int) -> None:
+    program = Parser(Lexer(source.format(size=size))).parse_program()
+    Resolver().resolve(program)
+
+    start()
+    began = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - began
+    _, peak = get_traced_memory()
+    stop()
+
+    assert result is not None
+    print(f'{name:<6} {size:>7} {elapsed * 1000:9.1f} ms '
+          f'{peak / 1024:9.1f} KiB peak   {result.inspect()}')
+
+
+def main() -> None:
+    for size in SIZES:
+        _run('lazy', LAZY_SOURCE, size)
+        _run('eager', EAGER_SOURCE, size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Time building a long string one piece at a time, as a rope and by copying
+the whole string on each concatenation, and the same build in FRostri.
+
+    python -m benchmarks.strings
+"""
+from time import perf_counter
+from typing import Optional
+
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+    String,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+PIECES = 20000
+PIECE = 'x' * 40
+
+# Recursion depth is bounded by the evaluator, so the FRostri build nests
+# two loops.
+SOURCE = '''
+    fun inner(n, s) {
+        if (n == 0) { return s; }
+        return inner(n - 1, s + "0123456789");
+    };
+    fun outer(n, s) {
+        if (n == 0) { return s; }
+        return outer(n - 1, inner(200, s));
+    };
+    var text = outer(100, "");
+    len(text) + len(text[100000] + text[199999]);
+'''
+
+
+def _copying() -> float:
+    start = perf_counter()
+
+    # Forces a new string each time, as an immutable flat string would.
+    text = ''
+    for _ in range(PIECES):
+        text = ''.join((text, PIECE))
+
+    return perf_counter() - start
+
+
+def _rope() -> float:
+    start = perf_counter()
+
+    text = String()
+    for _ in range(PIECES):
+        text = text.concat(String(PIECE))
+    assert len(text.value) == PIECES * len(PIECE)
+
+    return perf_counter() - start
+
+
+def _frostri() -> float:
+    program = Parser(Lexer(SOURCE)).parse_program()
+    Resolver().resolve(program)
+
+    start = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - start
+
+    assert result is not None and result.inspect() == '200002'
+
+    return elapsed
+
+
+def main() -> None:
+    copying = _copying()
+    rope = _rope()
+
+    print(f'copying {copying * 1000:9.1f} ms')
+    print(f'rope    {rope * 1000:9.1f} ms')
+    print(f'speedup {copying / rope:.2f}x')
+    print(f'frostri {_frostri() * 1000:9.1f} ms   20000 concatenations')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Evaluate a short and a long-running program with and without tiered
+execution.
+
+    python -m benchmarks.tiering
+"""
+from time import perf_counter
+from typing import Optional
+
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.tiering import (
+    enable_tiering,
+    tier_stats,
+)
+
+
+SHORT = '''
+    fun square(x) { x * x };
+    square(3) + square(4);
+'''
+
+LONG = '''
+    fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+    fib(22);
+'''
+
+
+def _run(source: str, tiered: bool) -> float:
+    program = Parser(Lexer(source)).parse_program()
+    Resolver().resolve(program)
+
+    if tiered:
+        enable_tiering(program)
+
+    start = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - start
+
+    assert result is not None
+    if tiered:
+        for stats in tier_stats(program):
+            print(f'    {stats}')
+
+    return elapsed
+
+
+def main() -> None:
+    for name, source in (('short', SHORT), ('long', LONG)):
+        interpreted = _run(source, tiered=False)
+        tiered = _run(source, tiered=True)
+
+        print(f'{name:<6} interpreted {interpreted * 1000:9.2f} ms   '
+              f'tiered {tiered * 1000:9.2f} ms   '
+              f'speedup {interpreted / tiered:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
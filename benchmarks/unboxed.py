@@ -0,0 +1,59 @@
+"""
+Count the numbers allocated by compiled code for an arithmetic-heavy
+program with boxed and with unboxed intermediate values.
+
+    python -m benchmarks.unboxed
+"""
+from time import perf_counter
+from typing import Optional
+
+from frl.evaluator import evaluate
+from frl.instrumentation import track_allocations
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.tiering import enable_tiering
+
+
+SOURCE = '''
+    fun poly(x) { x * x * x + 2.5 * x * x - x / 3.0 + 1.0 };
+    fun norm(x, y) { (x * x + y * y) * 0.5 };
+    fun sum(n, acc) {
+        if (n == 0) { return acc; }
+        return sum(n - 1, acc + poly(n * 0.001) + norm(n * 0.5, n * 0.25));
+    };
+    sum(20000, 0.0);
+'''
+
+
+def _run(unboxed: bool) -> float:
+    program = Parser(Lexer(SOURCE)).parse_program()
+    Resolver().resolve(program)
+    enable_tiering(program, threshold=1, unboxed=unboxed)
+
+    with track_allocations() as created:
+        start = perf_counter()
+        result: Optional[Object] = evaluate(program, Environment())
+        elapsed = perf_counter() - start
+
+    assert result is not None
+    print(f'{"unboxed" if unboxed else "boxed":<8} '
+          f'{created["Float"]:8} floats  {created["Integer"]:8} integers  '
+          f'{elapsed * 1000:9.1f} ms   result {result.inspect()}')
+
+    return elapsed
+
+
+def main() -> None:
+    boxed = _run(unboxed=False)
+    unboxed = _run(unboxed=True)
+
+    print(f'speedup {boxed / unboxed:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
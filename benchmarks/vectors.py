@@ -0,0 +1,75 @@
+"""
+Time the same elementwise arithmetic done one number at a time by
+recursion and as single vector operations.
+
+    python -m benchmarks.vectors
+"""
+from time import perf_counter
+from typing import Optional
+
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.vector import BACKEND
+
+
+SIZE = 500
+ROUNDS = 40
+
+VALUES = ', '.join(f'{index * 0.5}' for index in range(SIZE))
+
+SCALAR_SOURCE = f'''
+    var values = [{VALUES}];
+    fun scale(i, acc) {{
+        if (i == {SIZE}) {{ return acc; }}
+        var x = values[i];
+        var y = if (x > 10.0) {{ x * 2.0 + 1.0 }} else {{ 0.0 }};
+        return scale(i + 1, acc + y);
+    }};
+    fun rounds(n, acc) {{
+        if (n == 0) {{ return acc; }}
+        return rounds(n - 1, acc + scale(0, 0.0));
+    }};
+    rounds({ROUNDS}, 0.0);
+'''
+
+VECTOR_SOURCE = f'''
+    var values = [{VALUES}];
+    fun rounds(n, acc) {{
+        if (n == 0) {{ return acc; }}
+        return rounds(n - 1, acc + (values * 2.0 + 1.0) * (values > 10.0));
+    }};
+    rounds({ROUNDS}, [{", ".join("0" for _ in range(SIZE))}]);
+'''
+
+
+def _run(name: str, source: str) -> float:
+    program = Parser(Lexer(source)).parse_program()
+    Resolver().resolve(program)
+
+    start = perf_counter()
+    result: Optional[Object] = evaluate(program, Environment())
+    elapsed = perf_counter() - start
+
+    assert result is not None
+    print(f'{name:<8} {elapsed * 1000:9.1f} ms   result {result.type().name}')
+
+    return elapsed
+
+
+def main() -> None:
+    print(f'backend {BACKEND}')
+
+    scalar = _run('scalar', SCALAR_SOURCE)
+    vector = _run('vector', VECTOR_SOURCE)
+
+    print(f'speedup {scalar / vector:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,27 @@ from abc import (
     abstractmethod,
 )
 from typing import (
+    Callable,
+    Dict,
+    Iterator,
     List,
-    Optional
+    Optional,
+    TYPE_CHECKING,
 )
 
 from frl.token import Token
 
+if TYPE_CHECKING:
+    from frl.builtins import Builtin
+    from frl.feedback import TypeFeedback
+    from frl.inline_cache import InlineCache
+    from frl.memoization import ResultCache
+    from frl.object import (
+        Object,
+        ObjectType,
+    )
+    from frl.tiering import Tier
+
 
 class ASTNode(ABC):
 
@@ -34,6 +49,9 @@ class Expression(ASTNode):
 
     def __init__(self, token: Token) -> None:
         self.token = token
+        # Type of every value the expression can produce, when static
+        # inference proved there is only one.
+        self.inferred: Optional['ObjectType'] = None
 
     def token_literal(self) -> str:
         return self.token.literal
@@ -43,6 +61,8 @@ class Program(ASTNode):
 
     def __init__(self, statements: List[Statement]) -> None:
         self.statements = statements
+        # Number of global slots, filled in by the resolver.
+        self.frame_size: int = 0
 
     def token_literal(self) -> str:
         if len(self.statements) > 0:
@@ -65,6 +85,10 @@ class Identifier(Expression):
                  value: str) -> None:
         super().__init__(token)
         self.value = value
+        # Lexical address filled in by the resolver: how many scopes to walk
+        # out and the slot index inside that scope.
+        self.depth: int = -1
+        self.slot: int = -1
 
     def __str__(self) -> str:
         return self.value
@@ -115,6 +139,8 @@ class Integer(Expression):
                  value: Optional[int] = None) -> None:
         super().__init__(token)
         self.value = value
+        # Runtime object for the literal, built once by the resolver.
+        self.constant: Optional['Object'] = None
 
     def __str__(self) -> str:
         return str(self.value)
@@ -127,6 +153,8 @@ class Float(Expression):
                  value: Optional[float] = None) -> None:
         super().__init__(token)
         self.value = value
+        # Runtime object for the literal, built once by the resolver.
+        self.constant: Optional['Object'] = None
 
     def __str__(self) -> str:
         return str(self.value)
@@ -141,6 +169,8 @@ class Prefix(Expression):
         super().__init__(token)
         self.operator = operator
         self.right = right
+        # Operator specialized for the proven type of the operand.
+        self.handler: Optional[Callable[['Object'], 'Object']] = None
 
     def __str__(self) -> str:
         return f'({self.operator}{str(self.right)})'
@@ -157,6 +187,10 @@ class Infix(Expression):
         self.left = left
         self.operator = operator
         self.right = right
+        # Operand types seen so far and the handler specialized for them,
+        # only under type feedback.
+        self.feedback: Optional['TypeFeedback'] = None
+        self.handler: Optional[Callable[['Object', 'Object'], 'Object']] = None
 
     def __str__(self) -> str:
         return f'({str(self.left)} {self.operator} {str(self.right)})'
@@ -174,6 +208,26 @@ class Boolean(Expression):
         return self.token_literal()
 
 
+class String(Expression):
+
+    def __init__(self,
+                 token: Token,
+                 value: Optional[str] = None) -> None:
+        super().__init__(token)
+        self.value = value
+        # Runtime object for the literal, built once by the resolver.
+        self.constant: Optional['Object'] = None
+
+    def __str__(self) -> str:
+        assert self.value is not None
+        escaped = self.value.replace('\\', '\\\\') \
+            .replace('"', '\\"') \
+            .replace('\n', '\\n') \
+            .replace('\t', '\\t')
+
+        return f'"{escaped}"'
+
+
 class Block(Statement):
 
     def __init__(self,
@@ -220,6 +274,16 @@ class Function(Expression):
         self.ident = ident
         self.parameters = parameters
         self.body = body
+        # Number of local slots (parameters included), filled in by the
+        # resolver.
+        self.frame_size: int = 0
+        # Whether the body creates closures over its own environment, which
+        # forbids reusing the environment across tail calls.
+        self.has_closures: bool = False
+        # Results of previous calls, only for functions proven pure.
+        self.cache: Optional['ResultCache'] = None
+        # Call counting and compiled code, only under tiered execution.
+        self.tier: Optional['Tier'] = None
 
     def __str__(self) -> str:
         param_list: List[str] = [str(parameter)
@@ -228,7 +292,8 @@ class Function(Expression):
         params: str = ', '.join(param_list)
 
         if self.ident is not None:
-            return f'{self.token_literal()} {str(self.ident)}({params}) {str(self.body)}'
+            return f'{self.token_literal()} {str(self.ident)}({params}) ' + \
+                str(self.body)
 
         return f'{self.token_literal()}({params}) {str(self.body)}'
 
@@ -242,6 +307,15 @@ class Call(Expression):
         super().__init__(token)
         self.function = function
         self.arguments = arguments
+        # Set by the resolver when the call is the last thing its function
+        # does, so the evaluator can replace the frame instead of growing
+        # the stack.
+        self.tail: bool = False
+        # Last function called from here, set up by the resolver.
+        self.cache: Optional['InlineCache'] = None
+        # Set by the resolver when the callee is a built-in function, which
+        # is then called directly instead of evaluating `function`.
+        self.builtin: Optional['Builtin'] = None
 
     def __str__(self) -> str:
         assert self.arguments is not None
@@ -249,3 +323,98 @@ class Call(Expression):
         args: str = ', '.join(arg_list)
 
         return f'{str(self.function)}({args})'
+
+
+class Vector(Expression):
+
+    def __init__(self,
+                 token: Token,
+                 elements: Optional[List[Expression]] = None) -> None:
+        super().__init__(token)
+        self.elements = elements
+
+    def __str__(self) -> str:
+        assert self.elements is not None
+        elements: str = ', '.join(str(element) for element in self.elements)
+
+        return f'[{elements}]'
+
+
+class Index(Expression):
+
+    def __init__(self,
+                 token: Token,
+                 left: Expression,
+                 index: Optional[Expression] = None) -> None:
+        super().__init__(token)
+        self.left = left
+        self.index = index
+
+    def __str__(self) -> str:
+        return f'({str(self.left)}[{str(self.index)}])'
+
+
+def children(node: ASTNode) -> List[ASTNode]:
+    """
+    Direct children of a node, in evaluation order.
+    """
+    candidates: List[Optional[ASTNode]]
+
+    if isinstance(node, (Program, Block)):
+        candidates = list(node.statements)
+    elif isinstance(node, LetStatement):
+        candidates = [node.name, node.value]
+    elif isinstance(node, ReturnStatement):
+        candidates = [node.return_value]
+    elif isinstance(node, ExpressionStatement):
+        candidates = [node.expression]
+    elif isinstance(node, Prefix):
+        candidates = [node.right]
+    elif isinstance(node, Infix):
+        candidates = [node.left, node.right]
+    elif isinstance(node, If):
+        candidates = [node.condition, node.consequence, node.alternative]
+    elif isinstance(node, Function):
+        candidates = [node.ident, *node.parameters, node.body]
+    elif isinstance(node, Call):
+        candidates = [node.function, *(node.arguments or [])]
+    elif isinstance(node, Vector):
+        candidates = list(node.elements or [])
+    elif isinstance(node, Index):
+        candidates = [node.left, node.index]
+    else:
+        candidates = []
+
+    return [child for child in candidates if child is not None]
+
+
+def walk(node: ASTNode) -> Iterator[ASTNode]:
+    """
+    Yield the node and all its descendants, parents before children.
+    """
+    pending: List[ASTNode] = [node]
+
+    while pending:
+        current = pending.pop()
+        yield current
+
+        pending.extend(reversed(children(current)))
+
+
+def function_names(program: Program) -> Dict[int, str]:
+    """
+    Names of the functions of a program by the id of their node: their own
+    name, or the name of the `var` they are assigned to. Anonymous
+    functions are left out.
+    """
+    names: Dict[int, str] = {}
+
+    for node in walk(program):
+        if isinstance(node, LetStatement) and \
+                isinstance(node.value, Function):
+            assert node.name is not None
+            names.setdefault(id(node.value), node.name.value)
+        elif isinstance(node, Function) and node.ident is not None:
+            names[id(node)] = node.ident.value
+
+    return names
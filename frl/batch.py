@@ -0,0 +1,202 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from os import cpu_count
+from time import perf_counter
+from types import TracebackType
+from typing import (
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+import frl.ast as ast
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Error,
+    ObjectType,
+)
+from frl.parser import Parser
+from frl.pipeline import (
+    DEFAULT_OPTIMIZATION_LEVEL,
+    optimization_pipeline,
+)
+from frl.resolver import Resolver
+
+
+DEFAULT_CHUNK_SIZE = 64
+# Parsed programs kept by each worker.
+PARSE_CACHE_SIZE = 1024
+
+
+class ProgramResult(NamedTuple):
+    # Type name and text of the value, both None when the program has no
+    # value or does not run.
+    type_name: Optional[str]
+    value: Optional[str]
+    # Parser or resolver errors. Errors at run time are values of type
+    # ERROR, the Python exceptions that stop an evaluation too.
+    errors: Tuple[str, ...]
+    time: float
+
+    @property
+    def failed(self) -> bool:
+        return len(self.errors) > 0 or self.type_name == ObjectType.ERROR.name
+
+
+class BatchReport(NamedTuple):
+    # In the order of the programs.
+    results: List[ProgramResult]
+    workers: int
+    elapsed: float
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for result in self.results if result.failed)
+
+    @property
+    def throughput(self) -> float:
+        """Programs per second."""
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f'{len(self.results)} programs, {self.failed} failed, ' + \
+            f'{self.elapsed:.2f} s on {self.workers} workers, ' + \
+            f'{self.throughput:.0f} programs/s'
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(source: str,
+           optimization_level: int) -> Tuple[Optional[ast.Program],
+                                             Tuple[str, ...]]:
+    # Runs in the workers, which keep the programs they have already seen.
+    # A program holds no state between runs but its caches, which only
+    # remember pure results, so it can be evaluated again.
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+
+    if len(parser.errors) > 0:
+        return None, tuple(parser.errors)
+
+    resolver = Resolver()
+    resolver.resolve(program)
+
+    if len(resolver.errors) > 0:
+        return None, tuple(resolver.errors)
+
+    optimization_pipeline(optimization_level).run(program)
+
+    return program, ()
+
+
+def run_program(source: str, optimization_level: int) -> ProgramResult:
+    """
+    Evaluate one program in a fresh environment. It never raises: a
+    failure of the program is its result. Meant to run in the workers,
+    which reuse the programs they have already parsed.
+    """
+    start = perf_counter()
+
+    try:
+        program, errors = _parse(source, optimization_level)
+        evaluated = None if program is None \
+            else evaluate(program, Environment())
+    except Exception as exception:
+        # Such as a RecursionError: it only fails this program.
+        error = Error(f'{type(exception).__name__}: {exception}')
+
+        return ProgramResult(error.type().name,
+                             error.inspect(),
+                             (),
+                             perf_counter() - start)
+
+    elapsed = perf_counter() - start
+
+    if evaluated is None:
+        return ProgramResult(None, None, errors, elapsed)
+
+    return ProgramResult(evaluated.type().name,
+                         evaluated.inspect(),
+                         errors,
+                         elapsed)
+
+
+def _run_chunk(sources: Sequence[str],
+               optimization_level: int) -> List[ProgramResult]:
+    return [run_program(source, optimization_level) for source in sources]
+
+
+class BatchEvaluator:
+    """
+    Evaluate many independent programs on a pool of worker processes, so
+    that they run on every core in spite of the GIL.
+
+        with BatchEvaluator() as batch:
+            report = batch.run(sources)
+        print(report)
+
+    Every program runs in an environment of its own, so it cannot see or
+    break the others. Programs are sent in chunks to amortize the cost of
+    sending them between processes. The workers stay alive between calls
+    to run, with frl already imported and the programs they have already
+    parsed in a cache. With a single worker everything runs in this
+    process.
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.workers = workers if workers is not None else cpu_count() or 1
+        self.optimization_level = optimization_level
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(self.workers)
+
+    def __enter__(self) -> 'BatchEvaluator':
+        return self
+
+    def __exit__(self,
+                 exception_type: Optional[Type[BaseException]],
+                 exception: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def run(self, sources: Sequence[str]) -> BatchReport:
+        start = perf_counter()
+        chunks = [sources[index:index + self.chunk_size]
+                  for index in range(0, len(sources), self.chunk_size)]
+
+        if self._executor is None:
+            finished = [_run_chunk(chunk, self.optimization_level)
+                        for chunk in chunks]
+        else:
+            # map keeps the order of the chunks.
+            finished = list(self._executor.map(
+                _run_chunk,
+                chunks,
+                [self.optimization_level] * len(chunks)))
+
+        results = [result for chunk in finished for result in chunk]
+
+        return BatchReport(results, self.workers, perf_counter() - start)
+
+
+def evaluate_batch(sources: Sequence[str],
+                   workers: Optional[int] = None,
+                   optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchReport:
+    """Evaluate the programs once on a new BatchEvaluator."""
+    with BatchEvaluator(workers, optimization_level, chunk_size) as batch:
+        return batch.run(sources)
@@ -0,0 +1,330 @@
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from frl.evaluator import (
+    apply_function,
+    INDEX_OUT_OF_RANGE,
+    is_truthy,
+    new_error,
+    NULL,
+    VECTOR_LENGTH_MISMATCH,
+    WRONG_NUMBER_OF_ARGUMENTS,
+)
+from frl.object import (
+    Error,
+    Float,
+    Integer,
+    map_key,
+    new_integer,
+    Object,
+    ObjectType,
+    PersistentList,
+    PersistentMap,
+    Stream,
+    String,
+    Vector,
+)
+from frl.vector import (
+    vector_cumsum,
+    vector_dot,
+    vector_filter_greater,
+    vector_filter_less,
+    vector_max,
+    vector_min,
+    vector_range,
+    vector_sum,
+)
+
+
+_EMPTY_VECTOR = 'Empty vector in {}'
+_UNSUPPORTED_KEY = 'Unsupported map key: {}'
+_WRONG_ARGUMENT_TYPE = 'Wrong argument type for {}: expected {}, got {}'
+
+# Types accepted by each parameter, by name. Any value is accepted when
+# there are none.
+_ANY: Tuple[str, ...] = ()
+_COLLECTION = ('VECTOR', 'LIST', 'MAP', 'STRING')
+_FUNCTION = ('FUNCTION',)
+_INTEGER = ('INTEGERS',)
+_LIST = ('LIST',)
+_MAP = ('MAP',)
+_NUMBER = ('INTEGERS', 'FLOAT')
+_SEQUENCE = ('VECTOR', 'LIST', 'STRING', 'STREAM')
+_STREAM = ('STREAM',)
+_VECTOR = ('VECTOR',)
+
+# How a backend calls one of its function values with some arguments.
+Apply = Callable[[Object, List[Object]], Object]
+
+
+class BuiltinError(Exception):
+    """
+    Raised by the implementation of a built-in function for arguments of
+    the right types that it still cannot work with.
+    """
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+class Builtin(NamedTuple):
+    name: str
+    parameters: Tuple[Tuple[str, ...], ...]
+    # None when the result can be of any type.
+    returns: Optional[ObjectType]
+    # Numbers and vectors are passed raw, as Python numbers and the
+    # storage of the vector, so the loops run over the storage. Other
+    # values are passed as objects. It returns a Python number or an
+    # object.
+    function: Callable[..., Any]
+    # Whether the function calls function values, through the apply
+    # function it then takes as first argument.
+    calls: bool = False
+
+    def call(self,
+             args: List[Object],
+             apply: Apply = apply_function) -> Object:
+        """
+        Call the function with evaluated arguments. The whole loop over a
+        vector runs inside NumPy or a C builtin, never through evaluate.
+        Backends whose function values are not evaluator functions pass
+        their own way of calling them.
+        """
+        message = argument_error(self, [arg.type().name for arg in args])
+        if message is not None:
+            return new_error(message)
+
+        raw = [_raw(arg) if parameter else arg
+               for parameter, arg in zip(self.parameters, args)]
+
+        try:
+            result = self.function(apply, *raw) if self.calls \
+                else self.function(*raw)
+        except BuiltinError as error:
+            return new_error(error.message)
+
+        if isinstance(result, Object):
+            return result
+        elif self.returns == ObjectType.INTEGERS:
+            return new_integer(result)
+
+        return Float(result)
+
+
+def _non_empty(name: str, reduction: Callable[[Any], float]) -> Callable:
+    def function(values: Any) -> float:
+        if len(values) == 0:
+            raise BuiltinError(_EMPTY_VECTOR.format(name))
+
+        return reduction(values)
+
+    return function
+
+
+def _dot(left: Any, right: Any) -> float:
+    if len(left) != len(right):
+        raise BuiltinError(
+            VECTOR_LENGTH_MISMATCH.format(len(left), len(right)))
+
+    return vector_dot(left, right)
+
+
+def _mean(values: Any) -> float:
+    return vector_sum(values) / len(values)
+
+
+def _raw(arg: Object) -> Any:
+    if type(arg) == Vector:
+        return cast(Vector, arg).values
+    elif type(arg) == Integer or type(arg) == Float:
+        return arg.value  # type: ignore
+
+    return arg
+
+
+def _size(collection: Any) -> int:
+    # The storage of a vector, or a list, a map or a string.
+    if type(collection) == String:
+        return cast(String, collection).length
+
+    if isinstance(collection, Object):
+        return cast(Union[PersistentList, PersistentMap], collection).count
+
+    return len(collection)
+
+
+def _string(value: Object) -> String:
+    return value if type(value) == String else String(value.inspect())
+
+
+def _nth(values: PersistentList, index: int) -> Object:
+    if index < 0 or index >= values.count:
+        raise BuiltinError(INDEX_OUT_OF_RANGE.format(index))
+
+    return values.get(index)
+
+
+def _update(values: PersistentList,
+            index: int,
+            value: Object) -> PersistentList:
+    if index < 0 or index >= values.count:
+        raise BuiltinError(INDEX_OUT_OF_RANGE.format(index))
+
+    return values.set(index, value)
+
+
+def _key(key: Object) -> Hashable:
+    hashable = map_key(key)
+    if hashable is None:
+        raise BuiltinError(_UNSUPPORTED_KEY.format(key.type().name))
+
+    return hashable
+
+
+def _put(entries: PersistentMap,
+         key: Object,
+         value: Object) -> PersistentMap:
+    return entries.put(_key(key), key, value)
+
+
+def _lookup(entries: PersistentMap, key: Object) -> Object:
+    value = entries.get(_key(key))
+
+    return NULL if value is None else value
+
+
+def _checked(result: Object) -> Object:
+    # Errors of the functions a stream calls abort whatever consumes it.
+    if type(result) == Error:
+        raise BuiltinError(cast(Error, result).message)
+
+    return result
+
+
+def _stream(values: Any) -> Stream:
+    if type(values) == Stream:
+        return values
+    elif type(values) == PersistentList:
+        return Stream(cast(PersistentList, values).__iter__)
+    elif type(values) == String:
+        text = cast(String, values)
+        return Stream(lambda: (String(char) for char in text.value))
+
+    # The storage of a vector.
+    return Stream(lambda: (Float(float(value)) for value in values))
+
+
+def _stream_range(start: int, end: int) -> Stream:
+    return Stream(lambda: map(new_integer, range(start, end)))
+
+
+def _iterate(apply: Apply, seed: Object, function: Object) -> Stream:
+    def elements() -> Iterator[Object]:
+        value = seed
+        while True:
+            yield value
+            value = _checked(apply(function, [value]))
+
+    return Stream(elements)
+
+
+def _stream_map(apply: Apply, values: Stream, function: Object) -> Stream:
+    return Stream(lambda: (_checked(apply(function, [value]))
+                           for value in values))
+
+
+def _stream_filter(apply: Apply, values: Stream, function: Object) -> Stream:
+    return Stream(lambda: (value for value in values
+                           if is_truthy(_checked(apply(function, [value])))))
+
+
+def _take(values: Stream, count: int) -> Stream:
+    return Stream(lambda: islice(values, max(count, 0)))
+
+
+def _collect(values: Stream) -> PersistentList:
+    collected = PersistentList()
+    for value in values:
+        collected = collected.push(value)
+
+    return collected
+
+
+def _fold(apply: Apply,
+          values: Stream,
+          initial: Object,
+          function: Object) -> Object:
+    result = initial
+    for value in values:
+        result = _checked(apply(function, [result, value]))
+
+    return result
+
+
+# Looked up by the resolver for names no scope of the program declares.
+BUILTINS: Dict[str, Builtin] = {builtin.name: builtin for builtin in [
+    Builtin('sum', (_VECTOR,), ObjectType.FLOAT, vector_sum),
+    Builtin('min', (_VECTOR,), ObjectType.FLOAT,
+            _non_empty('min', vector_min)),
+    Builtin('max', (_VECTOR,), ObjectType.FLOAT,
+            _non_empty('max', vector_max)),
+    Builtin('mean', (_VECTOR,), ObjectType.FLOAT, _non_empty('mean', _mean)),
+    Builtin('dot', (_VECTOR, _VECTOR), ObjectType.FLOAT, _dot),
+    Builtin('cumsum', (_VECTOR,), ObjectType.VECTOR, vector_cumsum),
+    Builtin('filter_gt', (_VECTOR, _NUMBER), ObjectType.VECTOR,
+            vector_filter_greater),
+    Builtin('filter_lt', (_VECTOR, _NUMBER), ObjectType.VECTOR,
+            vector_filter_less),
+    Builtin('len', (_COLLECTION,), ObjectType.INTEGERS, _size),
+    Builtin('range', (_INTEGER,), ObjectType.VECTOR, vector_range),
+    Builtin('string', (_ANY,), ObjectType.STRING, _string),
+    Builtin('list', (), ObjectType.LIST, PersistentList),
+    Builtin('push', (_LIST, _ANY), ObjectType.LIST, PersistentList.push),
+    Builtin('nth', (_LIST, _INTEGER), None, _nth),
+    Builtin('update', (_LIST, _INTEGER, _ANY), ObjectType.LIST, _update),
+    Builtin('map', (), ObjectType.MAP, PersistentMap),
+    Builtin('put', (_MAP, _ANY, _ANY), ObjectType.MAP, _put),
+    Builtin('lookup', (_MAP, _ANY), None, _lookup),
+    Builtin('stream', (_SEQUENCE,), ObjectType.STREAM, _stream),
+    Builtin('stream_range', (_INTEGER, _INTEGER), ObjectType.STREAM,
+            _stream_range),
+    Builtin('iterate', (_ANY, _FUNCTION), ObjectType.STREAM, _iterate, True),
+    Builtin('stream_map', (_STREAM, _FUNCTION), ObjectType.STREAM,
+            _stream_map, True),
+    Builtin('stream_filter', (_STREAM, _FUNCTION), ObjectType.STREAM,
+            _stream_filter, True),
+    Builtin('take', (_STREAM, _INTEGER), ObjectType.STREAM, _take),
+    Builtin('collect', (_STREAM,), ObjectType.LIST, _collect),
+    Builtin('fold', (_STREAM, _ANY, _FUNCTION), None, _fold, True),
+]}
+
+
+def argument_error(builtin: Builtin, type_names: List[str]) -> Optional[str]:
+    """
+    The message for calling the built-in function with arguments of the
+    given types, or None when they are valid.
+    """
+    if len(type_names) != len(builtin.parameters):
+        return WRONG_NUMBER_OF_ARGUMENTS.format(len(builtin.parameters),
+                                                len(type_names))
+
+    for parameter, type_name in zip(builtin.parameters, type_names):
+        if parameter and type_name not in parameter:
+            return _WRONG_ARGUMENT_TYPE.format(builtin.name,
+                                               ' or '.join(parameter),
+                                               type_name)
+
+    return None
@@ -0,0 +1,211 @@
+import asyncio
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+)
+
+from frl.batch import evaluate_batch
+from frl.client import EvaluationClient
+from frl.object import Error
+from frl.pipeline import DEFAULT_OPTIMIZATION_LEVEL
+from frl.server import serve
+from frl.session import Session
+
+
+# Exit codes of the runner.
+EXIT_OK = 0
+# A program evaluated to an error.
+EXIT_ERROR = 1
+# A program could not be parsed or resolved, or a file could not be read.
+EXIT_INVALID = 2
+
+
+def run_source(source: str,
+               output: TextIO,
+               errors: TextIO,
+               optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL) -> int:
+    """
+    Run a whole program and print its value, if it has one, to output and
+    its errors to errors.
+
+    :rtype int: The exit code.
+    """
+    session = Session(optimization_level)
+    evaluated = session.run(source)
+
+    if len(session.errors) > 0:
+        for message in session.errors:
+            print(message, file=errors)
+
+        return EXIT_INVALID
+    elif evaluated is None:
+        return EXIT_OK
+    elif type(evaluated) == Error:
+        print(evaluated.inspect(), file=errors)
+
+        return EXIT_ERROR
+
+    print(evaluated.inspect(), file=output)
+
+    return EXIT_OK
+
+
+def run_file(path: str,
+             output: TextIO,
+             errors: TextIO,
+             optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL) -> int:
+    """Run the program of a file. See run_source."""
+    source = _read(path, errors)
+    if source is None:
+        return EXIT_INVALID
+
+    return run_source(source, output, errors, optimization_level)
+
+
+def read_files(paths: Sequence[str], errors: TextIO) -> Optional[List[str]]:
+    """The programs of the files, or None when one cannot be read."""
+    sources = [_read(path, errors) for path in paths]
+
+    return None if None in sources else sources  # type: ignore
+
+
+def _read(path: str, errors: TextIO) -> Optional[str]:
+    try:
+        with open(path, encoding='utf-8') as source_file:
+            return source_file.read()
+    except OSError as error:
+        print(f'Cannot read {path}: {error.strerror}', file=errors)
+
+        return None
+
+
+def run_lines(lines: Iterable[str],
+              output: TextIO,
+              optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL) -> int:
+    """
+    Run each line as a program, in one session, as soon as it is read, and
+    print exactly one line for it: its value, its errors or nothing. Every
+    line runs even after a failure.
+
+    Lines share the globals of the session, so a first line can define
+    functions for the rest, and no line pays for setting up the
+    interpreter.
+
+    :rtype int: The highest exit code of the lines.
+    """
+    session = Session(optimization_level)
+    code = EXIT_OK
+
+    for line in lines:
+        evaluated = session.run(line)
+        code = max(code, _print_result(
+            output,
+            None if evaluated is None else evaluated.inspect(),
+            type(evaluated) == Error,
+            session.errors))
+
+        # Whoever reads the other end of a pipe gets each result at once.
+        output.flush()
+
+    return code
+
+
+def _print_result(output: TextIO,
+                  value: Optional[str],
+                  failed: bool,
+                  errors: Sequence[str]) -> int:
+    # One line for the result of a program, see run_lines. It returns the
+    # exit code of the program.
+    if len(errors) > 0:
+        print('; '.join(errors), file=output)
+
+        return EXIT_INVALID
+
+    print('' if value is None else value, file=output)
+
+    return EXIT_ERROR if failed else EXIT_OK
+
+
+def run_batch(sources: Sequence[str],
+              output: TextIO,
+              errors: TextIO,
+              workers: Optional[int] = None,
+              optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL) -> int:
+    """
+    Run independent programs on a pool of processes, see frl.batch. It
+    prints one line for each program, in order, as run_lines does, and the
+    throughput of the whole batch to errors.
+
+    :rtype int: The highest exit code of the programs.
+    """
+    report = evaluate_batch(sources, workers, optimization_level)
+    code = EXIT_OK
+
+    for result in report.results:
+        code = max(code, _print_result(output,
+                                       result.value,
+                                       result.failed,
+                                       result.errors))
+
+    print(report, file=errors)
+
+    return code
+
+
+def run_server(path: Optional[str],
+               host: str,
+               port: int,
+               workers: Optional[int] = None,
+               optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL) -> None:
+    """Run an evaluation server, see frl.server, until interrupted."""
+    try:
+        asyncio.run(serve(path, host, port, workers, optimization_level))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_client(sources: Sequence[str],
+               output: TextIO,
+               errors: TextIO,
+               path: Optional[str],
+               host: str,
+               port: int) -> int:
+    """
+    Send the programs to an evaluation server, all at once, and print one
+    line for each, in order, as run_lines does, and the statistics of the
+    server to errors.
+
+    :rtype int: The highest exit code of the programs.
+    """
+    async def evaluate() -> List[Dict[str, Any]]:
+        client = await EvaluationClient.connect(path, host, port)
+
+        try:
+            responses = await client.evaluate_all(sources)
+            print(await client.stats(), file=errors)
+        finally:
+            await client.close()
+
+        return responses
+
+    try:
+        responses = asyncio.run(evaluate())
+    except OSError as error:
+        print(f'Cannot connect to the server: {error.strerror}', file=errors)
+
+        return EXIT_INVALID
+
+    code = EXIT_OK
+
+    for response in responses:
+        code = max(code, _print_result(output,
+                                       response['value'],
+                                       response['type'] == 'ERROR',
+                                       response['errors']))
+
+    return code
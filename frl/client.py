@@ -0,0 +1,132 @@
+import asyncio
+import json
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+from frl.server import (
+    DEFAULT_HOST,
+    DEFAULT_LINE_LIMIT,
+    DEFAULT_PORT,
+    LineTooLong,
+    read_line,
+)
+
+
+class EvaluationClient:
+    """
+    Client of an EvaluationServer. Requests are pipelined: each one is
+    sent right away and its answer is matched by id whenever it comes, so
+    evaluate_all keeps every worker of the server busy over a single
+    connection.
+
+        client = await EvaluationClient.connect(port=7878)
+        results = await client.evaluate_all(['1 + 1', 'fun(x) { x }'])
+        await client.close()
+    """
+
+    def __init__(self,
+                 reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._next_id: int = 0
+        self._waiting: Dict[int, 'asyncio.Future[Dict[str, Any]]'] = {}
+        self._receiving = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(
+            cls,
+            path: Optional[str] = None,
+            host: str = DEFAULT_HOST,
+            port: int = DEFAULT_PORT,
+            line_limit: int = DEFAULT_LINE_LIMIT) -> 'EvaluationClient':
+        """
+        Connect to a Unix socket when there is a path, or to TCP. Answers
+        longer than line_limit fail with an error.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(
+                path, limit=line_limit)
+        else:
+            reader, writer = await asyncio.open_connection(
+                host, port, limit=line_limit)
+
+        return cls(reader, writer)
+
+    async def evaluate(self, source: str) -> Dict[str, Any]:
+        """
+        The answer of the server for a program: its type, value, errors and
+        time of evaluation.
+        """
+        return await self._request({'source': source})
+
+    async def evaluate_all(self,
+                           sources: Sequence[str]) -> List[Dict[str, Any]]:
+        """The answers for the programs, in the same order."""
+        return list(await asyncio.gather(*(self.evaluate(source)
+                                           for source in sources)))
+
+    async def stats(self) -> Dict[str, Any]:
+        """Pending requests and latency percentiles of the server."""
+        response = await self._request({'command': 'stats'})
+
+        return response['stats']
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._receiving
+
+    async def _request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if self._receiving.done():
+            raise ConnectionError('Connection closed')
+
+        request_id = self._next_id
+        self._next_id += 1
+
+        answer: 'asyncio.Future[Dict[str, Any]]' = \
+            asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = answer
+
+        self._writer.write(json.dumps({'id': request_id, **request}).encode()
+                           + b'\n')
+        await self._writer.drain()
+
+        return await answer
+
+    async def _receive(self) -> None:
+        # Decoded from a line, or made up for a line too long to read.
+        response: Any
+
+        try:
+            while True:
+                try:
+                    line = await read_line(self._reader)
+                except LineTooLong as error:
+                    response = {'id': error.id, 'error': 'Response too long'}
+                else:
+                    if not line:
+                        break
+
+                    response = json.loads(line)
+
+                answer = self._waiting.pop(response.get('id'), None)
+
+                if answer is None or answer.done():
+                    continue
+                elif 'error' in response:
+                    answer.set_exception(ValueError(response['error']))
+                else:
+                    answer.set_result(response)
+        finally:
+            # The server is gone, or sent an answer that cannot be read:
+            # nobody will answer. close() raises the error, if any.
+            for answer in self._waiting.values():
+                if not answer.done():
+                    answer.set_exception(ConnectionError('Connection closed'))
+            self._waiting.clear()
@@ -0,0 +1,569 @@
+from operator import (
+    add,
+    eq,
+    ge,
+    gt,
+    le,
+    lt,
+    mul,
+    ne,
+    sub,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    cast,
+    List,
+    Optional,
+)
+
+import frl.ast as ast
+from frl.evaluator import (
+    ABRUPT,
+    apply_function,
+    DIVISION_BY_ZERO,
+    evaluate_index_expression,
+    evaluate_infix_expression,
+    evaluate_prefix_expression,
+    is_truthy,
+    new_error,
+    NOT_INITIALIZED,
+    NULL,
+    to_boolean_object,
+    vector_from_objects,
+)
+from frl.object import (
+    Environment,
+    Error,
+    Float,
+    Function,
+    Integer,
+    new_integer,
+    Object,
+    Return,
+    TailCall,
+)
+
+
+# A compiled node: runs it in an environment and returns what `evaluate`
+# would return for it.
+Code = Callable[[Environment], Optional[Object]]
+
+# A compiled arithmetic node in unboxed mode: returns a raw Python int or
+# float, or the object `evaluate` would return when that is not a number.
+RawCode = Callable[[Environment], Any]
+
+_RAW_ARITHMETIC: Dict[str, Callable[[Any, Any], Any]] = {
+    '+': add,
+    '-': sub,
+    '*': mul,
+}
+
+_RAW_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    '<': lt,
+    '<=': le,
+    '>': gt,
+    '>=': ge,
+    '==': eq,
+    '!=': ne,
+}
+
+_UNBOXED_OPERATORS = ('+', '-', '*', '/', *_RAW_COMPARISONS)
+
+
+def compile_function(function: ast.Function, unboxed: bool = False) -> Code:
+    """
+    Compile the body of a resolved function into a tree of Python closures.
+
+    Every node is inspected once, at compile time, so running the result
+    skips the type dispatch of `evaluate` and reads its operands, slots and
+    constants from closure cells. The result has the same behaviour as
+    `_evaluate_block` on the body, Return, Error and TailCall included.
+
+    With unboxed, the inner operators of arithmetic expressions such as
+    `a * b + c` work on raw Python numbers and only the value of the whole
+    expression, the one that gets bound, returned or passed on, is wrapped
+    in an Integer or Float.
+    """
+    assert function.body is not None
+
+    return _compile_block(function.body, unboxed)
+
+
+def _compile(node: Optional[ast.ASTNode], unboxed: bool) -> Code:
+    node_type = type(node)
+
+    if node_type == ast.ExpressionStatement:
+        node = cast(ast.ExpressionStatement, node)
+
+        return _compile(node.expression, unboxed)
+    elif node_type == ast.Identifier:
+        node = cast(ast.Identifier, node)
+
+        return _compile_identifier(node)
+    elif node_type == ast.Integer or node_type == ast.Float or \
+            node_type == ast.String:
+        constant = cast(ast.Integer, node).constant
+
+        assert constant is not None
+        return lambda env: constant
+    elif node_type == ast.Boolean:
+        node = cast(ast.Boolean, node)
+
+        assert node.value is not None
+        boolean = to_boolean_object(node.value)
+
+        return lambda env: boolean
+    elif node_type == ast.Prefix:
+        node = cast(ast.Prefix, node)
+
+        if unboxed and node.operator == '-' and _is_arithmetic(node.right):
+            return _compile_unboxed(node)
+
+        return _compile_prefix(node, unboxed)
+    elif node_type == ast.Infix:
+        node = cast(ast.Infix, node)
+
+        if unboxed and node.operator in _UNBOXED_OPERATORS and \
+                (_is_arithmetic(node.left) or _is_arithmetic(node.right)):
+            return _compile_unboxed(node)
+
+        return _compile_infix(node, unboxed)
+    elif node_type == ast.Block:
+        node = cast(ast.Block, node)
+
+        return _compile_block(node, unboxed)
+    elif node_type == ast.If:
+        node = cast(ast.If, node)
+
+        return _compile_if(node, unboxed)
+    elif node_type == ast.ReturnStatement:
+        node = cast(ast.ReturnStatement, node)
+
+        return _compile_return(node, unboxed)
+    elif node_type == ast.LetStatement:
+        node = cast(ast.LetStatement, node)
+
+        return _compile_let(node, unboxed)
+    elif node_type == ast.Function:
+        node = cast(ast.Function, node)
+
+        return _compile_function_literal(node)
+    elif node_type == ast.Call:
+        node = cast(ast.Call, node)
+
+        return _compile_call(node, unboxed)
+    elif node_type == ast.Vector:
+        node = cast(ast.Vector, node)
+
+        return _compile_vector(node, unboxed)
+    elif node_type == ast.Index:
+        node = cast(ast.Index, node)
+
+        return _compile_index(node, unboxed)
+
+    return lambda env: None
+
+
+def _compile_block(block: ast.Block, unboxed: bool) -> Code:
+    statements = [_compile(statement, unboxed)
+                  for statement in block.statements]
+
+    if len(statements) == 1:
+        return statements[0]
+
+    def run(env: Environment) -> Optional[Object]:
+        result: Optional[Object] = None
+
+        for statement in statements:
+            result = statement(env)
+
+            if result is not None and (type(result) == Return or
+                                       type(result) == Error or
+                                       type(result) == TailCall):
+                return result
+
+        return result
+
+    return run
+
+
+def _compile_builtin_call(call: ast.Call, unboxed: bool) -> Code:
+    assert call.arguments is not None and call.builtin is not None
+    arguments = [_compile(argument, unboxed) for argument in call.arguments]
+    builtin = call.builtin
+
+    def run(env: Environment) -> Optional[Object]:
+        args: List[Object] = []
+        for argument in arguments:
+            value = argument(env)
+
+            assert value is not None
+            if type(value) in ABRUPT:
+                return value
+
+            args.append(value)
+
+        return builtin.call(args)
+
+    return run
+
+
+def _compile_call(call: ast.Call, unboxed: bool) -> Code:
+    assert call.arguments is not None
+    if call.builtin is not None:
+        return _compile_builtin_call(call, unboxed)
+
+    function = _compile(call.function, unboxed)
+    arguments = [_compile(argument, unboxed) for argument in call.arguments]
+    tail = call.tail
+    site = call.cache
+
+    def run(env: Environment) -> Optional[Object]:
+        callee = function(env)
+
+        assert callee is not None
+        if type(callee) in ABRUPT:
+            return callee
+
+        args: List[Object] = []
+        for argument in arguments:
+            value = argument(env)
+
+            assert value is not None
+            if type(value) in ABRUPT:
+                return value
+
+            args.append(value)
+
+        if tail:
+            return TailCall(callee, args, site)
+
+        return apply_function(callee, args, site)
+
+    return run
+
+
+def _compile_function_literal(function: ast.Function) -> Code:
+    slot = function.ident.slot if function.ident is not None else None
+
+    def run(env: Environment) -> Optional[Object]:
+        value = Function(function, env)
+        if slot is not None:
+            env.store[slot] = value
+
+        return value
+
+    return run
+
+
+def _compile_identifier(identifier: ast.Identifier) -> Code:
+    name = identifier.value
+    depth = identifier.depth
+    slot = identifier.slot
+
+    # Locals and the variables of the enclosing function are by far the
+    # most common, so they get a direct read.
+    if depth == 0:
+        def run(env: Environment) -> Optional[Object]:
+            value = env.store[slot]
+
+            return value if value is not None \
+                else new_error(NOT_INITIALIZED, name)
+    elif depth == 1:
+        def run(env: Environment) -> Optional[Object]:
+            assert env.outer is not None
+            value = env.outer.store[slot]
+
+            return value if value is not None \
+                else new_error(NOT_INITIALIZED, name)
+    else:
+        def run(env: Environment) -> Optional[Object]:
+            value = env.lookup(depth, slot)
+
+            return value if value is not None \
+                else new_error(NOT_INITIALIZED, name)
+
+    return run
+
+
+def _compile_if(if_expression: ast.If, unboxed: bool) -> Code:
+    condition = _compile(if_expression.condition, unboxed)
+    consequence = _compile(if_expression.consequence, unboxed)
+    alternative = _compile(if_expression.alternative, unboxed) \
+        if if_expression.alternative is not None else None
+
+    def run(env: Environment) -> Optional[Object]:
+        value = condition(env)
+
+        assert value is not None
+        if type(value) in ABRUPT:
+            return value
+
+        result: Optional[Object] = None
+
+        if is_truthy(value):
+            result = consequence(env)
+        elif alternative is not None:
+            result = alternative(env)
+
+        return result if result is not None else NULL
+
+    return run
+
+
+def _compile_index(index: ast.Index, unboxed: bool) -> Code:
+    left = _compile(index.left, unboxed)
+    position = _compile(index.index, unboxed)
+
+    def run(env: Environment) -> Optional[Object]:
+        left_value = left(env)
+
+        assert left_value is not None
+        if type(left_value) in ABRUPT:
+            return left_value
+
+        position_value = position(env)
+
+        assert position_value is not None
+        if type(position_value) in ABRUPT:
+            return position_value
+
+        return evaluate_index_expression(left_value, position_value)
+
+    return run
+
+
+def _compile_infix(infix: ast.Infix, unboxed: bool) -> Code:
+    operator = infix.operator
+    left = _compile(infix.left, unboxed)
+    right = _compile(infix.right, unboxed)
+
+    def run(env: Environment) -> Optional[Object]:
+        left_value = left(env)
+
+        assert left_value is not None
+        if type(left_value) in ABRUPT:
+            return left_value
+
+        right_value = right(env)
+
+        assert right_value is not None
+        if type(right_value) in ABRUPT:
+            return right_value
+
+        # Type feedback may replace the handler at any time.
+        if infix.handler is not None:
+            return infix.handler(left_value, right_value)
+
+        return evaluate_infix_expression(operator, left_value, right_value)
+
+    return run
+
+
+def _compile_let(let_statement: ast.LetStatement, unboxed: bool) -> Code:
+    assert let_statement.name is not None
+    slot = let_statement.name.slot
+    value = _compile(let_statement.value, unboxed)
+
+    def run(env: Environment) -> Optional[Object]:
+        result = value(env)
+
+        assert result is not None
+        if type(result) in ABRUPT:
+            return result
+
+        env.store[slot] = result
+
+        return None
+
+    return run
+
+
+def _compile_prefix(prefix: ast.Prefix, unboxed: bool) -> Code:
+    operator = prefix.operator
+    right = _compile(prefix.right, unboxed)
+
+    def run(env: Environment) -> Optional[Object]:
+        value = right(env)
+
+        assert value is not None
+        if type(value) in ABRUPT:
+            return value
+
+        if prefix.handler is not None:
+            return prefix.handler(value)
+
+        return evaluate_prefix_expression(operator, value)
+
+    return run
+
+
+def _compile_return(return_statement: ast.ReturnStatement,
+                    unboxed: bool) -> Code:
+    value = _compile(return_statement.return_value, unboxed)
+
+    def run(env: Environment) -> Optional[Object]:
+        result = value(env)
+
+        assert result is not None
+        if type(result) in ABRUPT:
+            return result
+
+        return Return(result)
+
+    return run
+
+
+def _compile_vector(vector: ast.Vector, unboxed: bool) -> Code:
+    assert vector.elements is not None
+    elements = [_compile(element, unboxed) for element in vector.elements]
+
+    def run(env: Environment) -> Optional[Object]:
+        values: List[Object] = []
+        for element in elements:
+            value = element(env)
+
+            assert value is not None
+            if type(value) in ABRUPT:
+                return value
+
+            values.append(value)
+
+        return vector_from_objects(values)
+
+    return run
+
+
+def _box(value: Any) -> Object:
+    if type(value) is int:
+        return new_integer(value)
+    elif type(value) is float:
+        return Float(value)
+
+    return value
+
+
+def _compile_raw(node: Optional[ast.Expression]) -> RawCode:
+    node_type = type(node)
+
+    if node_type == ast.Integer or node_type == ast.Float:
+        raw_value = cast(ast.Integer, node).value
+
+        return lambda env: raw_value
+    elif _is_arithmetic(node) and node_type == ast.Infix:
+        return _compile_raw_infix(cast(ast.Infix, node))
+    elif _is_arithmetic(node):
+        return _compile_raw_negation(cast(ast.Prefix, node))
+
+    # Operands that are not operators are evaluated as usual and unwrapped.
+    code = _compile(node, True)
+
+    def run(env: Environment) -> Any:
+        value = code(env)
+
+        if type(value) is Integer or type(value) is Float:
+            return cast(Integer, value).value
+
+        return value
+
+    return run
+
+
+def _compile_raw_comparison(infix: ast.Infix) -> Code:
+    operator = infix.operator
+    operation = _RAW_COMPARISONS[operator]
+    left = _compile_raw(infix.left)
+    right = _compile_raw(infix.right)
+
+    def run(env: Environment) -> Optional[Object]:
+        left_value = left(env)
+        if type(left_value) in ABRUPT:
+            return left_value
+
+        right_value = right(env)
+        if type(right_value) in ABRUPT:
+            return right_value
+
+        if (type(left_value) is int or type(left_value) is float) and \
+                (type(right_value) is int or type(right_value) is float):
+            return to_boolean_object(operation(left_value, right_value))
+
+        return evaluate_infix_expression(operator,
+                                         _box(left_value),
+                                         _box(right_value))
+
+    return run
+
+
+def _compile_raw_infix(infix: ast.Infix) -> RawCode:
+    operator = infix.operator
+    left = _compile_raw(infix.left)
+    right = _compile_raw(infix.right)
+    operation = _RAW_ARITHMETIC.get(operator)
+
+    def run(env: Environment) -> Any:
+        left_value = left(env)
+        if type(left_value) in ABRUPT:
+            return left_value
+
+        right_value = right(env)
+        if type(right_value) in ABRUPT:
+            return right_value
+
+        if (type(left_value) is int or type(left_value) is float) and \
+                (type(right_value) is int or type(right_value) is float):
+            if operation is not None:
+                return operation(left_value, right_value)
+            elif right_value == 0:
+                return new_error(DIVISION_BY_ZERO)
+            elif type(left_value) is int and type(right_value) is int:
+                return left_value // right_value
+
+            return left_value / right_value
+
+        # Anything else gets the generic operator and its errors.
+        return evaluate_infix_expression(operator,
+                                         _box(left_value),
+                                         _box(right_value))
+
+    return run
+
+
+def _compile_raw_negation(prefix: ast.Prefix) -> RawCode:
+    right = _compile_raw(prefix.right)
+
+    def run(env: Environment) -> Any:
+        value = right(env)
+
+        if type(value) is int or type(value) is float:
+            return -value
+        elif type(value) in ABRUPT:
+            return value
+
+        return evaluate_prefix_expression('-', value)
+
+    return run
+
+
+def _compile_unboxed(node: ast.Expression) -> Code:
+    # Root of an arithmetic expression: the only node that boxes.
+    if type(node) == ast.Infix and \
+            cast(ast.Infix, node).operator in _RAW_COMPARISONS:
+        return _compile_raw_comparison(cast(ast.Infix, node))
+
+    raw = _compile_raw(node)
+
+    return lambda env: _box(raw(env))
+
+
+def _is_arithmetic(node: Optional[ast.Expression]) -> bool:
+    node_type = type(node)
+
+    if node_type == ast.Infix:
+        return cast(ast.Infix, node).operator in ('+', '-', '*', '/')
+    elif node_type == ast.Prefix:
+        return cast(ast.Prefix, node).operator == '-'
+
+    return False
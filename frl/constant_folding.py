@@ -0,0 +1,185 @@
+from typing import (
+    cast,
+    List,
+    Optional,
+)
+
+import frl.ast as ast
+from frl.evaluator import (
+    evaluate_infix_expression,
+    evaluate_prefix_expression,
+    is_truthy,
+    to_boolean_object,
+)
+from frl.object import (
+    Boolean,
+    Float,
+    Integer,
+    Object,
+)
+from frl.token import (
+    Token,
+    TokenType,
+)
+
+
+class _ConstantFolding:
+
+    def __init__(self) -> None:
+        self.folded: int = 0
+
+    def block(self, block: Optional[ast.Block]) -> None:
+        if block is not None:
+            self.statements(block.statements)
+
+    def statements(self, statements: List[ast.Statement]) -> None:
+        for statement in statements:
+            node_type = type(statement)
+
+            if node_type == ast.ExpressionStatement:
+                expression_statement = cast(ast.ExpressionStatement,
+                                            statement)
+                expression_statement.expression = self._fold(
+                    expression_statement.expression)
+            elif node_type == ast.LetStatement:
+                let_statement = cast(ast.LetStatement, statement)
+                let_statement.value = self._fold(let_statement.value)
+            elif node_type == ast.ReturnStatement:
+                return_statement = cast(ast.ReturnStatement, statement)
+                return_statement.return_value = self._fold(
+                    return_statement.return_value)
+            elif node_type == ast.Block:
+                self.block(cast(ast.Block, statement))
+
+    def _fold(
+            self,
+            expression: Optional[ast.Expression]) -> Optional[ast.Expression]:
+        node_type = type(expression)
+
+        if node_type == ast.Prefix:
+            prefix = cast(ast.Prefix, expression)
+            prefix.right = self._fold(prefix.right)
+
+            right = _constant(prefix.right)
+            if right is not None:
+                return self._literal(
+                    evaluate_prefix_expression(prefix.operator, right),
+                    prefix)
+        elif node_type == ast.Infix:
+            infix = cast(ast.Infix, expression)
+            infix.left = cast(ast.Expression, self._fold(infix.left))
+            infix.right = self._fold(infix.right)
+
+            left = _constant(infix.left)
+            right = _constant(infix.right)
+            if left is not None and right is not None:
+                return self._literal(
+                    evaluate_infix_expression(infix.operator, left, right),
+                    infix)
+        elif node_type == ast.If:
+            if_expression = cast(ast.If, expression)
+            if_expression.condition = self._fold(if_expression.condition)
+            self.block(if_expression.consequence)
+            self.block(if_expression.alternative)
+
+            return self._fold_if(if_expression)
+        elif node_type == ast.Function:
+            self.block(cast(ast.Function, expression).body)
+        elif node_type == ast.Call:
+            call = cast(ast.Call, expression)
+            call.function = cast(ast.Expression, self._fold(call.function))
+
+            assert call.arguments is not None
+            call.arguments = [cast(ast.Expression, self._fold(argument))
+                              for argument in call.arguments]
+        elif node_type == ast.Vector:
+            vector = cast(ast.Vector, expression)
+
+            assert vector.elements is not None
+            vector.elements = [cast(ast.Expression, self._fold(element))
+                               for element in vector.elements]
+        elif node_type == ast.Index:
+            index = cast(ast.Index, expression)
+            index.left = cast(ast.Expression, self._fold(index.left))
+            index.index = self._fold(index.index)
+
+        return expression
+
+    def _fold_if(self, if_expression: ast.If) -> ast.Expression:
+        condition = _constant(if_expression.condition)
+        if condition is None:
+            return if_expression
+
+        branch = if_expression.consequence if is_truthy(condition) \
+            else if_expression.alternative
+
+        # A branch made of one expression has the value of that expression.
+        # An empty or missing branch would need a null literal.
+        if branch is not None and len(branch.statements) == 1 and \
+                type(branch.statements[0]) == ast.ExpressionStatement:
+            expression = cast(ast.ExpressionStatement,
+                              branch.statements[0]).expression
+            if expression is not None:
+                self.folded += 1
+                return expression
+
+        return if_expression
+
+    def _literal(self,
+                 value: Object,
+                 expression: ast.Expression) -> ast.Expression:
+        # Operations that fail or give null are left for run time.
+        literal: ast.Expression
+
+        if type(value) == Integer:
+            integer = cast(Integer, value)
+            literal = ast.Integer(Token(TokenType.INT, str(integer.value)),
+                                  integer.value)
+            literal.constant = integer
+        elif type(value) == Float:
+            number = cast(Float, value)
+            literal = ast.Float(Token(TokenType.FLOAT, str(number.value)),
+                                number.value)
+            literal.constant = number
+        elif type(value) == Boolean:
+            boolean = cast(Boolean, value)
+            literal = ast.Boolean(
+                Token(TokenType.TRUE, 'true') if boolean.value
+                else Token(TokenType.FALSE, 'false'),
+                boolean.value)
+        else:
+            return expression
+
+        self.folded += 1
+
+        return literal
+
+
+def _constant(expression: Optional[ast.Expression]) -> Optional[Object]:
+    node_type = type(expression)
+
+    if node_type == ast.Integer or node_type == ast.Float:
+        return cast(ast.Integer, expression).constant
+    elif node_type == ast.Boolean:
+        value = cast(ast.Boolean, expression).value
+
+        assert value is not None
+        return to_boolean_object(value)
+
+    return None
+
+
+def fold_constants(program: ast.Program) -> int:
+    """
+    Replace the operators of a resolved program whose operands are all
+    literals by the literal they evaluate to, and every `if` with a literal
+    condition by its branch when the branch is a single expression.
+    Operations that would fail at run time are kept, so they still fail
+    there.
+
+    :rtype int: The number of expressions folded.
+    """
+    folding = _ConstantFolding()
+    folding.statements(program.statements)
+
+    return folding.folded
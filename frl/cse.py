@@ -0,0 +1,405 @@
+from typing import (
+    cast,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+import frl.ast as ast
+from frl.token import (
+    Token,
+    TokenType,
+)
+
+
+# Prefix of the temporaries, which no identifier of the source can use.
+TEMPORARY_PREFIX = '$cse'
+
+_LET = Token(TokenType.LET, 'var')
+
+
+class _Occurrence(NamedTuple):
+    statement: int
+    node: ast.Expression
+    key: Hashable
+    # Local slots the expression reads.
+    inputs: Set[int]
+    size: int
+    # Whether the expression can be evaluated just before its statement:
+    # nothing evaluated before it in the statement can fail or have
+    # effects.
+    movable: bool
+
+
+class _Statement(NamedTuple):
+    occurrences: List[_Occurrence]
+    # Local slots the statement declares once its value is computed, and
+    # the ones declared inside its `if` blocks, which may run between two
+    # of its operators.
+    assigned: Set[int]
+    nested: Set[int]
+
+
+class _Scan:
+    # Candidate expressions of one statement, in evaluation order.
+
+    def __init__(self, index: int, initialized: Set[int]) -> None:
+        self._index = index
+        self._initialized = initialized
+        self._unsafe: bool = False
+        self.occurrences: List[_Occurrence] = []
+
+    def expression(self, expression: Optional[ast.Expression]) -> None:
+        node_type = type(expression)
+
+        if node_type == ast.Prefix or node_type == ast.Infix:
+            node = cast(ast.Expression, expression)
+            key = _key(node)
+
+            if key is not None and any(type(child) == ast.Identifier
+                                       for child in ast.walk(node)):
+                self.occurrences.append(_Occurrence(
+                    self._index,
+                    node,
+                    key,
+                    {child.slot for child in ast.walk(node)
+                     if isinstance(child, ast.Identifier) and
+                     child.depth == 0},
+                    sum(1 for _ in ast.walk(node)),
+                    not self._unsafe))
+
+            for child in ast.children(node):
+                self.expression(cast(ast.Expression, child))
+        elif node_type == ast.Identifier:
+            identifier = cast(ast.Identifier, expression)
+
+            # Reading a variable fails when it is not initialized yet.
+            if identifier.depth != 0 or \
+                    identifier.slot not in self._initialized:
+                self._unsafe = True
+        elif node_type == ast.Call:
+            call = cast(ast.Call, expression)
+            self.expression(call.function)
+
+            assert call.arguments is not None
+            for argument in call.arguments:
+                self.expression(argument)
+
+            self._unsafe = True
+        elif node_type == ast.If:
+            # Only the condition is part of the statement; the blocks are
+            # handled as blocks of their own.
+            self.expression(cast(ast.If, expression).condition)
+            self._unsafe = True
+        elif node_type == ast.Function:
+            if cast(ast.Function, expression).ident is not None:
+                self._unsafe = True
+        elif node_type == ast.Vector or node_type == ast.Index:
+            # Non-numeric elements and indexes out of range fail.
+            self._unsafe = True
+
+
+class _CommonSubexpressions:
+
+    def __init__(self) -> None:
+        self._temporaries: int = 0
+        self.eliminated: int = 0
+
+    def visit(self, node: Optional[ast.ASTNode], scope: ast.ASTNode) -> None:
+        node_type = type(node)
+
+        if node_type == ast.Function:
+            function = cast(ast.Function, node)
+
+            assert function.body is not None
+            self._block(function.body.statements, function)
+        elif node_type == ast.If:
+            if_expression = cast(ast.If, node)
+
+            self.visit(if_expression.condition, scope)
+            for block in (if_expression.consequence,
+                          if_expression.alternative):
+                if block is not None:
+                    self._block(block.statements, scope)
+        elif node is not None:
+            for child in ast.children(node):
+                self.visit(child, scope)
+
+    def _block(self,
+               statements: List[ast.Statement],
+               scope: ast.ASTNode) -> None:
+        # Global slots are shared with later programs, so temporaries only
+        # go in function frames.
+        if type(scope) == ast.Function:
+            function = cast(ast.Function, scope)
+
+            while self._eliminate(statements, function):
+                pass
+
+        for statement in statements:
+            self.visit(statement, scope)
+
+    def _eliminate(self,
+                   statements: List[ast.Statement],
+                   function: ast.Function) -> bool:
+        # Computes the largest expression evaluated more than once with the
+        # same inputs only once, if there is one.
+        scanned = _scan(statements, function)
+        best: List[_Occurrence] = []
+
+        for statement in scanned:
+            for occurrence in statement.occurrences:
+                if not occurrence.movable and \
+                        _declared(statements, occurrence) is None:
+                    continue
+
+                group = _reuses(scanned, statements, occurrence)
+                if len(group) > 1 and \
+                        (len(best) == 0 or group[0].size > best[0].size):
+                    best = group
+
+        if len(best) == 0:
+            return False
+
+        first = best[0]
+        # `var t = a * b;` already keeps the value in t.
+        target = _declared(statements, first)
+        moved = 0
+
+        if target is None:
+            target = ast.Identifier(first.node.token,
+                                    f'{TEMPORARY_PREFIX}{self._temporaries}')
+            target.depth = 0
+            target.slot = function.frame_size
+            target.inferred = first.node.inferred
+            self._temporaries += 1
+            function.frame_size += 1
+
+            _replace(statements[first.statement], first.node, target)
+            statements.insert(first.statement,
+                              ast.LetStatement(_LET, target, first.node))
+            moved = 1
+
+        for occurrence in best[1:]:
+            _replace(statements[occurrence.statement + moved],
+                     occurrence.node,
+                     target)
+            self.eliminated += 1
+
+        return True
+
+
+def _declared(statements: List[ast.Statement],
+              occurrence: _Occurrence) -> Optional[ast.Identifier]:
+    # The name of the `var` whose whole value is the occurrence.
+    statement = statements[occurrence.statement]
+
+    if type(statement) == ast.LetStatement and \
+            cast(ast.LetStatement, statement).value is occurrence.node:
+        return cast(ast.LetStatement, statement).name
+
+    return None
+
+
+def _declarations(node: Optional[ast.ASTNode]) -> Set[int]:
+    # Local slots declared anywhere in a statement, without entering
+    # functions.
+    node_type = type(node)
+
+    if node_type == ast.LetStatement:
+        let_statement = cast(ast.LetStatement, node)
+
+        assert let_statement.name is not None
+        return {let_statement.name.slot} | _declarations(let_statement.value)
+    elif node_type == ast.Function:
+        function = cast(ast.Function, node)
+
+        return set() if function.ident is None else {function.ident.slot}
+    elif node is not None:
+        return set().union(*(_declarations(child)
+                             for child in ast.children(node)))
+
+    return set()
+
+
+def _key(expression: Optional[ast.Expression]) -> Optional[Hashable]:
+    # Equal for structurally identical expressions over the same variables,
+    # None for expressions that are not just operators.
+    node_type = type(expression)
+
+    if node_type == ast.Identifier:
+        identifier = cast(ast.Identifier, expression)
+        return ('identifier', identifier.depth, identifier.slot)
+    elif node_type == ast.Integer:
+        return ('integer', cast(ast.Integer, expression).value)
+    elif node_type == ast.Float:
+        return ('float', cast(ast.Float, expression).value)
+    elif node_type == ast.Boolean:
+        return ('boolean', cast(ast.Boolean, expression).value)
+    elif node_type == ast.Prefix:
+        prefix = cast(ast.Prefix, expression)
+        right = _key(prefix.right)
+
+        return None if right is None else (prefix.operator, right)
+    elif node_type == ast.Infix:
+        infix = cast(ast.Infix, expression)
+        left = _key(infix.left)
+        right = _key(infix.right)
+
+        return None if left is None or right is None \
+            else (infix.operator, left, right)
+
+    return None
+
+
+def _replace(statement: ast.Statement,
+             old: ast.Expression,
+             new: ast.Identifier) -> None:
+    def substitute(
+            expression: Optional[ast.Expression]) -> Optional[ast.Expression]:
+        if expression is old:
+            # Each use gets its own node.
+            identifier = ast.Identifier(new.token, new.value)
+            identifier.depth = new.depth
+            identifier.slot = new.slot
+            identifier.inferred = old.inferred
+
+            return identifier
+
+        node_type = type(expression)
+
+        if node_type == ast.Prefix:
+            prefix = cast(ast.Prefix, expression)
+            prefix.right = substitute(prefix.right)
+        elif node_type == ast.Infix:
+            infix = cast(ast.Infix, expression)
+            infix.left = cast(ast.Expression, substitute(infix.left))
+            infix.right = substitute(infix.right)
+        elif node_type == ast.Call:
+            call = cast(ast.Call, expression)
+            call.function = cast(ast.Expression, substitute(call.function))
+
+            assert call.arguments is not None
+            call.arguments = [cast(ast.Expression, substitute(argument))
+                              for argument in call.arguments]
+        elif node_type == ast.If:
+            if_expression = cast(ast.If, expression)
+            if_expression.condition = substitute(if_expression.condition)
+
+        return expression
+
+    node_type = type(statement)
+
+    if node_type == ast.ExpressionStatement:
+        expression_statement = cast(ast.ExpressionStatement, statement)
+        expression_statement.expression = substitute(
+            expression_statement.expression)
+    elif node_type == ast.LetStatement:
+        let_statement = cast(ast.LetStatement, statement)
+        let_statement.value = substitute(let_statement.value)
+    elif node_type == ast.ReturnStatement:
+        return_statement = cast(ast.ReturnStatement, statement)
+        return_statement.return_value = substitute(
+            return_statement.return_value)
+
+
+def _reuses(scanned: List[_Statement],
+            statements: List[ast.Statement],
+            first: _Occurrence) -> List[_Occurrence]:
+    # The occurrence and the later ones that can take its value: the same
+    # expression before any of its inputs, or the variable holding it, is
+    # declared again.
+    group: List[_Occurrence] = [first]
+    target = _declared(statements, first)
+    inputs = first.inputs if target is None else first.inputs | {target.slot}
+
+    # Later in the same statement.
+    statement = scanned[first.statement]
+    if statement.nested & inputs:
+        return group
+
+    position = statement.occurrences.index(first)
+    group.extend(occurrence
+                 for occurrence in statement.occurrences[position + 1:]
+                 if occurrence.key == first.key)
+
+    if statement.assigned & first.inputs:
+        return group
+
+    for statement in scanned[first.statement + 1:]:
+        if statement.nested & inputs:
+            break
+
+        group.extend(occurrence for occurrence in statement.occurrences
+                     if occurrence.key == first.key)
+
+        if statement.assigned & inputs:
+            break
+
+    return group
+
+
+def _scan(statements: List[ast.Statement],
+          function: ast.Function) -> List[_Statement]:
+    # Parameters are always initialized, and so are the variables of the
+    # statements already run.
+    initialized = {parameter.slot for parameter in function.parameters}
+    scanned: List[_Statement] = []
+
+    for index, statement in enumerate(statements):
+        scan = _Scan(index, set(initialized))
+        assigned: Set[int] = set()
+        nested: Set[int] = set()
+
+        node_type = type(statement)
+
+        if node_type == ast.ExpressionStatement:
+            expression = cast(ast.ExpressionStatement, statement).expression
+            scan.expression(expression)
+
+            if type(expression) == ast.Function:
+                assigned = _declarations(expression)
+            else:
+                nested = _declarations(expression)
+        elif node_type == ast.LetStatement:
+            let_statement = cast(ast.LetStatement, statement)
+            scan.expression(let_statement.value)
+
+            assert let_statement.name is not None
+            assigned = {let_statement.name.slot}
+            nested = _declarations(let_statement.value)
+        else:
+            if node_type == ast.ReturnStatement:
+                scan.expression(
+                    cast(ast.ReturnStatement, statement).return_value)
+
+            nested = _declarations(statement)
+
+        scanned.append(_Statement(scan.occurrences, assigned, nested))
+        initialized |= assigned
+
+    return scanned
+
+
+def eliminate_common_subexpressions(program: ast.Program) -> int:
+    """
+    Compute only once the operator expressions of a resolved program that
+    are evaluated several times in the same block with the same inputs,
+    such as `a * b + c` in several statements of a function.
+
+    The first evaluation is kept in a new `var` of the function, named
+    `$cse0`, `$cse1` and so on, declared just before its statement, and the
+    later ones read that variable instead. A `var` whose value is the
+    expression is reused directly. Expressions are only moved when nothing
+    before them in their statement can fail or have effects, and never
+    past a new declaration of one of their inputs, so the program does
+    exactly the same thing. Global code is left alone, as in the inliner.
+
+    :rtype int: The number of evaluations removed.
+    """
+    elimination = _CommonSubexpressions()
+    elimination.visit(program, program)
+
+    return elimination.eliminated
@@ -0,0 +1,234 @@
+from typing import (
+    cast,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+import frl.ast as ast
+from frl.purity import Binding
+
+
+_EQUALITY = ('==', '!=', '===', '!==')
+_NEVER_FAILING_ARITHMETIC = ('+', '-', '*')
+
+
+class RemovedCode(NamedTuple):
+    # 'unreachable' for code after a return or in a branch that can never
+    # run, 'unused' for declarations and values nothing reads.
+    reason: str
+    code: str
+
+    def __str__(self) -> str:
+        return f'{self.reason}: {self.code}'
+
+
+class _DeadCodeElimination:
+
+    def __init__(self, program: ast.Program, closed_world: bool) -> None:
+        self._program = program
+        self._closed_world = closed_world
+        self._read: Set[Binding] = set()
+        self._scopes: List[ast.ASTNode] = []
+        self.removed: List[RemovedCode] = []
+
+    def run(self) -> None:
+        # Removing a declaration may leave the ones it used unread, so
+        # repeat until nothing changes.
+        while True:
+            removed = len(self.removed)
+
+            self._read = set()
+            self._scopes = [self._program]
+            self._find_reads(self._program)
+
+            self._scopes = [self._program]
+            self._program.statements = self._statements(
+                self._program.statements)
+
+            if len(self.removed) == removed:
+                break
+
+    def _binding(self, identifier: ast.Identifier) -> Binding:
+        return (id(self._scopes[-1 - identifier.depth]), identifier.slot)
+
+    def _block(self, block: Optional[ast.Block]) -> None:
+        if block is not None:
+            block.statements = self._statements(block.statements)
+
+    def _find_reads(self, node: Optional[ast.ASTNode]) -> None:
+        node_type = type(node)
+
+        if node_type == ast.Identifier:
+            self._read.add(self._binding(cast(ast.Identifier, node)))
+        elif node_type == ast.LetStatement:
+            # The name is a declaration, not a read.
+            self._find_reads(cast(ast.LetStatement, node).value)
+        elif node_type == ast.Function:
+            function = cast(ast.Function, node)
+
+            self._scopes.append(function)
+            self._find_reads(function.body)
+            self._scopes.pop()
+        elif node is not None:
+            for child in ast.children(node):
+                self._find_reads(child)
+
+    def _is_unused(self, statement: ast.Statement) -> bool:
+        node_type = type(statement)
+
+        if node_type == ast.LetStatement:
+            let_statement = cast(ast.LetStatement, statement)
+
+            assert let_statement.name is not None
+            return not self._is_read(let_statement.name) and \
+                _is_pure(let_statement.value)
+        elif node_type == ast.ExpressionStatement:
+            expression = cast(ast.ExpressionStatement, statement).expression
+
+            if type(expression) == ast.Function:
+                function = cast(ast.Function, expression)
+                return function.ident is None or \
+                    not self._is_read(function.ident)
+
+            return _is_pure(expression)
+
+        return False
+
+    def _is_read(self, identifier: ast.Identifier) -> bool:
+        binding = self._binding(identifier)
+
+        # Without the whole program, later code may read any global.
+        if binding[0] == id(self._program) and not self._closed_world:
+            return True
+
+        return binding in self._read
+
+    def _simplify(self, node: Optional[ast.ASTNode]) -> None:
+        node_type = type(node)
+
+        if node_type == ast.If:
+            if_expression = cast(ast.If, node)
+
+            self._simplify_if(if_expression)
+            self._simplify(if_expression.condition)
+            self._block(if_expression.consequence)
+            self._block(if_expression.alternative)
+        elif node_type == ast.Function:
+            function = cast(ast.Function, node)
+
+            self._scopes.append(function)
+            self._block(function.body)
+            self._scopes.pop()
+        elif node_type == ast.Block:
+            self._block(cast(ast.Block, node))
+        elif node is not None:
+            for child in ast.children(node):
+                self._simplify(child)
+
+    def _simplify_if(self, if_expression: ast.If) -> None:
+        # A literal condition always takes the same branch. The other one
+        # is emptied rather than dropped so the `if` keeps its value.
+        if type(if_expression.condition) != ast.Boolean:
+            return
+
+        if cast(ast.Boolean, if_expression.condition).value:
+            if if_expression.alternative is not None:
+                self.removed.append(RemovedCode(
+                    'unreachable', str(if_expression.alternative)))
+                if_expression.alternative = None
+        else:
+            consequence = if_expression.consequence
+            if consequence is not None and len(consequence.statements) > 0:
+                self.removed.append(RemovedCode('unreachable',
+                                                str(consequence)))
+                consequence.statements = []
+
+    def _statements(self,
+                    statements: List[ast.Statement]) -> List[ast.Statement]:
+        kept: List[ast.Statement] = []
+
+        for index, statement in enumerate(statements):
+            last = index == len(statements) - 1
+
+            # The last statement gives its value to the block, so it stays
+            # even when nothing reads its name.
+            if not last and self._is_unused(statement):
+                self.removed.append(RemovedCode('unused', str(statement)))
+                continue
+
+            self._simplify(statement)
+            kept.append(statement)
+
+            if _always_returns(statement):
+                for unreachable in statements[index + 1:]:
+                    self.removed.append(RemovedCode('unreachable',
+                                                    str(unreachable)))
+                break
+
+        return kept
+
+
+def _always_returns(statement: ast.Statement) -> bool:
+    if type(statement) == ast.ReturnStatement:
+        return True
+    elif type(statement) != ast.ExpressionStatement:
+        return False
+
+    expression = cast(ast.ExpressionStatement, statement).expression
+    if type(expression) != ast.If:
+        return False
+
+    if_expression = cast(ast.If, expression)
+    return _block_always_returns(if_expression.consequence) and \
+        _block_always_returns(if_expression.alternative)
+
+
+def _block_always_returns(block: Optional[ast.Block]) -> bool:
+    return block is not None and \
+        any(_always_returns(statement) for statement in block.statements)
+
+
+def _is_pure(expression: Optional[ast.Expression]) -> bool:
+    # Expressions that can neither fail nor change anything. Reading a
+    # variable fails when it is not initialized yet, and arithmetic fails
+    # on operands of the wrong type.
+    node_type = type(expression)
+
+    if node_type in (ast.Integer, ast.Float, ast.Boolean, ast.String):
+        return True
+    elif node_type == ast.Function:
+        # A named function also assigns its name.
+        return cast(ast.Function, expression).ident is None
+    elif node_type == ast.Prefix:
+        return _is_pure(cast(ast.Prefix, expression).right)
+    elif node_type == ast.Infix:
+        infix = cast(ast.Infix, expression)
+
+        if infix.operator in _EQUALITY:
+            return _is_pure(infix.left) and _is_pure(infix.right)
+        elif infix.operator in _NEVER_FAILING_ARITHMETIC:
+            return type(infix.left) in (ast.Integer, ast.Float) and \
+                type(infix.right) in (ast.Integer, ast.Float)
+
+    return False
+
+
+def eliminate_dead_code(program: ast.Program,
+                        closed_world: bool = False) -> List[RemovedCode]:
+    """
+    Remove from a resolved program the statements that can never run and
+    the declarations and values nothing reads, as long as evaluating them
+    could neither fail nor change anything.
+
+    Globals are only removed with closed_world, which promises that no
+    later code will be resolved against the same globals. Slots are kept
+    as they are, so the program does not need to be resolved again.
+
+    :rtype List[RemovedCode]: What was removed, in order.
+    """
+    elimination = _DeadCodeElimination(program, closed_world)
+    elimination.run()
+
+    return elimination.removed
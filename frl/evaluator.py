@@ -1,16 +1,49 @@
+from operator import (
+    add,
+    eq,
+    ge,
+    gt,
+    le,
+    lt,
+    mul,
+    ne,
+    sub,
+    truediv,
+)
 from typing import (
+    Any,
+    Callable,
     cast,
+    Dict,
+    Hashable,
     List,
     Optional,
+    Tuple,
 )
 
 import frl.ast as ast
+from frl.inline_cache import InlineCache
+from frl.memoization import ResultCache
 from frl.object import (
     Boolean,
+    Environment,
+    Error,
     Float,
+    Function,
     Integer,
+    new_integer,
     Null,
     Object,
+    Return,
+    String,
+    TailCall,
+    Vector,
+)
+from frl.vector import (
+    has_zero,
+    new_vector,
+    vector_map,
+    vector_negate,
 )
 
 
@@ -18,51 +51,400 @@ TRUE = Boolean(True)
 FALSE = Boolean(False)
 NULL = Null()
 
+# Error messages, shared with the other backends so that every one of them
+# reports the same errors.
+DIVISION_BY_ZERO = 'Division by zero'
+INDEX_OUT_OF_RANGE = 'Index out of range: {}'
+NOT_A_FUNCTION = 'Not a function: {}'
+NOT_A_NUMBER = 'Vector elements must be numbers, got {}'
+NOT_INDEXABLE = 'Index operator not supported: {}[{}]'
+NOT_INITIALIZED = 'Identifier not initialized: {}'
+TYPE_MISMATCH = 'Type mismatch: {} {} {}'
+UNKNOWN_INFIX_OPERATOR = 'Unknown operator: {} {} {}'
+VECTOR_LENGTH_MISMATCH = 'Vector length mismatch: {} and {}'
+WRONG_NUMBER_OF_ARGUMENTS = 'Wrong number of arguments: expected {}, got {}'
+
+# Results that stop the evaluation of the expression or statements around
+# them: errors, and the returns and tail calls of a `return` inside an `if`
+# used as a value, which leave the whole function.
+ABRUPT = frozenset((Error, Return, TailCall))
+
+# Element by element operations between vectors, or a vector and a number.
+_VECTOR_OPERATIONS: Dict[str, Callable[[Any, Any], Any]] = {
+    '+': add,
+    '-': sub,
+    '*': mul,
+    '/': truediv,
+    '<': lt,
+    '<=': le,
+    '>': gt,
+    '>=': ge,
+    '==': eq,
+    '!=': ne,
+}
+
 
-def evaluate(node: ast.ASTNode) -> Optional[Object]:
+def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
     node_type = type(node)
 
     if node_type == ast.Program:
         node = cast(ast.Program, node)
 
-        return _evaluate_statements(node.statements)
+        env.grow(node.frame_size)
+        return _evaluate_program(node, env)
     elif node_type == ast.ExpressionStatement:
         node = cast(ast.ExpressionStatement, node)
 
         assert node.expression is not None
-        return evaluate(node.expression)
+        return evaluate(node.expression, env)
+    elif node_type == ast.Identifier:
+        node = cast(ast.Identifier, node)
+
+        return _evaluate_identifier(node, env)
+    elif node_type == ast.Integer:
+        node = cast(ast.Integer, node)
+
+        assert node.constant is not None
+        return node.constant
     elif node_type == ast.Float:
         node = cast(ast.Float, node)
 
-        assert node.value is not None
-        return Float(node.value)
+        assert node.constant is not None
+        return node.constant
+    elif node_type == ast.String:
+        node = cast(ast.String, node)
+
+        assert node.constant is not None
+        return node.constant
     elif node_type == ast.Boolean:
         node = cast(ast.Boolean, node)
 
         assert node.value is not None
-        return _to_boolean_object(node.value)
-    elif node_type == ast.Integer:
-        node = cast(ast.Integer, node)
-
-        assert node.value is not None
-        return Integer(node.value)
+        return to_boolean_object(node.value)
     elif node_type == ast.Prefix:
         node = cast(ast.Prefix, node)
 
         assert node.right is not None
-        right = evaluate(node.right)
+        right = evaluate(node.right, env)
+
+        assert right is not None
+        if _is_abrupt(right):
+            return right
+
+        if node.handler is not None:
+            return node.handler(right)
+
+        return evaluate_prefix_expression(node.operator, right)
+    elif node_type == ast.Infix:
+        node = cast(ast.Infix, node)
+
+        assert node.left is not None
+        left = evaluate(node.left, env)
+
+        assert left is not None
+        if _is_abrupt(left):
+            return left
+
+        assert node.right is not None
+        right = evaluate(node.right, env)
 
         assert right is not None
-        return _evaluate_prefix_expression(node.operator, right)
+        if _is_abrupt(right):
+            return right
+
+        if node.handler is not None:
+            return node.handler(left, right)
+
+        return evaluate_infix_expression(node.operator, left, right)
+    elif node_type == ast.Block:
+        node = cast(ast.Block, node)
+
+        return _evaluate_block(node, env)
+    elif node_type == ast.If:
+        node = cast(ast.If, node)
+
+        return _evaluate_if_expression(node, env)
+    elif node_type == ast.ReturnStatement:
+        node = cast(ast.ReturnStatement, node)
+
+        assert node.return_value is not None
+        value = evaluate(node.return_value, env)
+
+        assert value is not None
+        if _is_abrupt(value):
+            return value
+
+        return Return(value)
+    elif node_type == ast.LetStatement:
+        node = cast(ast.LetStatement, node)
+
+        assert node.value is not None
+        value = evaluate(node.value, env)
+
+        assert value is not None
+        if _is_abrupt(value):
+            return value
+
+        assert node.name is not None
+        env.store[node.name.slot] = value
+    elif node_type == ast.Function:
+        node = cast(ast.Function, node)
+
+        function = Function(node, env)
+        if node.ident is not None:
+            env.store[node.ident.slot] = function
+
+        return function
+    elif node_type == ast.Call:
+        node = cast(ast.Call, node)
+
+        if node.builtin is not None:
+            assert node.arguments is not None
+            args = _evaluate_expressions(node.arguments, env)
+            if len(args) == 1 and _is_abrupt(args[0]):
+                return args[0]
+
+            return node.builtin.call(args)
+
+        callee = evaluate(node.function, env)
+
+        assert callee is not None
+        if _is_abrupt(callee):
+            return callee
+
+        assert node.arguments is not None
+        args = _evaluate_expressions(node.arguments, env)
+        if len(args) == 1 and _is_abrupt(args[0]):
+            return args[0]
+
+        if node.tail:
+            return TailCall(callee, args, node.cache)
+
+        return apply_function(callee, args, node.cache)
+    elif node_type == ast.Vector:
+        node = cast(ast.Vector, node)
+
+        assert node.elements is not None
+        elements = _evaluate_expressions(node.elements, env)
+        if len(elements) == 1 and _is_abrupt(elements[0]):
+            return elements[0]
+
+        return vector_from_objects(elements)
+    elif node_type == ast.Index:
+        node = cast(ast.Index, node)
+
+        left = evaluate(node.left, env)
+
+        assert left is not None
+        if _is_abrupt(left):
+            return left
+
+        assert node.index is not None
+        index = evaluate(node.index, env)
+
+        assert index is not None
+        if _is_abrupt(index):
+            return index
+
+        return evaluate_index_expression(left, index)
 
     return None
 
 
-def _evaluate_statements(statements: List[ast.Statement]) -> Optional[Object]:
+def apply_function(function: Object,
+                   args: List[Object],
+                   site: Optional[InlineCache] = None) -> Object:
+    env: Optional[Environment] = None
+    # Memoized calls waiting for their result. A tail call returns the same
+    # value as its caller, so the whole chain is filled in at the end.
+    pending: Optional[List[Tuple[ResultCache, Hashable]]] = None
+
+    # Calls in tail position come back as TailCall objects and are run by
+    # this loop, so tail recursion never grows the Python stack.
+    while True:
+        if type(function) != Function:
+            result: Object = new_error(NOT_A_FUNCTION,
+                                       function.type().name)
+            break
+
+        function = cast(Function, function)
+        node = function.node
+
+        # A call site always passes the same number of arguments, so a hit
+        # means the arity was already checked.
+        hit = site is not None and site.node is node
+
+        if hit:
+            assert site is not None
+            site.hits += 1
+        elif len(args) != len(node.parameters):
+            result = new_error(WRONG_NUMBER_OF_ARGUMENTS,
+                               len(node.parameters),
+                               len(args))
+            break
+        elif site is not None:
+            site.update(node)
+
+        if node.cache is not None:
+            key = _cache_key(args)
+            if key is not None:
+                cached = node.cache.get(key)
+                if cached is not None:
+                    result = cached
+                    break
+
+                if pending is None:
+                    pending = []
+                if len(pending) < node.cache.max_size:
+                    pending.append((node.cache, key))
+
+        if hit and env is None:
+            assert site is not None
+            env = Environment(0, function.env)
+            env.store = args + site.padding
+        else:
+            env = _new_function_environment(function, args, env)
+
+        function.calls += 1
+        tier = node.tier
+        if tier is not None and tier.compiled is None and \
+                function.calls >= tier.threshold:
+            tier.compile(node)
+
+        if tier is not None and tier.compiled is not None:
+            evaluated = tier.compiled(env)
+        else:
+            assert node.body is not None
+            evaluated = _evaluate_block(node.body, env)
+
+        if type(evaluated) == TailCall:
+            tail_call = cast(TailCall, evaluated)
+            # A self call can run in the same environment when nothing
+            # captured it; any other callee gets a fresh one.
+            if tail_call.function is not function or node.has_closures:
+                env = None
+
+            function, args = tail_call.function, tail_call.args
+            site = tail_call.site
+            continue
+        elif evaluated is None:
+            result = NULL
+        elif type(evaluated) == Return:
+            result = cast(Return, evaluated).value
+        else:
+            result = evaluated
+
+        break
+
+    if pending is not None:
+        for cache, key in pending:
+            cache.put(key, result)
+
+    return result
+
+
+def _cache_key(args: List[Object]) -> Optional[Hashable]:
+    # The type is part of the key so that 1, 1.0 and true never collide.
+    key: List[Tuple[type, object]] = []
+
+    for arg in args:
+        arg_type = type(arg)
+        if arg_type != Integer and arg_type != Float and arg_type != Boolean:
+            return None
+
+        key.append((arg_type, cast(Integer, arg).value))
+
+    return tuple(key)
+
+
+def _evaluate_block(block: ast.Block,
+                    env: Environment) -> Optional[Object]:
+    result: Optional[Object] = None
+
+    for statement in block.statements:
+        result = evaluate(statement, env)
+
+        if result is not None and (type(result) == Return or
+                                   type(result) == Error or
+                                   type(result) == TailCall):
+            return result
+
+    return result
+
+
+def _evaluate_expressions(expressions: List[ast.Expression],
+                          env: Environment) -> List[Object]:
+    result: List[Object] = []
+
+    for expression in expressions:
+        evaluated = evaluate(expression, env)
+
+        assert evaluated is not None
+        if _is_abrupt(evaluated):
+            return [evaluated]
+
+        result.append(evaluated)
+
+    return result
+
+
+def _evaluate_identifier(identifier: ast.Identifier,
+                         env: Environment) -> Object:
+    value = env.lookup(identifier.depth, identifier.slot)
+
+    if value is None:
+        return new_error(NOT_INITIALIZED, identifier.value)
+
+    return value
+
+
+def _evaluate_if_expression(if_expression: ast.If,
+                            env: Environment) -> Optional[Object]:
+    assert if_expression.condition is not None
+    condition = evaluate(if_expression.condition, env)
+
+    assert condition is not None
+    if _is_abrupt(condition):
+        return condition
+
+    result: Optional[Object] = None
+
+    if is_truthy(condition):
+        assert if_expression.consequence is not None
+        result = evaluate(if_expression.consequence, env)
+    elif if_expression.alternative is not None:
+        result = evaluate(if_expression.alternative, env)
+
+    return result if result is not None else NULL
+
+
+def _new_function_environment(function: Function,
+                              args: List[Object],
+                              reusable: Optional[Environment]) -> Environment:
+    size = function.node.frame_size
+
+    if reusable is None:
+        env = Environment(size, function.env)
+    else:
+        env = reusable
+        env.store[len(args):] = [None] * (size - len(args))
+
+    env.store[:len(args)] = args
+
+    return env
+
+
+def _evaluate_program(program: ast.Program,
+                      env: Environment) -> Optional[Object]:
     result: Optional[Object] = None
 
-    for statement in statements:
-        result = evaluate(statement)
+    for statement in program.statements:
+        result = evaluate(statement, env)
+
+        if type(result) == Return:
+            return cast(Return, result).value
+        elif type(result) == Error:
+            return result
 
     return result
 
@@ -79,17 +461,19 @@ def _evaluate_bang_operator_expression(right: Object) -> Object:
 
 
 def _evaluate_minus_operator_expression(right: Object) -> Object:
-    if type(right) != Integer and type(right) != Float:
+    if type(right) == Vector:
+        return vector_negate(cast(Vector, right).values)
+    elif type(right) != Integer and type(right) != Float:
         return NULL
     elif type(right) == Float:
         right = cast(Float, right)
         return Float(-right.value)
     else:
         right = cast(Integer, right)
-        return Integer(-right.value)
+        return new_integer(-right.value)
 
 
-def _evaluate_prefix_expression(operator: str, right: Object) -> Object:
+def evaluate_prefix_expression(operator: str, right: Object) -> Object:
     if operator == '!':
         return _evaluate_bang_operator_expression(right)
     elif operator == '-':
@@ -98,5 +482,168 @@ def _evaluate_prefix_expression(operator: str, right: Object) -> Object:
         return NULL
 
 
-def _to_boolean_object(value: bool) -> Boolean:
+def evaluate_infix_expression(operator: str,
+                              left: Object,
+                              right: Object) -> Object:
+    if _is_number(left) and _is_number(right):
+        return _evaluate_number_infix_expression(operator, left, right)
+    elif _is_vector_or_number(left) and _is_vector_or_number(right) and \
+            operator in _VECTOR_OPERATIONS:
+        return evaluate_vector_infix_expression(operator, left, right)
+    elif operator == '+' and type(left) == String and type(right) == String:
+        return cast(String, left).concat(cast(String, right))
+    elif operator == '==' or operator == '===':
+        return to_boolean_object(_is_equal(left, right))
+    elif operator == '!=' or operator == '!==':
+        return to_boolean_object(not _is_equal(left, right))
+    elif left.type() != right.type():
+        return new_error(TYPE_MISMATCH,
+                         left.type().name,
+                         operator,
+                         right.type().name)
+
+    return new_error(UNKNOWN_INFIX_OPERATOR,
+                     left.type().name,
+                     operator,
+                     right.type().name)
+
+
+def _evaluate_number_infix_expression(operator: str,
+                                      left: Object,
+                                      right: Object) -> Object:
+    left_value = cast(Integer, left).value
+    right_value = cast(Integer, right).value
+    # An operation between two integers stays an integer, any float operand
+    # makes the result a float.
+    is_integer = type(left) == Integer and type(right) == Integer
+
+    if operator == '+':
+        return _to_number_object(left_value + right_value, is_integer)
+    elif operator == '-':
+        return _to_number_object(left_value - right_value, is_integer)
+    elif operator == '*':
+        return _to_number_object(left_value * right_value, is_integer)
+    elif operator == '/':
+        if right_value == 0:
+            return new_error(DIVISION_BY_ZERO)
+        elif is_integer:
+            return new_integer(cast(int, left_value // right_value))
+
+        return Float(left_value / right_value)
+    elif operator == '<':
+        return to_boolean_object(left_value < right_value)
+    elif operator == '<=':
+        return to_boolean_object(left_value <= right_value)
+    elif operator == '>':
+        return to_boolean_object(left_value > right_value)
+    elif operator == '>=':
+        return to_boolean_object(left_value >= right_value)
+    elif operator == '==':
+        return to_boolean_object(left_value == right_value)
+    elif operator == '!=':
+        return to_boolean_object(left_value != right_value)
+    elif operator == '===':
+        return to_boolean_object(_is_equal(left, right))
+    elif operator == '!==':
+        return to_boolean_object(not _is_equal(left, right))
+
+    return new_error(UNKNOWN_INFIX_OPERATOR,
+                     left.type().name,
+                     operator,
+                     right.type().name)
+
+
+def evaluate_vector_infix_expression(operator: str,
+                                     left: Object,
+                                     right: Object) -> Object:
+    # One call for the whole vector instead of one evaluated operator per
+    # element: a vectorized NumPy call, or without NumPy a Python loop over
+    # the array('d'), see frl.vector.
+    left_values = cast(Vector, left).values if type(left) == Vector \
+        else cast(Integer, left).value
+    right_values = cast(Vector, right).values if type(right) == Vector \
+        else cast(Integer, right).value
+
+    if type(left) == Vector and type(right) == Vector and \
+            len(left_values) != len(right_values):
+        return new_error(VECTOR_LENGTH_MISMATCH,
+                         len(left_values),
+                         len(right_values))
+
+    if operator == '/' and (has_zero(right_values) if type(right) == Vector
+                            else right_values == 0):
+        return new_error(DIVISION_BY_ZERO)
+
+    return vector_map(_VECTOR_OPERATIONS[operator], left_values, right_values)
+
+
+def evaluate_index_expression(left: Object, index: Object) -> Object:
+    if (type(left) != Vector and type(left) != String) or \
+            type(index) != Integer:
+        return new_error(NOT_INDEXABLE,
+                         left.type().name,
+                         index.type().name)
+
+    if type(left) == String:
+        string = cast(String, left)
+        position = cast(Integer, index).value
+        if position < 0 or position >= string.length:
+            return new_error(INDEX_OUT_OF_RANGE, position)
+
+        return String(string.char_at(position))
+
+    values = cast(Vector, left).values
+    position = cast(Integer, index).value
+    if position < 0 or position >= len(values):
+        return new_error(INDEX_OUT_OF_RANGE, position)
+
+    return Float(float(values[position]))
+
+
+def vector_from_objects(elements: List[Object]) -> Object:
+    for element in elements:
+        if not _is_number(element):
+            return new_error(NOT_A_NUMBER, element.type().name)
+
+    return new_vector(cast(Integer, element).value for element in elements)
+
+
+def _is_equal(left: Object, right: Object) -> bool:
+    # Strict equality: same type and same value. Booleans and null are
+    # singletons and functions compare by identity.
+    if type(left) != type(right):
+        return False
+    elif type(left) == Integer or type(left) == Float:
+        return cast(Integer, left).value == cast(Integer, right).value
+    elif type(left) == String:
+        return cast(String, left).value == cast(String, right).value
+
+    return left is right
+
+
+def _is_abrupt(obj: Object) -> bool:
+    return type(obj) in ABRUPT
+
+
+def _is_number(obj: Object) -> bool:
+    return type(obj) == Integer or type(obj) == Float
+
+
+def _is_vector_or_number(obj: Object) -> bool:
+    return type(obj) == Vector or type(obj) == Integer or type(obj) == Float
+
+
+def is_truthy(obj: Object) -> bool:
+    return obj is not FALSE and obj is not NULL
+
+
+def new_error(message: str, *args) -> Error:
+    return Error(message.format(*args))
+
+
+def to_boolean_object(value: bool) -> Boolean:
     return TRUE if value else FALSE
+
+
+def _to_number_object(value: float, is_integer: bool) -> Object:
+    return new_integer(cast(int, value)) if is_integer else Float(value)
@@ -0,0 +1,190 @@
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+import frl.ast as ast
+from frl.evaluator import (
+    DIVISION_BY_ZERO,
+    evaluate_infix_expression,
+    new_error,
+    to_boolean_object,
+)
+from frl.object import (
+    Float,
+    Integer,
+    new_integer,
+    Object,
+    ObjectType,
+)
+
+
+# Evaluations in a row with the same number type before an operator is
+# specialized, and deoptimizations after which a node stays generic.
+SPECIALIZE_AFTER = 8
+MAX_DEOPTIMIZATIONS = 4
+
+Operation = Callable[[Any, Any], Object]
+
+_COMPARISONS: Dict[str, Operation] = {
+    '<': lambda left, right: to_boolean_object(left < right),
+    '<=': lambda left, right: to_boolean_object(left <= right),
+    '>': lambda left, right: to_boolean_object(left > right),
+    '>=': lambda left, right: to_boolean_object(left >= right),
+    '==': lambda left, right: to_boolean_object(left == right),
+    '!=': lambda left, right: to_boolean_object(left != right),
+    '===': lambda left, right: to_boolean_object(left == right),
+    '!==': lambda left, right: to_boolean_object(left != right),
+}
+
+# Operations on the raw values of two Integer operands.
+INTEGER_OPERATIONS: Dict[str, Operation] = {
+    '+': lambda left, right: new_integer(left + right),
+    '-': lambda left, right: new_integer(left - right),
+    '*': lambda left, right: new_integer(left * right),
+    '/': lambda left, right: new_integer(left // right) if right != 0
+    else new_error(DIVISION_BY_ZERO),
+    **_COMPARISONS,
+}
+
+# Operations on the raw values of two Float operands.
+FLOAT_OPERATIONS: Dict[str, Operation] = {
+    '+': lambda left, right: Float(left + right),
+    '-': lambda left, right: Float(left - right),
+    '*': lambda left, right: Float(left * right),
+    '/': lambda left, right: Float(left / right) if right != 0
+    else new_error(DIVISION_BY_ZERO),
+    **_COMPARISONS,
+}
+
+
+class TypeFeedback:
+    """
+    Operand types seen by one Infix node, and the handler the evaluator
+    calls for it.
+
+    The node starts with a profiling handler that records operand types
+    and runs the generic operator. Once both operands have been integers,
+    or both floats, SPECIALIZE_AFTER times in a row, the handler is
+    replaced by one that only checks the two types and works on the raw
+    values. Any other operands deoptimize the node back to profiling, and
+    after MAX_DEOPTIMIZATIONS it stays generic.
+    """
+
+    def __init__(self, node: ast.Infix) -> None:
+        self.node = node
+        self.observed: Set[Tuple[ObjectType, ObjectType]] = set()
+        self.specialized: Optional[ObjectType] = None
+        self.deoptimizations: int = 0
+        self._last: Optional[type] = None
+        self._streak: int = 0
+
+        node.handler = self._profile
+
+    def _deoptimize(self, left: Object, right: Object) -> Object:
+        self.observed.add((left.type(), right.type()))
+        self.deoptimizations += 1
+        self.specialized = None
+        self._last = None
+        self._streak = 0
+        # A node that keeps changing types is left to the generic operator
+        # for good, without the cost of profiling.
+        self.node.handler = self._profile \
+            if self.deoptimizations < MAX_DEOPTIMIZATIONS else None
+
+        return evaluate_infix_expression(self.node.operator, left, right)
+
+    def _profile(self, left: Object, right: Object) -> Object:
+        operand_type = type(left)
+        self.observed.add((left.type(), right.type()))
+
+        if operand_type != type(right) or \
+                (operand_type != Integer and operand_type != Float):
+            self._last = None
+            self._streak = 0
+        elif operand_type == self._last:
+            self._streak += 1
+        else:
+            self._last = operand_type
+            self._streak = 1
+
+        if self._streak >= SPECIALIZE_AFTER:
+            assert self._last is not None
+            self._specialize(self._last)
+
+        return evaluate_infix_expression(self.node.operator, left, right)
+
+    def _specialize(self, operand_type: type) -> None:
+        operations = INTEGER_OPERATIONS if operand_type == Integer \
+            else FLOAT_OPERATIONS
+        operation = operations.get(self.node.operator)
+
+        self._streak = 0
+        if operation is None:
+            return
+
+        deoptimize = self._deoptimize
+        number_type = cast(Type[Union[Integer, Float]], operand_type)
+
+        def handler(left: Any, right: Any) -> Object:
+            if type(left) is number_type and type(right) is number_type:
+                return operation(left.value, right.value)
+
+            return deoptimize(left, right)
+
+        self.specialized = ObjectType.INTEGERS if operand_type == Integer \
+            else ObjectType.FLOAT
+        self.node.handler = handler
+
+
+class FeedbackStats(NamedTuple):
+    infix: str
+    specialized: Optional[ObjectType]
+    deoptimizations: int
+
+    def __str__(self) -> str:
+        state = self.specialized.name if self.specialized is not None \
+            else 'generic'
+
+        return f'{self.infix}: {state}, ' + \
+            f'{self.deoptimizations} deoptimizations'
+
+
+def enable_type_feedback(program: ast.Program) -> int:
+    """
+    Profile the operand types of every Infix node of a program and
+    specialize the operators that only see integers or only floats. The
+    tree-walking evaluator and compiled tiers both call the handlers.
+
+    :rtype int: The number of operators profiled.
+    """
+    profiled = 0
+
+    for node in ast.walk(program):
+        # Operators already specialized by static inference need no guard.
+        if isinstance(node, ast.Infix) and node.handler is None:
+            node.feedback = TypeFeedback(node)
+            profiled += 1
+
+    return profiled
+
+
+def feedback_stats(program: ast.Program) -> List[FeedbackStats]:
+    stats: List[FeedbackStats] = []
+
+    for node in ast.walk(program):
+        if isinstance(node, ast.Infix) and node.feedback is not None:
+            stats.append(FeedbackStats(str(node),
+                                       node.feedback.specialized,
+                                       node.feedback.deoptimizations))
+
+    return stats
@@ -0,0 +1,481 @@
+from typing import (
+    Any,
+    cast,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+)
+
+import frl.ast as ast
+from frl.feedback import (
+    FLOAT_OPERATIONS,
+    INTEGER_OPERATIONS,
+)
+from frl.object import (
+    Float,
+    new_integer,
+    Object,
+    ObjectType,
+)
+from frl.purity import (
+    Binding,
+    find_function_bindings,
+)
+
+
+# The types of the values an expression or a binding may hold. None means
+# any type; an empty set means no value at all yet, which is where the
+# analysis starts.
+Types = Optional[FrozenSet[ObjectType]]
+
+_NOTHING: FrozenSet[ObjectType] = frozenset()
+_BOOLEAN = frozenset([ObjectType.BOOLEAN])
+_FLOAT = frozenset([ObjectType.FLOAT])
+_FUNCTION = frozenset([ObjectType.FUNCTION])
+_INTEGER = frozenset([ObjectType.INTEGERS])
+_NULL = frozenset([ObjectType.NULL])
+_NUMBERS = frozenset([ObjectType.INTEGERS, ObjectType.FLOAT])
+_STRING = frozenset([ObjectType.STRING])
+_VECTOR = frozenset([ObjectType.VECTOR])
+
+_ARITHMETIC = ('+', '-', '*', '/')
+_ORDERING = ('<', '<=', '>', '>=')
+_EQUALITY = ('==', '!=')
+
+
+def _join(left: Types, right: Types) -> Types:
+    if left is None or right is None:
+        return None
+
+    return left | right
+
+
+class _TypeInference:
+
+    def __init__(self, program: ast.Program, closed_world: bool) -> None:
+        self._program = program
+        self._closed_world = closed_world
+        self._bindings: Dict[Binding, Types] = {}
+        self._returns: Dict[int, Types] = {}
+        # Last types computed for each expression, by id.
+        self.types: Dict[int, Types] = {}
+        self._changed: bool = False
+        self._scopes: List[ast.ASTNode] = []
+        self._functions: List[ast.Function] = []
+        # Functions whose every call is visible: their parameters get the
+        # types of the arguments.
+        self._known: Dict[Binding, ast.Function] = {}
+        self._closed: Set[int] = set()
+
+        self._find_known_functions()
+
+    def run(self) -> None:
+        self._changed = True
+
+        while self._changed:
+            self._changed = False
+            self._scopes.append(self._program)
+
+            for statement in self._program.statements:
+                self._statement(statement)
+
+            self._scopes.pop()
+
+    def _assign(self, binding: Binding, types: Types) -> None:
+        current = self._bindings.get(binding, _NOTHING)
+        joined = _join(current, types)
+
+        if joined != current:
+            self._bindings[binding] = joined
+            self._changed = True
+
+    def _declare(self, identifier: ast.Identifier, types: Types) -> None:
+        binding = self._binding(identifier)
+        self._assign(binding, types)
+
+        # A declaration has the type of everything bound to its name.
+        self.types[id(identifier)] = self._bindings.get(binding, _NOTHING) \
+            if self._is_stable(binding) else None
+
+    def _binding(self, identifier: ast.Identifier) -> Binding:
+        return (id(self._scopes[-1 - identifier.depth]), identifier.slot)
+
+    def _block(self, block: Optional[ast.Block]) -> Types:
+        # Type of the value of a block: its last statement, or null.
+        if block is None or len(block.statements) == 0:
+            return _NULL
+
+        result: Types = _NULL
+        for statement in block.statements:
+            result = self._statement(statement)
+
+        return result
+
+    def _call(self, call: ast.Call) -> Types:
+        assert call.arguments is not None
+        if call.builtin is not None:
+            for argument in call.arguments:
+                self._expression(argument)
+
+            returns = call.builtin.returns
+
+            return None if returns is None else frozenset([returns])
+
+        self._expression(call.function)
+        arguments = [self._expression(argument)
+                     for argument in call.arguments]
+
+        callee = self._callee(call.function)
+        if callee is None:
+            return None
+
+        if id(callee) in self._closed and \
+                len(arguments) == len(callee.parameters):
+            for parameter, types in zip(callee.parameters, arguments):
+                self._assign((id(callee), parameter.slot), types)
+
+        return self._returns.get(id(callee), _NOTHING)
+
+    def _callee(self, expression: ast.Expression) -> Optional[ast.Function]:
+        if type(expression) != ast.Identifier:
+            return None
+
+        binding = self._binding(cast(ast.Identifier, expression))
+        if not self._is_stable(binding):
+            return None
+
+        return self._known.get(binding)
+
+    def _expression(self, expression: Optional[ast.Expression]) -> Types:
+        types = self._infer(expression)
+
+        if expression is not None:
+            self.types[id(expression)] = types
+
+        return types
+
+    def _find_known_functions(self) -> None:
+        self._known = find_function_bindings(self._program)
+
+        # A function is closed when every binding of it is stable and only
+        # ever called. Any other read lets it escape to callers the
+        # analysis cannot see, and so does a function literal used as a
+        # value instead of declared: pushed into a list, passed as an
+        # argument, returned or left as the value of a block.
+        escaping: Set[Binding] = set()
+        values: Set[int] = set()
+        callees: Set[int] = set()
+        scopes: List[ast.ASTNode] = []
+
+        def declare(node: Optional[ast.ASTNode]) -> None:
+            # A function literal that only binds its name, or the name of
+            # a `var`, is reached through that binding alone.
+            if type(node) == ast.Function:
+                visit_function(cast(ast.Function, node))
+            else:
+                visit(node)
+
+        def visit_function(function: ast.Function) -> None:
+            scopes.append(function)
+            visit(function.body)
+            scopes.pop()
+
+        def visit(node: Optional[ast.ASTNode]) -> None:
+            node_type = type(node)
+
+            if node_type == ast.Identifier:
+                identifier = cast(ast.Identifier, node)
+                if id(identifier) not in callees:
+                    escaping.add((id(scopes[-1 - identifier.depth]),
+                                  identifier.slot))
+            elif node_type == ast.LetStatement:
+                # The name is a declaration, not a read.
+                declare(cast(ast.LetStatement, node).value)
+            elif node_type == ast.ExpressionStatement:
+                declare(cast(ast.ExpressionStatement, node).expression)
+            elif node_type == ast.Block:
+                statements = cast(ast.Block, node).statements
+                for statement in statements:
+                    visit(statement)
+
+                # The last statement is the value of the block.
+                last = statements[-1] if len(statements) > 0 else None
+                if type(last) == ast.ExpressionStatement:
+                    expression = cast(ast.ExpressionStatement,
+                                      last).expression
+                    if type(expression) == ast.Function:
+                        values.add(id(expression))
+            elif node_type == ast.Function:
+                values.add(id(node))
+                visit_function(cast(ast.Function, node))
+            elif node is not None:
+                if node_type == ast.Call:
+                    callees.add(id(cast(ast.Call, node).function))
+
+                for child in ast.children(node):
+                    visit(child)
+
+        scopes.append(self._program)
+        for statement in self._program.statements:
+            visit(statement)
+
+        open_functions = {id(function)
+                          for binding, function in self._known.items()
+                          if binding in escaping or
+                          not self._is_stable(binding)}
+
+        self._closed = {id(function)
+                        for function in self._known.values()
+                        if id(function) not in open_functions and
+                        id(function) not in values}
+
+    def _function(self, function: ast.Function) -> Types:
+        if function.ident is not None:
+            self._declare(function.ident, _FUNCTION)
+
+        self._scopes.append(function)
+        self._functions.append(function)
+
+        for parameter in function.parameters:
+            # Closed functions get their arguments from the calls.
+            self._declare(parameter,
+                          _NOTHING if id(function) in self._closed else None)
+
+        result = self._block(function.body)
+        self._return(result)
+
+        self._functions.pop()
+        self._scopes.pop()
+
+        return _FUNCTION
+
+    def _identifier(self, identifier: ast.Identifier) -> Types:
+        binding = self._binding(identifier)
+
+        if not self._is_stable(binding):
+            return None
+
+        return self._bindings.get(binding, _NOTHING)
+
+    def _infer(self, expression: Optional[ast.Expression]) -> Types:
+        node_type = type(expression)
+
+        if node_type == ast.Integer:
+            return _INTEGER
+        elif node_type == ast.Float:
+            return _FLOAT
+        elif node_type == ast.Boolean:
+            return _BOOLEAN
+        elif node_type == ast.String:
+            return _STRING
+        elif node_type == ast.Identifier:
+            return self._identifier(cast(ast.Identifier, expression))
+        elif node_type == ast.Prefix:
+            prefix = cast(ast.Prefix, expression)
+
+            return _prefix_types(prefix.operator,
+                                 self._expression(prefix.right))
+        elif node_type == ast.Infix:
+            infix = cast(ast.Infix, expression)
+
+            return _infix_types(infix.operator,
+                                self._expression(infix.left),
+                                self._expression(infix.right))
+        elif node_type == ast.If:
+            if_expression = cast(ast.If, expression)
+
+            self._expression(if_expression.condition)
+            consequence = self._block(if_expression.consequence)
+            alternative = self._block(if_expression.alternative) \
+                if if_expression.alternative is not None else _NULL
+
+            return _join(consequence, alternative)
+        elif node_type == ast.Function:
+            return self._function(cast(ast.Function, expression))
+        elif node_type == ast.Call:
+            return self._call(cast(ast.Call, expression))
+        elif node_type == ast.Vector:
+            vector = cast(ast.Vector, expression)
+
+            assert vector.elements is not None
+            for element in vector.elements:
+                self._expression(element)
+
+            return _VECTOR
+        elif node_type == ast.Index:
+            index = cast(ast.Index, expression)
+
+            left = self._expression(index.left)
+            self._expression(index.index)
+
+            # An element of a vector, or a one character string.
+            if left is None:
+                return _FLOAT | _STRING
+
+            return (_FLOAT if ObjectType.VECTOR in left else _NOTHING) | \
+                (_STRING if ObjectType.STRING in left else _NOTHING)
+
+        return None
+
+    def _is_stable(self, binding: Binding) -> bool:
+        # Without the whole program, later code resolved against the same
+        # globals may rebind them to anything.
+        return self._closed_world or binding[0] != id(self._program)
+
+    def _return(self, types: Types) -> None:
+        function = self._functions[-1]
+        current = self._returns.get(id(function), _NOTHING)
+        joined = _join(current, types)
+
+        if joined != current:
+            self._returns[id(function)] = joined
+            self._changed = True
+
+    def _statement(self, statement: ast.Statement) -> Types:
+        node_type = type(statement)
+
+        if node_type == ast.ExpressionStatement:
+            return self._expression(
+                cast(ast.ExpressionStatement, statement).expression)
+        elif node_type == ast.LetStatement:
+            let_statement = cast(ast.LetStatement, statement)
+
+            assert let_statement.name is not None
+            self._declare(let_statement.name,
+                          self._expression(let_statement.value))
+
+            return _NULL
+        elif node_type == ast.ReturnStatement:
+            value = self._expression(
+                cast(ast.ReturnStatement, statement).return_value)
+
+            if len(self._functions) > 0:
+                self._return(value)
+
+            # Nothing after a return sees its value.
+            return _NOTHING
+        elif node_type == ast.Block:
+            return self._block(cast(ast.Block, statement))
+
+        return None
+
+
+def _infix_types(operator: str, left: Types, right: Types) -> Types:
+    # Operands an operator does not accept produce an error, which aborts
+    # the program, so only valid operands contribute a result.
+    left_numbers = _NUMBERS if left is None else left & _NUMBERS
+    right_numbers = _NUMBERS if right is None else right & _NUMBERS
+    left_vectors = _VECTOR if left is None else left & _VECTOR
+    right_vectors = _VECTOR if right is None else right & _VECTOR
+
+    # A vector with a number or another vector combines elementwise.
+    vectors = _VECTOR if (left_vectors and (right_numbers or
+                                            right_vectors)) or \
+        (right_vectors and left_numbers) else _NOTHING
+
+    # Only + joins strings.
+    strings = _STRING if operator == '+' and \
+        (left is None or ObjectType.STRING in left) and \
+        (right is None or ObjectType.STRING in right) else _NOTHING
+
+    if operator in _ARITHMETIC:
+        return vectors | strings | frozenset(
+            ObjectType.INTEGERS
+            if left_type == right_type == ObjectType.INTEGERS
+            else ObjectType.FLOAT
+            for left_type in left_numbers
+            for right_type in right_numbers)
+    elif operator in _ORDERING:
+        return vectors | \
+            (_BOOLEAN if left_numbers and right_numbers else _NOTHING)
+    elif operator in _EQUALITY:
+        return vectors | _BOOLEAN
+
+    return _BOOLEAN
+
+
+def _prefix_types(operator: str, right: Types) -> Types:
+    if operator == '!':
+        return _BOOLEAN
+    elif operator == '-':
+        if right is None:
+            return _NUMBERS | _VECTOR | _NULL
+
+        # Minus of anything but a number or a vector is null.
+        negated = right & (_NUMBERS | _VECTOR)
+
+        return negated | (_NULL if right - negated else _NOTHING)
+
+    return _NULL
+
+
+def _single(types: Types) -> Optional[ObjectType]:
+    if types is not None and len(types) == 1:
+        return next(iter(types))
+
+    return None
+
+
+def _negate_integer(right: Any) -> Object:
+    return new_integer(-right.value)
+
+
+def _negate_float(right: Any) -> Object:
+    return Float(-right.value)
+
+
+def _unchecked(operation: Any) -> Any:
+    return lambda left, right: operation(left.value, right.value)
+
+
+def infer_types(program: ast.Program, closed_world: bool = False) -> int:
+    """
+    Infer the types of the expressions of a resolved program and annotate
+    every expression that can only produce one type of value. Operators
+    whose operands are proven to be two integers, two floats or, for
+    minus, one number get a handler that skips the run-time type checks.
+
+    Parameters are inferred for functions that are never passed around,
+    from the arguments of all their calls. Globals are only trusted with
+    closed_world, which promises that the program is complete: no later
+    code resolved against the same globals will rebind them or call the
+    functions they hold.
+
+    :rtype int: The number of operators that no longer check types.
+    """
+    inference = _TypeInference(program, closed_world)
+    inference.run()
+
+    unchecked = 0
+
+    for node in ast.walk(program):
+        if not isinstance(node, ast.Expression):
+            continue
+
+        node.inferred = _single(inference.types.get(id(node)))
+
+        if isinstance(node, ast.Infix):
+            assert node.right is not None
+            left = _single(inference.types.get(id(node.left)))
+            right = _single(inference.types.get(id(node.right)))
+            operations = INTEGER_OPERATIONS \
+                if left == right == ObjectType.INTEGERS else \
+                FLOAT_OPERATIONS if left == right == ObjectType.FLOAT \
+                else None
+
+            if operations is not None and node.operator in operations:
+                node.handler = _unchecked(operations[node.operator])
+                unchecked += 1
+        elif isinstance(node, ast.Prefix) and node.operator == '-':
+            right = _single(inference.types.get(id(node.right)))
+
+            if right == ObjectType.INTEGERS:
+                node.handler = _negate_integer
+                unchecked += 1
+            elif right == ObjectType.FLOAT:
+                node.handler = _negate_float
+                unchecked += 1
+
+    return unchecked
@@ -0,0 +1,28 @@
+from typing import (
+    List,
+    Optional,
+)
+
+import frl.ast as ast
+
+
+class InlineCache:
+    """
+    Monomorphic inline cache of a call site. It remembers the function
+    called last time and the empty slots of its frame, so a call to the
+    same function again skips the arity check and builds its environment
+    from a prebuilt layout. Calling a different function replaces the
+    entry.
+    """
+
+    def __init__(self) -> None:
+        self.node: Optional[ast.Function] = None
+        # Slots of the frame after the arguments.
+        self.padding: List[None] = []
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def update(self, node: ast.Function) -> None:
+        self.node = node
+        self.padding = [None] * (node.frame_size - len(node.parameters))
+        self.misses += 1
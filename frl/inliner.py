@@ -0,0 +1,469 @@
+from typing import (
+    cast,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import frl.ast as ast
+from frl.inline_cache import InlineCache
+from frl.purity import (
+    Binding,
+    find_function_bindings,
+)
+from frl.token import (
+    Token,
+    TokenType,
+)
+
+
+# Largest body, in nodes, that is copied into its callers.
+DEFAULT_MAX_SIZE = 16
+
+_TRUE = Token(TokenType.TRUE, 'true')
+_LET = Token(TokenType.LET, 'var')
+
+
+class _Inliner:
+
+    def __init__(self,
+                 program: ast.Program,
+                 max_size: int,
+                 closed_world: bool) -> None:
+        self._program = program
+        self._max_size = max_size
+        self._closed_world = closed_world
+        self._bindings = find_function_bindings(program)
+        # Where each function binding is declared: its scope and the index
+        # of the declaring statement in the body of that scope.
+        self._declarations: Dict[Binding, int] = {}
+        self._scopes: List[ast.ASTNode] = []
+        # Index of the statement being visited in each scope of _scopes.
+        self._positions: List[int] = []
+        self.inlined: int = 0
+
+    def run(self) -> None:
+        self._find_declarations(self._program, self._program.statements)
+        self._body(self._program, self._program.statements)
+
+    def _body(self,
+              scope: ast.ASTNode,
+              statements: List[ast.Statement]) -> None:
+        self._scopes.append(scope)
+        self._positions.append(0)
+
+        for index, statement in enumerate(statements):
+            self._positions[-1] = index
+            self._statement(statement)
+
+        self._positions.pop()
+        self._scopes.pop()
+
+    def _callee(
+            self,
+            call: ast.Call) -> Optional[Tuple[ast.Function, int]]:
+        # The function called and the index in _scopes of the scope that
+        # declares it.
+        if type(call.function) != ast.Identifier:
+            return None
+
+        identifier = cast(ast.Identifier, call.function)
+        if identifier.depth < 0:
+            return None
+
+        index = len(self._scopes) - 1 - identifier.depth
+        scope = self._scopes[index]
+        binding = (id(scope), identifier.slot)
+        function = self._bindings.get(binding)
+
+        if function is None or function in self._scopes or \
+                (scope is self._program and not self._closed_world):
+            # Never inline a function into itself, and later code may
+            # rebind a global to another function.
+            return None
+
+        # The function must be defined by a statement that runs before the
+        # one making the call, or the call fails as not initialized.
+        declared = self._declarations.get(binding)
+        if declared is None or declared >= self._positions[index]:
+            return None
+
+        return function, index
+
+    def _expression(
+            self,
+            expression: Optional[ast.Expression]) -> Optional[ast.Expression]:
+        node_type = type(expression)
+
+        if node_type == ast.Prefix:
+            prefix = cast(ast.Prefix, expression)
+            prefix.right = self._expression(prefix.right)
+        elif node_type == ast.Infix:
+            infix = cast(ast.Infix, expression)
+            infix.left = cast(ast.Expression, self._expression(infix.left))
+            infix.right = self._expression(infix.right)
+        elif node_type == ast.If:
+            if_expression = cast(ast.If, expression)
+            if_expression.condition = self._expression(if_expression.condition)
+            self._statements(if_expression.consequence)
+            self._statements(if_expression.alternative)
+        elif node_type == ast.Function:
+            function = cast(ast.Function, expression)
+
+            assert function.body is not None
+            self._find_declarations(function, function.body.statements)
+            self._body(function, function.body.statements)
+        elif node_type == ast.Call:
+            call = cast(ast.Call, expression)
+            call.function = cast(ast.Expression,
+                                 self._expression(call.function))
+
+            assert call.arguments is not None
+            call.arguments = [cast(ast.Expression, self._expression(argument))
+                              for argument in call.arguments]
+
+            return self._inline(call)
+        elif node_type == ast.Vector:
+            vector = cast(ast.Vector, expression)
+
+            assert vector.elements is not None
+            vector.elements = [cast(ast.Expression, self._expression(element))
+                               for element in vector.elements]
+        elif node_type == ast.Index:
+            index = cast(ast.Index, expression)
+            index.left = cast(ast.Expression, self._expression(index.left))
+            index.index = self._expression(index.index)
+
+        return expression
+
+    def _find_declarations(self,
+                           scope: ast.ASTNode,
+                           statements: List[ast.Statement]) -> None:
+        for index, statement in enumerate(statements):
+            name: Optional[ast.Identifier] = None
+
+            if type(statement) == ast.LetStatement:
+                name = cast(ast.LetStatement, statement).name
+            elif type(statement) == ast.ExpressionStatement:
+                expression = cast(ast.ExpressionStatement,
+                                  statement).expression
+                if type(expression) == ast.Function:
+                    name = cast(ast.Function, expression).ident
+
+            if name is not None:
+                self._declarations[(id(scope), name.slot)] = index
+
+    def _inline(self, call: ast.Call) -> ast.Expression:
+        callee = self._callee(call)
+        if callee is None:
+            return call
+
+        function, index = callee
+        assert call.arguments is not None
+        body = _inlinable_body(function, self._max_size)
+        if body is None or len(call.arguments) != len(function.parameters):
+            return call
+
+        # Seen from the body, the name of the function is one scope out.
+        slot = cast(ast.Identifier, call.function).slot
+        if any(isinstance(node, ast.Identifier) and node.depth == 1 and
+               node.slot == slot
+               for node in ast.walk(body)):
+            # Recursive.
+            return call
+
+        scope = self._scopes[-1]
+        # A `var` inside an `if` in the arguments could change a variable
+        # between its use as an argument and its use in the body.
+        may_assign = any(type(node) == ast.If
+                         for argument in call.arguments
+                         for node in ast.walk(argument))
+
+        substituted = [_is_literal(argument) or
+                       (not may_assign and self._is_parameter(argument))
+                       for argument in call.arguments]
+        if not all(substituted) and type(scope) != ast.Function:
+            # Global slots are shared with later programs.
+            return call
+
+        # Other arguments are evaluated first, in order, into new slots of
+        # the caller, so that each still runs exactly once.
+        arguments: Dict[int, ast.Expression] = {}
+        temporaries: List[ast.Statement] = []
+
+        for parameter, argument, substitute in zip(function.parameters,
+                                                   call.arguments,
+                                                   substituted):
+            if substitute:
+                arguments[parameter.slot] = argument
+                continue
+
+            slot = _new_slot(cast(ast.Function, scope))
+            temporaries.append(ast.LetStatement(
+                _LET, _local(parameter, slot), argument))
+            arguments[parameter.slot] = _local(parameter, slot)
+
+        copy = _Copy(self._scopes, index, arguments, call.tail)
+        inlined = copy.expression(body)
+        if inlined is None:
+            return call
+
+        self.inlined += 1
+
+        if len(temporaries) == 0:
+            return inlined
+
+        # `if (true) { var a = ...; body }` evaluates the arguments and
+        # then has the value of the body.
+        return ast.If(_TRUE,
+                      ast.Boolean(_TRUE, True),
+                      ast.Block(call.token,
+                                [*temporaries,
+                                 ast.ExpressionStatement(call.token,
+                                                         inlined)]))
+
+    def _is_parameter(self, expression: ast.Expression) -> bool:
+        # Parameters of the caller are always initialized.
+        scope = self._scopes[-1]
+        if type(expression) != ast.Identifier or type(scope) != ast.Function:
+            return False
+
+        identifier = cast(ast.Identifier, expression)
+        return identifier.depth == 0 and \
+            any(parameter.slot == identifier.slot
+                for parameter in cast(ast.Function, scope).parameters)
+
+    def _statement(self, statement: ast.Statement) -> None:
+        node_type = type(statement)
+
+        if node_type == ast.ExpressionStatement:
+            expression_statement = cast(ast.ExpressionStatement, statement)
+            expression_statement.expression = self._expression(
+                expression_statement.expression)
+        elif node_type == ast.LetStatement:
+            let_statement = cast(ast.LetStatement, statement)
+            let_statement.value = self._expression(let_statement.value)
+        elif node_type == ast.ReturnStatement:
+            return_statement = cast(ast.ReturnStatement, statement)
+            return_statement.return_value = self._expression(
+                return_statement.return_value)
+
+    def _statements(self, block: Optional[ast.Block]) -> None:
+        if block is not None:
+            for statement in block.statements:
+                self._statement(statement)
+
+
+class _Copy:
+    # Copies the body of a function for one call site: parameters become
+    # the arguments and free variables are readdressed from the caller.
+
+    def __init__(self,
+                 caller_scopes: List[ast.ASTNode],
+                 definition: int,
+                 arguments: Dict[int, ast.Expression],
+                 tail: bool) -> None:
+        self._caller_scopes = caller_scopes
+        # Index in caller_scopes of the scope declaring the function: the
+        # innermost scope around its body.
+        self._definition = definition
+        self._arguments = arguments
+        self._tail = tail
+
+    def expression(
+            self,
+            expression: Optional[ast.Expression]) -> Optional[ast.Expression]:
+        node_type = type(expression)
+
+        if node_type == ast.Identifier:
+            return self._identifier(cast(ast.Identifier, expression))
+        elif node_type in (ast.Integer, ast.Float, ast.Boolean, ast.String):
+            # Literals are never modified in place, so they can be shared.
+            return expression
+        elif node_type == ast.Prefix:
+            prefix = cast(ast.Prefix, expression)
+            right = self.expression(prefix.right)
+
+            return None if right is None \
+                else ast.Prefix(prefix.token, prefix.operator, right)
+        elif node_type == ast.Infix:
+            infix = cast(ast.Infix, expression)
+            left = self.expression(infix.left)
+            right = self.expression(infix.right)
+
+            return None if left is None or right is None \
+                else ast.Infix(infix.token, left, infix.operator, right)
+        elif node_type == ast.If:
+            if_expression = cast(ast.If, expression)
+            condition = self.expression(if_expression.condition)
+            consequence = self._block(if_expression.consequence)
+            alternative = self._block(if_expression.alternative)
+
+            if condition is None or consequence is None or \
+                    (if_expression.alternative is not None and
+                     alternative is None):
+                return None
+
+            return ast.If(if_expression.token,
+                          condition,
+                          consequence,
+                          alternative)
+        elif node_type == ast.Call:
+            call = cast(ast.Call, expression)
+            # The name of a built-in function has no address to move.
+            function = call.function if call.builtin is not None \
+                else self.expression(call.function)
+
+            assert call.arguments is not None
+            arguments = [self.expression(argument)
+                         for argument in call.arguments]
+            if function is None or None in arguments:
+                return None
+
+            copy = ast.Call(call.token,
+                            function,
+                            cast(List[ast.Expression], arguments))
+            # Tail position in the body is tail position in the caller only
+            # if the call being replaced was itself in tail position.
+            copy.tail = call.tail and self._tail
+            copy.cache = InlineCache()
+            copy.builtin = call.builtin
+
+            return copy
+        elif node_type == ast.Vector:
+            vector = cast(ast.Vector, expression)
+
+            assert vector.elements is not None
+            elements = [self.expression(element)
+                        for element in vector.elements]
+            if None in elements:
+                return None
+
+            return ast.Vector(vector.token,
+                              cast(List[ast.Expression], elements))
+        elif node_type == ast.Index:
+            index = cast(ast.Index, expression)
+            left = self.expression(index.left)
+            position = self.expression(index.index)
+
+            return None if left is None or position is None \
+                else ast.Index(index.token, left, position)
+
+        return None
+
+    def _block(self, block: Optional[ast.Block]) -> Optional[ast.Block]:
+        if block is None:
+            return None
+
+        statements: List[ast.Statement] = []
+        for statement in block.statements:
+            if type(statement) != ast.ExpressionStatement:
+                return None
+
+            expression = self.expression(
+                cast(ast.ExpressionStatement, statement).expression)
+            if expression is None:
+                return None
+
+            statements.append(ast.ExpressionStatement(statement.token,
+                                                      expression))
+
+        return ast.Block(block.token, statements)
+
+    def _identifier(self, identifier: ast.Identifier) -> ast.Expression:
+        if identifier.depth == 0:
+            argument = self._arguments[identifier.slot]
+
+            # Each use gets its own node.
+            if type(argument) != ast.Identifier:
+                return argument
+
+            original = cast(ast.Identifier, argument)
+            copy = ast.Identifier(original.token, original.value)
+            copy.depth = original.depth
+            copy.slot = original.slot
+
+            return copy
+
+        # A free variable of the body lives in a scope around the function
+        # definition, which also encloses the caller.
+        scope = self._definition - (identifier.depth - 1)
+        copy = ast.Identifier(identifier.token, identifier.value)
+        copy.depth = len(self._caller_scopes) - 1 - scope
+        copy.slot = identifier.slot
+
+        return copy
+
+
+def _inlinable_body(function: ast.Function,
+                    max_size: int) -> Optional[ast.Expression]:
+    # Bodies made of a single expression, `{ x * x }` or
+    # `{ return x * x; }`, without nested functions.
+    body = function.body
+    if body is None or len(body.statements) != 1:
+        return None
+
+    statement = body.statements[0]
+    if type(statement) == ast.ExpressionStatement:
+        expression = cast(ast.ExpressionStatement, statement).expression
+    elif type(statement) == ast.ReturnStatement:
+        expression = cast(ast.ReturnStatement, statement).return_value
+    else:
+        return None
+
+    if expression is None:
+        return None
+
+    size = 0
+    for node in ast.walk(expression):
+        size += 1
+        if type(node) in (ast.Function, ast.LetStatement,
+                          ast.ReturnStatement):
+            return None
+
+    return expression if size <= max_size else None
+
+
+def _is_literal(expression: ast.Expression) -> bool:
+    return type(expression) in (ast.Integer, ast.Float, ast.Boolean,
+                                ast.String)
+
+
+def _local(parameter: ast.Identifier, slot: int) -> ast.Identifier:
+    identifier = ast.Identifier(parameter.token, parameter.value)
+    identifier.depth = 0
+    identifier.slot = slot
+
+    return identifier
+
+
+def _new_slot(function: ast.Function) -> int:
+    function.frame_size += 1
+
+    return function.frame_size - 1
+
+
+def inline_functions(program: ast.Program,
+                     max_size: int = DEFAULT_MAX_SIZE,
+                     closed_world: bool = False) -> int:
+    """
+    Replace calls to small functions of a resolved program by a copy of
+    the function body. Only functions whose body is one expression of at
+    most max_size nodes, without nested functions and without calls to
+    themselves, are inlined.
+
+    Literal arguments and parameters of the caller are substituted in the
+    body. Other arguments are stored in new slots of the caller, in order,
+    before the body runs, so each is still evaluated exactly once and
+    before the body. Run fold_constants afterwards to simplify
+    calls with literal arguments.
+
+    Globals are only trusted with closed_world, as in the other passes.
+
+    :rtype int: The number of calls inlined.
+    """
+    inliner = _Inliner(program, max_size, closed_world)
+    inliner.run()
+
+    return inliner.inlined
@@ -0,0 +1,249 @@
+from contextlib import contextmanager
+from time import perf_counter
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Counter,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import frl.ast as ast
+import frl.evaluator as evaluator
+from frl.object import (
+    Boolean,
+    CompiledFunction,
+    Environment,
+    Error,
+    Float,
+    Function,
+    Integer,
+    Object,
+    PersistentList,
+    PersistentMap,
+    Return,
+    Stream,
+    String,
+    TailCall,
+    Vector,
+)
+
+# Runtime classes whose instances track_allocations counts.
+_COUNTED: Tuple[type, ...] = (
+    Boolean,
+    CompiledFunction,
+    Environment,
+    Error,
+    Float,
+    Function,
+    Integer,
+    PersistentList,
+    PersistentMap,
+    Return,
+    Stream,
+    String,
+    TailCall,
+    Vector,
+)
+
+# Objects created inside track_allocations blocks so far, by class name,
+# the number of blocks open and the constructors they replaced.
+_allocations: 'Counter[str]' = Counter()
+_tracking: int = 0
+_constructors: Dict[type, Callable[..., None]] = {}
+
+
+def _counting(name: str,
+              constructor: Callable[..., None]) -> Callable[..., None]:
+    def counted(self: Any, *args: Any, **kwargs: Any) -> None:
+        _allocations[name] += 1
+        constructor(self, *args, **kwargs)
+
+    return counted
+
+
+@contextmanager
+def track_allocations() -> Iterator['Counter[str]']:
+    """
+    Count the runtime objects created inside the block, by class name.
+
+        with track_allocations() as created:
+            evaluate(program, env)
+        print(created['Integer'])
+
+    The constructors are swapped for counting wrappers only while a block
+    is open, so creating objects costs nothing extra the rest of the time.
+    """
+    global _tracking
+
+    created: 'Counter[str]' = Counter()
+
+    if _tracking == 0:
+        for cls in _COUNTED:
+            _constructors[cls] = cls.__init__  # type: ignore
+            setattr(cls, '__init__',
+                    _counting(cls.__name__, _constructors[cls]))
+
+    _tracking += 1
+    before = _allocations.copy()
+
+    try:
+        yield created
+    finally:
+        created.update(_allocations - before)
+        _tracking -= 1
+
+        if _tracking == 0:
+            for cls, constructor in _constructors.items():
+                setattr(cls, '__init__', constructor)
+
+
+class CallSiteStats(NamedTuple):
+    call: str
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+
+        return self.hits / total if total > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f'{self.call}: {self.hits} hits, {self.misses} misses ' + \
+            f'({self.hit_rate:.1%})'
+
+
+def call_site_stats(program: ast.Program) -> List[CallSiteStats]:
+    """
+    Inline cache hits and misses of every call site of a resolved program,
+    in source order.
+    """
+    stats: List[CallSiteStats] = []
+
+    for node in ast.walk(program):
+        if isinstance(node, ast.Call) and node.cache is not None:
+            stats.append(CallSiteStats(str(node),
+                                       node.cache.hits,
+                                       node.cache.misses))
+
+    return stats
+
+
+class NodeProfile(NamedTuple):
+    node_type: str
+    evaluations: int
+    # Seconds spent evaluating nodes of the type, without the time of
+    # their children.
+    time: float
+
+    def __str__(self) -> str:
+        return f'{self.node_type}: {self.evaluations} evaluations, ' + \
+            f'{self.time * 1000:.2f} ms'
+
+
+@contextmanager
+def profile_nodes() -> Iterator[List[NodeProfile]]:
+    """
+    Time the evaluator by node type inside the block, slowest first.
+
+        with profile_nodes() as profile:
+            evaluate(program, env)
+        print(profile[0])
+
+    The evaluator is swapped for a timing wrapper only within the block,
+    so evaluation costs nothing extra the rest of the time. The other
+    backends, and functions that already run as compiled code, are not
+    seen.
+    """
+    profile: List[NodeProfile] = []
+    counts: 'Counter[str]' = Counter()
+    times: Dict[str, float] = {}
+    # Time of the children of each node being evaluated.
+    children: List[float] = [0.0]
+    evaluate = evaluator.evaluate
+
+    def timed(node: ast.ASTNode, env: Environment) -> Optional[Object]:
+        children.append(0.0)
+        start = perf_counter()
+
+        try:
+            return evaluate(node, env)
+        finally:
+            elapsed = perf_counter() - start
+            name = type(node).__name__
+
+            counts[name] += 1
+            times[name] = times.get(name, 0.0) + elapsed - children.pop()
+            children[-1] += elapsed
+
+    evaluator.evaluate = timed  # type: ignore
+    try:
+        yield profile
+    finally:
+        evaluator.evaluate = evaluate  # type: ignore
+        profile.extend(sorted((NodeProfile(name, counts[name], time)
+                               for name, time in times.items()),
+                              key=lambda node: node.time,
+                              reverse=True))
+
+
+class MemoryTrace:
+    """
+    Memory allocated inside a trace_memory block: the objects of the
+    runtime by class name, and the peak and remaining bytes with the
+    source lines that allocated most.
+    """
+
+    def __init__(self) -> None:
+        self.objects: 'Counter[str]' = Counter()
+        self.peak: int = 0
+        self.retained: int = 0
+        self.top: List[str] = []
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    # Without the memory of tracemalloc itself.
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+@contextmanager
+def trace_memory(lines: int = 5) -> Iterator[MemoryTrace]:
+    """
+    Track allocations inside the block with tracemalloc, which makes it
+    several times slower.
+    """
+    trace = MemoryTrace()
+    # Already tracing, for instance under a memory profiler: keep it on.
+    started = not tracemalloc.is_tracing()
+
+    if started:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, 'reset_peak'):
+        # Python 3.9 and later.
+        tracemalloc.reset_peak()
+
+    before = _snapshot()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    try:
+        with track_allocations() as created:
+            yield trace
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        after = _snapshot()
+
+        if started:
+            tracemalloc.stop()
+
+        trace.objects.update(created)
+        trace.peak = peak - baseline
+        trace.retained = current - baseline
+        trace.top = [str(difference) for difference
+                     in after.compare_to(before, 'lineno')[:lines]]
@@ -1,6 +1,10 @@
 # lexer.py
 
 from re import match
+from typing import (
+    Dict,
+    List,
+)
 
 from frl.token import (
     Token,
@@ -9,6 +13,12 @@ from frl.token import (
 )
 
 
+_ESCAPES: Dict[str, str] = {
+    'n': '\n',
+    't': '\t',
+}
+
+
 class Lexer:
 
     def __init__(self, source: str) -> None:
@@ -58,6 +68,12 @@ class Lexer:
         # Token '}'
         elif match(r'^\}$', self._character):
             token = Token(TokenType.RBRACE, self._character)
+        # Token '['
+        elif match(r'^\[$', self._character):
+            token = Token(TokenType.LBRACKET, self._character)
+        # Token ']'
+        elif match(r'^\]$', self._character):
+            token = Token(TokenType.RBRACKET, self._character)
         # Token ','
         elif match(r'^\,$', self._character):
             token = Token(TokenType.COMMA, self._character)
@@ -86,6 +102,9 @@ class Lexer:
                     token = self._make_two_character_token(TokenType.NOT_EQ)
             else:
                 token = Token(TokenType.NEGATION, self._character)
+        # Token for strings
+        elif match(r'^"$', self._character):
+            token = self._read_string()
         # Token for any letter
         elif self._is_letter(self._character):
             literal = self._read_identifier()
@@ -158,6 +177,28 @@ class Lexer:
 
         return self._source[initial_position:self._position]
 
+    def _read_string(self) -> Token:
+        # The literal of the token is the text between the quotes, with
+        # escapes already replaced. Ends on the closing quote.
+        initial_position = self._position
+        characters: List[str] = []
+
+        self._read_character()
+        while self._character != '"':
+            if self._character == '':
+                return Token(TokenType.ILLEGAL,
+                             self._source[initial_position:self._position])
+            elif self._character == '\\':
+                self._read_character()
+                characters.append(_ESCAPES.get(self._character,
+                                               self._character))
+            else:
+                characters.append(self._character)
+
+            self._read_character()
+
+        return Token(TokenType.STRING, ''.join(characters))
+
     def _peek_character(self, skip=1) -> str:
         if self._read_position >= len(self._source):
             return ''
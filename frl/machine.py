@@ -0,0 +1,355 @@
+from typing import (
+    Any,
+    cast,
+    List,
+    Optional,
+    Tuple,
+)
+
+import frl.ast as ast
+from frl.evaluator import (
+    evaluate_index_expression,
+    evaluate_infix_expression,
+    evaluate_prefix_expression,
+    is_truthy,
+    new_error,
+    NOT_A_FUNCTION,
+    NOT_INITIALIZED,
+    NULL,
+    to_boolean_object,
+    vector_from_objects,
+    WRONG_NUMBER_OF_ARGUMENTS,
+)
+from frl.object import (
+    Environment,
+    Error,
+    Function,
+    Object,
+)
+
+
+Instruction = Tuple[Any, ...]
+
+# Opcodes of the instructions kept in the control stack.
+_EVAL = 0
+_BLOCK = 1
+_INFIX = 2
+_PREFIX = 3
+_BRANCH = 4
+_NULL_IF_NONE = 5
+_STORE = 6
+_APPLY = 7
+_RETURN = 8
+_CALL_END = 9
+_PROGRAM_END = 10
+_VECTOR = 11
+_INDEX = 12
+_BUILTIN = 13
+
+
+class Machine:
+    """
+    Evaluator that keeps its work in two heap-allocated stacks instead of
+    the Python call stack: a control stack of pending instructions and a
+    stack of intermediate values. Nesting depth and non-tail recursion are
+    only bounded by memory, and evaluation can be suspended after any
+    number of steps and resumed later with `run`.
+    """
+
+    def __init__(self, node: ast.ASTNode, env: Environment) -> None:
+        self._control: List[Instruction] = [(_PROGRAM_END, 0),
+                                            (_EVAL, node, env)]
+        self._values: List[Optional[Object]] = []
+        self._result: Optional[Object] = None
+        self._steps: int = 0
+
+    @property
+    def current_node(self) -> Optional[ast.ASTNode]:
+        if len(self._control) > 0 and self._control[-1][0] == _EVAL:
+            return self._control[-1][1]
+
+        return None
+
+    @property
+    def finished(self) -> bool:
+        return len(self._control) == 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._control)
+
+    @property
+    def result(self) -> Optional[Object]:
+        return self._result
+
+    @property
+    def steps(self) -> int:
+        return self._steps
+
+    def run(self, max_steps: Optional[int] = None) -> bool:
+        """
+        Execute pending instructions until the evaluation finishes or
+        max_steps instructions have run.
+
+        :rtype bool: True when the evaluation has finished.
+        """
+        control = self._control
+        steps = 0
+
+        while len(control) > 0:
+            if max_steps is not None and steps >= max_steps:
+                break
+
+            self._execute(control.pop())
+            steps += 1
+
+        self._steps += steps
+
+        return len(control) == 0
+
+    def step(self) -> bool:
+        return self.run(1)
+
+    def _execute(self, instruction: Instruction) -> None:
+        opcode = instruction[0]
+
+        if opcode == _EVAL:
+            self._eval(instruction[1], instruction[2])
+        elif opcode == _BLOCK:
+            _, statements, index, env = instruction
+            if index < len(statements):
+                if index > 0:
+                    self._values.pop()
+
+                self._control.append((_BLOCK, statements, index + 1, env))
+                self._control.append((_EVAL, statements[index], env))
+            elif index == 0:
+                self._values.append(None)
+        elif opcode == _INFIX:
+            right = self._values.pop()
+            left = self._values.pop()
+
+            assert left is not None and right is not None
+            self._push(evaluate_infix_expression(instruction[1], left, right))
+        elif opcode == _PREFIX:
+            right = self._values.pop()
+
+            assert right is not None
+            self._push(evaluate_prefix_expression(instruction[1], right))
+        elif opcode == _VECTOR:
+            values = self._values
+            count = instruction[1]
+            elements = cast(List[Object], values[len(values) - count:])
+            del values[len(values) - count:]
+
+            self._push(vector_from_objects(elements))
+        elif opcode == _BUILTIN:
+            _, builtin, count = instruction
+            values = self._values
+            args = cast(List[Object], values[len(values) - count:])
+            del values[len(values) - count:]
+
+            self._push(builtin.call(args))
+        elif opcode == _INDEX:
+            index = self._values.pop()
+            left = self._values.pop()
+
+            assert left is not None and index is not None
+            self._push(evaluate_index_expression(left, index))
+        elif opcode == _BRANCH:
+            _, node, env = instruction
+            condition = self._values.pop()
+
+            assert condition is not None
+            if is_truthy(condition):
+                self._control.append((_NULL_IF_NONE,))
+                self._control.append((_EVAL, node.consequence, env))
+            elif node.alternative is not None:
+                self._control.append((_NULL_IF_NONE,))
+                self._control.append((_EVAL, node.alternative, env))
+            else:
+                self._values.append(NULL)
+        elif opcode == _NULL_IF_NONE:
+            if self._values[-1] is None:
+                self._values[-1] = NULL
+        elif opcode == _STORE:
+            _, slot, env = instruction
+            env.store[slot] = self._values.pop()
+            self._values.append(None)
+        elif opcode == _APPLY:
+            self._apply(instruction[1], instruction[2])
+        elif opcode == _RETURN:
+            self._unwind(self._values.pop())
+        elif opcode == _CALL_END:
+            if self._values[-1] is None:
+                self._values[-1] = NULL
+        elif opcode == _PROGRAM_END:
+            self._result = self._values.pop() if self._values else None
+
+    def _eval(self, node: ast.ASTNode, env: Environment) -> None:
+        node_type = type(node)
+        control = self._control
+
+        if node_type == ast.Identifier:
+            node = cast(ast.Identifier, node)
+
+            value = env.lookup(node.depth, node.slot)
+            if value is None:
+                self._push(new_error(NOT_INITIALIZED, node.value))
+            else:
+                self._values.append(value)
+        elif node_type == ast.Integer:
+            node = cast(ast.Integer, node)
+
+            self._values.append(node.constant)
+        elif node_type == ast.Float:
+            node = cast(ast.Float, node)
+
+            self._values.append(node.constant)
+        elif node_type == ast.String:
+            node = cast(ast.String, node)
+
+            self._values.append(node.constant)
+        elif node_type == ast.Boolean:
+            node = cast(ast.Boolean, node)
+
+            assert node.value is not None
+            self._values.append(to_boolean_object(node.value))
+        elif node_type == ast.Infix:
+            node = cast(ast.Infix, node)
+
+            control.append((_INFIX, node.operator))
+            control.append((_EVAL, node.right, env))
+            control.append((_EVAL, node.left, env))
+        elif node_type == ast.Prefix:
+            node = cast(ast.Prefix, node)
+
+            control.append((_PREFIX, node.operator))
+            control.append((_EVAL, node.right, env))
+        elif node_type == ast.ExpressionStatement:
+            node = cast(ast.ExpressionStatement, node)
+
+            control.append((_EVAL, node.expression, env))
+        elif node_type == ast.Call:
+            node = cast(ast.Call, node)
+
+            assert node.arguments is not None
+            if node.builtin is not None:
+                control.append((_BUILTIN, node.builtin, len(node.arguments)))
+            else:
+                control.append((_APPLY, len(node.arguments), node.tail))
+            for argument in reversed(node.arguments):
+                control.append((_EVAL, argument, env))
+            if node.builtin is None:
+                control.append((_EVAL, node.function, env))
+        elif node_type == ast.Vector:
+            node = cast(ast.Vector, node)
+
+            assert node.elements is not None
+            control.append((_VECTOR, len(node.elements)))
+            for element in reversed(node.elements):
+                control.append((_EVAL, element, env))
+        elif node_type == ast.Index:
+            node = cast(ast.Index, node)
+
+            control.append((_INDEX,))
+            control.append((_EVAL, node.index, env))
+            control.append((_EVAL, node.left, env))
+        elif node_type == ast.If:
+            node = cast(ast.If, node)
+
+            control.append((_BRANCH, node, env))
+            control.append((_EVAL, node.condition, env))
+        elif node_type == ast.Block:
+            node = cast(ast.Block, node)
+
+            control.append((_BLOCK, node.statements, 0, env))
+        elif node_type == ast.ReturnStatement:
+            node = cast(ast.ReturnStatement, node)
+
+            control.append((_RETURN,))
+            control.append((_EVAL, node.return_value, env))
+        elif node_type == ast.LetStatement:
+            node = cast(ast.LetStatement, node)
+
+            assert node.name is not None
+            control.append((_STORE, node.name.slot, env))
+            control.append((_EVAL, node.value, env))
+        elif node_type == ast.Function:
+            node = cast(ast.Function, node)
+
+            function = Function(node, env)
+            if node.ident is not None:
+                env.store[node.ident.slot] = function
+
+            self._values.append(function)
+        elif node_type == ast.Program:
+            node = cast(ast.Program, node)
+
+            env.grow(node.frame_size)
+            control.append((_BLOCK, node.statements, 0, env))
+        else:
+            self._values.append(None)
+
+    def _apply(self, argc: int, tail: bool) -> None:
+        values = self._values
+        args = cast(List[Object], values[len(values) - argc:])
+        del values[len(values) - argc:]
+        function = values.pop()
+
+        assert function is not None
+        if type(function) != Function:
+            self._push(new_error(NOT_A_FUNCTION, function.type().name))
+            return
+
+        function = cast(Function, function)
+        node = function.node
+
+        if len(args) != len(node.parameters):
+            self._push(new_error(WRONG_NUMBER_OF_ARGUMENTS,
+                                 len(node.parameters),
+                                 len(args)))
+            return
+
+        env = Environment(node.frame_size, function.env)
+        env.store[:len(args)] = args
+
+        if tail:
+            # Whatever is left of the caller is trivial, so drop it and let
+            # the callee return straight to the caller's caller.
+            self._drop_to_marker()
+        else:
+            self._control.append((_CALL_END, len(values)))
+
+        assert node.body is not None
+        self._control.append((_BLOCK, node.body.statements, 0, env))
+
+    def _drop_to_marker(self) -> Instruction:
+        control = self._control
+
+        while control[-1][0] != _CALL_END and control[-1][0] != _PROGRAM_END:
+            control.pop()
+
+        marker = control[-1]
+        del self._values[marker[1]:]
+
+        return marker
+
+    def _push(self, value: Object) -> None:
+        if type(value) == Error:
+            # Errors abort the whole evaluation.
+            del self._control[1:]
+            self._unwind(value)
+        else:
+            self._values.append(value)
+
+    def _unwind(self, value: Optional[Object]) -> None:
+        self._drop_to_marker()
+        self._values.append(value)
+
+
+def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
+    machine = Machine(node, env)
+    machine.run()
+
+    return machine.result
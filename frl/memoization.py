@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import (
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+import frl.ast as ast
+from frl.object import Object
+from frl.purity import find_pure_functions
+
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class ResultCache:
+    """
+    Bounded mapping from argument values to the result of a function call,
+    evicting the least recently used entry when it is full.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: 'OrderedDict[Hashable, Object]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Object]:
+        value = self._entries.get(key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        return value
+
+    def put(self, key: Hashable, value: Object) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+class CacheStats(NamedTuple):
+    name: str
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    def __str__(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total > 0 else 0.0
+
+        return f'{self.name}: {self.hits} hits, {self.misses} misses ' + \
+            f'({rate:.1%}), {self.evictions} evictions, {self.size} entries'
+
+
+def memoize(program: ast.Program,
+            max_size: int = DEFAULT_CACHE_SIZE) -> List[ast.Function]:
+    """
+    Attach a result cache to every pure function of a resolved program.
+    Calls whose arguments are all integers, floats or booleans are then
+    answered from the cache when possible.
+
+    :rtype List[ast.Function]: The functions that were memoized.
+    """
+    functions = find_pure_functions(program)
+
+    for function in functions:
+        function.cache = ResultCache(max_size)
+
+    return functions
+
+
+def cache_stats(program: ast.Program) -> List[CacheStats]:
+    names = ast.function_names(program)
+    stats: List[CacheStats] = []
+
+    for node in ast.walk(program):
+        if isinstance(node, ast.Function) and node.cache is not None:
+            stats.append(CacheStats(names.get(id(node), 'fun'),
+                                    node.cache.hits,
+                                    node.cache.misses,
+                                    node.cache.evictions,
+                                    len(node.cache)))
+
+    return stats
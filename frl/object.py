@@ -6,13 +6,46 @@ from enum import (
     auto,
     Enum
 )
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+from zlib import crc32
+
+import frl.ast as ast
+
+if TYPE_CHECKING:
+    from frl.inline_cache import InlineCache
+
+
+# Integers in this range are preallocated and shared, see new_integer.
+SMALL_INTEGER_MIN = -256
+SMALL_INTEGER_MAX = 1024
 
 
 class ObjectType(Enum):
     BOOLEAN = auto()
+    ERROR = auto()
     FLOAT = auto()
+    FUNCTION = auto()
     INTEGERS = auto()
+    LIST = auto()
+    MAP = auto()
     NULL = auto()
+    RETURN = auto()
+    STREAM = auto()
+    STRING = auto()
+    TAIL_CALL = auto()
+    VECTOR = auto()
 
 
 class Object(ABC):
@@ -62,6 +95,465 @@ class Boolean(Object):
         return 'true' if self.value else 'false'
 
 
+class Vector(Object):
+    """
+    Vector of floats. The values are a NumPy array when NumPy is installed
+    and an array('d') otherwise, see frl.vector, and are never modified in
+    place.
+    """
+
+    def __init__(self, values: Any) -> None:
+        self.values = values
+
+    def type(self) -> ObjectType:
+        return ObjectType.VECTOR
+
+    def inspect(self) -> str:
+        values = ', '.join(str(float(value)) for value in self.values)
+
+        return f'[{values}]'
+
+
+# Persistent collections share every node an update does not touch, so
+# an update copies O(log32 n) nodes of at most 32 entries instead of the
+# whole collection.
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+
+
+class PersistentList(Object):
+    """
+    Immutable list stored as a 32-way trie of the elements plus a tail of
+    up to 32 elements not in the trie yet, so most pushes only copy the
+    tail. Every update returns a new list.
+    """
+
+    def __init__(self,
+                 count: int = 0,
+                 shift: int = _BITS,
+                 root: Optional[List[Any]] = None,
+                 tail: Optional[List[Object]] = None) -> None:
+        self.count = count
+        # Bits of the index consumed by the levels above the leaves.
+        self.shift = shift
+        self.root: List[Any] = [] if root is None else root
+        self.tail: List[Object] = [] if tail is None else tail
+
+    def type(self) -> ObjectType:
+        return ObjectType.LIST
+
+    def inspect(self) -> str:
+        return f'list({", ".join(value.inspect() for value in self)})'
+
+    def __iter__(self) -> Iterator[Object]:
+        for start in range(0, self._tail_offset(), _WIDTH):
+            yield from self._leaf(start)
+
+        yield from self.tail
+
+    def get(self, index: int) -> Object:
+        return self._leaf(index)[index & _MASK]
+
+    def push(self, value: Object) -> 'PersistentList':
+        if self.count - self._tail_offset() < _WIDTH:
+            return PersistentList(self.count + 1,
+                                  self.shift,
+                                  self.root,
+                                  [*self.tail, value])
+
+        # The tail is full: it becomes a leaf of the trie, which grows a
+        # level when the root has no room left.
+        shift = self.shift
+        if (self.count >> _BITS) > (1 << self.shift):
+            root = [self.root, _new_path(self.shift, self.tail)]
+            shift += _BITS
+        else:
+            root = self._push_tail(self.shift, self.root, self.tail)
+
+        return PersistentList(self.count + 1, shift, root, [value])
+
+    def set(self, index: int, value: Object) -> 'PersistentList':
+        if index >= self._tail_offset():
+            tail = list(self.tail)
+            tail[index & _MASK] = value
+
+            return PersistentList(self.count, self.shift, self.root, tail)
+
+        return PersistentList(self.count,
+                              self.shift,
+                              _set_path(self.shift, self.root, index, value),
+                              self.tail)
+
+    def _leaf(self, index: int) -> List[Object]:
+        if index >= self._tail_offset():
+            return self.tail
+
+        node = self.root
+        for level in range(self.shift, 0, -_BITS):
+            node = node[(index >> level) & _MASK]
+
+        return node
+
+    def _push_tail(self,
+                   level: int,
+                   parent: List[Any],
+                   tail: List[Object]) -> List[Any]:
+        index = ((self.count - 1) >> level) & _MASK
+
+        if level == _BITS:
+            child: List[Any] = tail
+        elif index < len(parent):
+            child = self._push_tail(level - _BITS, parent[index], tail)
+        else:
+            child = _new_path(level - _BITS, tail)
+
+        copy = list(parent)
+        if index < len(copy):
+            copy[index] = child
+        else:
+            copy.append(child)
+
+        return copy
+
+    def _tail_offset(self) -> int:
+        return 0 if self.count < _WIDTH \
+            else ((self.count - 1) >> _BITS) << _BITS
+
+
+def _new_path(level: int, node: List[Any]) -> List[Any]:
+    for _ in range(0, level, _BITS):
+        node = [node]
+
+    return node
+
+
+def _set_path(level: int,
+              node: List[Any],
+              index: int,
+              value: Object) -> List[Any]:
+    copy = list(node)
+
+    if level == 0:
+        copy[index & _MASK] = value
+    else:
+        position = (index >> level) & _MASK
+        copy[position] = _set_path(level - _BITS, node[position], index, value)
+
+    return copy
+
+
+class _Leaf(NamedTuple):
+    hash: int
+    key: Hashable
+    key_object: Object
+    value: Object
+
+
+class _Collision(NamedTuple):
+    # Leaves whose keys have the same 32-bit hash.
+    hash: int
+    leaves: Tuple[_Leaf, ...]
+
+
+class _MapNode(NamedTuple):
+    # One bit per possible 5-bit hash fragment, and the entries of the bits
+    # that are set, in order.
+    bitmap: int
+    entries: Tuple[Union[_Leaf, _Collision, '_MapNode'], ...]
+
+
+_EMPTY_NODE = _MapNode(0, ())
+
+
+class PersistentMap(Object):
+    """
+    Immutable hash array mapped trie: every level of the trie uses the
+    next 5 bits of the hash of the key. Keys are numbers, booleans, strings
+    or null, compared like `==` compares them, see map_key. Every update
+    returns a new map.
+    """
+
+    def __init__(self, count: int = 0, root: _MapNode = _EMPTY_NODE) -> None:
+        self.count = count
+        self.root = root
+
+    def type(self) -> ObjectType:
+        return ObjectType.MAP
+
+    def inspect(self) -> str:
+        entries = ', '.join(f'{leaf.key_object.inspect()}: '
+                            f'{leaf.value.inspect()}'
+                            for leaf in _leaves(self.root))
+
+        return f'map({entries})'
+
+    def get(self, key: Hashable) -> Optional[Object]:
+        hash_ = hash(key) & 0xFFFFFFFF
+        node: Union[_Leaf, _Collision, _MapNode] = self.root
+        shift = 0
+
+        while type(node) is _MapNode:
+            bitmap, entries = node  # type: ignore
+            bit = 1 << ((hash_ >> shift) & _MASK)
+            if not bitmap & bit:
+                return None
+
+            node = entries[_popcount(bitmap & (bit - 1))]
+            shift += _BITS
+
+        leaves = cast(_Collision, node).leaves if type(node) is _Collision \
+            else (cast(_Leaf, node),)
+
+        for leaf in leaves:
+            if leaf.key == key:
+                return leaf.value
+
+        return None
+
+    def put(self,
+            key: Hashable,
+            key_object: Object,
+            value: Object) -> 'PersistentMap':
+        leaf = _Leaf(hash(key) & 0xFFFFFFFF, key, key_object, value)
+        root, added = _put(self.root, 0, leaf)
+
+        return PersistentMap(self.count + added, root)
+
+
+class _StringKey(str):
+    # Same reason as the number tags of map_key, with a hash that does not
+    # change between runs.
+
+    def __hash__(self) -> int:
+        return crc32(self.encode())
+
+
+def map_key(key: Object) -> Optional[Hashable]:
+    """
+    The key a value has in a PersistentMap, or None for values that cannot
+    be keys. 1 and 1.0 are the same key, as `1 == 1.0`.
+    """
+    # Tagged with numbers rather than names: string hashes change from one
+    # run to the next, and they would change the order of the entries.
+    key_type = type(key)
+
+    if key_type == Integer or key_type == Float:
+        return (0, key.value)  # type: ignore
+    elif key_type == Boolean:
+        return (1, key.value)  # type: ignore
+    elif key_type == Null:
+        return (2,)
+    elif key_type == String:
+        return _StringKey(cast(String, key).value)
+
+    return None
+
+
+def _leaves(node: Union[_Leaf, _Collision, _MapNode]) -> Iterator[_Leaf]:
+    if type(node) is _Leaf:
+        yield node  # type: ignore
+    elif type(node) is _Collision:
+        yield from node.leaves  # type: ignore
+    else:
+        for entry in node.entries:  # type: ignore
+            yield from _leaves(entry)
+
+
+def _merge(first: _Leaf, second: _Leaf, shift: int) -> _MapNode:
+    # Node holding two leaves with different hashes.
+    first_index = (first.hash >> shift) & _MASK
+    second_index = (second.hash >> shift) & _MASK
+
+    if first_index == second_index:
+        return _MapNode(1 << first_index,
+                        (_merge(first, second, shift + _BITS),))
+    elif first_index < second_index:
+        return _MapNode((1 << first_index) | (1 << second_index),
+                        (first, second))
+
+    return _MapNode((1 << first_index) | (1 << second_index),
+                    (second, first))
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count('1')
+
+
+def _put(node: _MapNode,
+         shift: int,
+         leaf: _Leaf) -> Tuple[_MapNode, bool]:
+    # The node with the leaf added or replaced, and whether it was added.
+    bit = 1 << ((leaf.hash >> shift) & _MASK)
+    index = _popcount(node.bitmap & (bit - 1))
+    entries = node.entries
+
+    if not node.bitmap & bit:
+        return _MapNode(node.bitmap | bit,
+                        (*entries[:index], leaf, *entries[index:])), True
+
+    entry = entries[index]
+    added = True
+
+    if type(entry) is _Leaf:
+        entry = cast(_Leaf, entry)
+
+        if entry.key == leaf.key:
+            replacement: Union[_Leaf, _Collision, _MapNode] = leaf
+            added = False
+        elif entry.hash == leaf.hash:
+            replacement = _Collision(leaf.hash, (entry, leaf))
+        else:
+            replacement = _merge(entry, leaf, shift + _BITS)
+    elif type(entry) is _Collision:
+        collision = cast(_Collision, entry)
+
+        if collision.hash == leaf.hash:
+            others = tuple(other for other in collision.leaves
+                           if other.key != leaf.key)
+            added = len(others) == len(collision.leaves)
+            replacement = _Collision(leaf.hash, (*others, leaf))
+        else:
+            # Push the collision one level down, next to the new leaf.
+            below = _MapNode(1 << ((collision.hash >> (shift + _BITS)) &
+                                   _MASK),
+                             (collision,))
+            replacement, added = _put(below, shift + _BITS, leaf)
+    else:
+        replacement, added = _put(cast(_MapNode, entry), shift + _BITS, leaf)
+
+    return _MapNode(node.bitmap,
+                    (*entries[:index], replacement, *entries[index + 1:])), \
+        added
+
+
+# Concatenations shorter than this copy the characters into one piece
+# instead of adding a rope node.
+_SHORT_STRING = 64
+
+
+class String(Object):
+    """
+    Immutable string stored as a rope. Concatenation only makes a node
+    pointing at both halves, so building a long string piece by piece is
+    linear; the characters are copied into one Python string the first
+    time the whole value is needed, and the node then keeps just that.
+
+    Indexing walks down the rope, after rebalancing it when the
+    concatenations left it deeper than twice the bits of its length.
+    """
+
+    def __init__(self,
+                 flat: Optional[str] = '',
+                 left: Optional['String'] = None,
+                 right: Optional['String'] = None) -> None:
+        self._flat = flat
+        self._left = left
+        self._right = right
+        self.length: int
+        self._depth: int
+
+        if left is not None and right is not None:
+            self.length = left.length + right.length
+            self._depth = max(left._depth, right._depth) + 1
+        else:
+            self.length = len(cast(str, flat))
+            self._depth = 0
+
+    def type(self) -> ObjectType:
+        return ObjectType.STRING
+
+    def inspect(self) -> str:
+        return self.value
+
+    @property
+    def value(self) -> str:
+        if self._flat is None:
+            self._flat = ''.join(leaf._flat  # type: ignore
+                                 for leaf in self._leaves())
+            self._left = self._right = None
+            self._depth = 0
+
+        return self._flat
+
+    def char_at(self, index: int) -> str:
+        if self._depth > 2 * self.length.bit_length():
+            self._rebalance()
+
+        node = self
+        while node._flat is None:
+            left = cast(String, node._left)
+            if index < left.length:
+                node = left
+            else:
+                index -= left.length
+                node = cast(String, node._right)
+
+        return node._flat[index]
+
+    def concat(self, other: 'String') -> 'String':
+        if self.length == 0:
+            return other
+        elif other.length == 0:
+            return self
+        elif self.length + other.length <= _SHORT_STRING and \
+                self._flat is not None and other._flat is not None:
+            return String(self._flat + other._flat)
+
+        return String(None, self, other)
+
+    def _leaves(self) -> Iterator['String']:
+        # Without recursion: a string built one piece at a time is a rope
+        # as deep as the number of pieces.
+        stack = [self]
+
+        while stack:
+            node = stack.pop()
+
+            if node._flat is not None:
+                yield node
+            else:
+                stack.append(cast(String, node._right))
+                stack.append(cast(String, node._left))
+
+    def _rebalance(self) -> None:
+        balanced = _balanced(list(self._leaves()))
+
+        self._left = balanced._left
+        self._right = balanced._right
+        self._depth = balanced._depth
+
+
+def _balanced(leaves: List[String]) -> String:
+    if len(leaves) == 1:
+        return leaves[0]
+
+    middle = len(leaves) // 2
+
+    return String(None, _balanced(leaves[:middle]), _balanced(leaves[middle:]))
+
+
+class Stream(Object):
+    """
+    Lazy sequence. It only keeps how to produce its elements, and each
+    traversal produces them again one at a time, so a pipeline of streams
+    runs in constant memory whatever the number of elements.
+    """
+
+    def __init__(self, elements: Callable[[], Iterator[Object]]) -> None:
+        self.elements = elements
+
+    def type(self) -> ObjectType:
+        return ObjectType.STREAM
+
+    def inspect(self) -> str:
+        # Showing the elements would mean producing them.
+        return 'stream'
+
+    def __iter__(self) -> Iterator[Object]:
+        return self.elements()
+
+
 class Null(Object):
 
     def type(self) -> ObjectType:
@@ -69,3 +561,129 @@ class Null(Object):
 
     def inspect(self) -> str:
         return 'null'
+
+
+class Return(Object):
+
+    def __init__(self, value: Object) -> None:
+        self.value = value
+
+    def type(self) -> ObjectType:
+        return ObjectType.RETURN
+
+    def inspect(self) -> str:
+        return self.value.inspect()
+
+
+class Error(Object):
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+    def type(self) -> ObjectType:
+        return ObjectType.ERROR
+
+    def inspect(self) -> str:
+        return f'Error: {self.message}'
+
+
+class Environment:
+    """
+    A scope at run time. Variables are not looked up by name: the resolver
+    gives every identifier a (depth, slot) address, so a read walks `depth`
+    outer environments and then indexes `store`.
+    """
+
+    def __init__(self,
+                 size: int = 0,
+                 outer: Optional['Environment'] = None) -> None:
+        self.store: List[Optional[Object]] = [None] * size
+        self.outer = outer
+
+    def grow(self, size: int) -> None:
+        missing = size - len(self.store)
+        if missing > 0:
+            self.store.extend([None] * missing)
+
+    def lookup(self, depth: int, slot: int) -> Optional[Object]:
+        env = self
+        while depth > 0:
+            assert env.outer is not None
+            env = env.outer
+            depth -= 1
+
+        return env.store[slot]
+
+
+class Function(Object):
+
+    def __init__(self,
+                 node: ast.Function,
+                 env: Environment) -> None:
+        self.node = node
+        self.env = env
+        # Calls made through this value, tail calls included.
+        self.calls: int = 0
+
+    def type(self) -> ObjectType:
+        return ObjectType.FUNCTION
+
+    def inspect(self) -> str:
+        return str(self.node)
+
+
+class CompiledFunction(Object):
+    """
+    Function value produced by code generated from FRostri source, such as
+    the Python backend in frl.transpiler.
+    """
+
+    def __init__(self,
+                 function: Callable[..., Any],
+                 node: ast.Function) -> None:
+        self.function = function
+        self.node = node
+
+    def type(self) -> ObjectType:
+        return ObjectType.FUNCTION
+
+    def inspect(self) -> str:
+        return str(self.node)
+
+
+class TailCall(Object):
+    """
+    Pending call in tail position. It travels up to the function
+    application that is already running, which performs the call in a loop
+    instead of nesting a new Python frame.
+    """
+
+    def __init__(self,
+                 function: Object,
+                 args: List[Object],
+                 site: Optional['InlineCache'] = None) -> None:
+        self.function = function
+        self.args = args
+        self.site = site
+
+    def type(self) -> ObjectType:
+        return ObjectType.TAIL_CALL
+
+    def inspect(self) -> str:
+        return f'{self.function.inspect()}(...)'
+
+
+_SMALL_INTEGERS: List[Integer] = [
+    Integer(value) for value in range(SMALL_INTEGER_MIN, SMALL_INTEGER_MAX + 1)
+]
+
+
+def new_integer(value: int) -> Integer:
+    """
+    Integer object for a value, shared between all uses when the value is
+    small.
+    """
+    if SMALL_INTEGER_MIN <= value <= SMALL_INTEGER_MAX:
+        return _SMALL_INTEGERS[value - SMALL_INTEGER_MIN]
+
+    return Integer(value)
@@ -19,6 +19,7 @@ from frl.ast import (
     Function,
     Identifier,
     If,
+    Index,
     Infix,
     Integer,
     LetStatement,
@@ -26,6 +27,8 @@ from frl.ast import (
     Program,
     ReturnStatement,
     Statement,
+    String,
+    Vector,
 )
 from frl.lexer import Lexer
 from frl.token import (
@@ -48,6 +51,7 @@ class Precedence(IntEnum):
     PRODUCT = 5
     PREFIX = 6
     CALL = 7
+    INDEX = 8
 
 
 PRECEDENCES: Dict[TokenType, Precedence] = {
@@ -64,6 +68,7 @@ PRECEDENCES: Dict[TokenType, Precedence] = {
     TokenType.DIVISION: Precedence.PRODUCT,
     TokenType.MULTIPLICATION: Precedence.PRODUCT,
     TokenType.LPAREN: Precedence.CALL,
+    TokenType.LBRACKET: Precedence.INDEX,
 }
 
 
@@ -182,29 +187,33 @@ class Parser:
         return call
 
     def _parse_call_arguments(self) -> Optional[List[Expression]]:
-        arguments: List[Expression] = []
+        return self._parse_expression_list(TokenType.RPAREN)
+
+    def _parse_expression_list(
+            self, end: TokenType) -> Optional[List[Expression]]:
+        expressions: List[Expression] = []
 
         assert self._peek_token is not None
-        if self._peek_token.token_type == TokenType.RPAREN:
+        if self._peek_token.token_type == end:
             self._advance_tokens()
 
-            return arguments
+            return expressions
 
         self._advance_tokens()
         if expression := self._parse_expression(Precedence.LOWEST):
-            arguments.append(expression)
+            expressions.append(expression)
 
         while self._peek_token.token_type == TokenType.COMMA:
             self._advance_tokens()
             self._advance_tokens()
 
             if expression := self._parse_expression(Precedence.LOWEST):
-                arguments.append(expression)
+                expressions.append(expression)
 
-        if not self._expected_token(TokenType.RPAREN):
+        if not self._expected_token(end):
             return None
 
-        return arguments
+        return expressions
 
     def _parse_expression(self, precedence: Precedence) -> Optional[Expression]:
         assert self._current_token is not None
@@ -256,10 +265,11 @@ class Parser:
         if self._peek_token.token_type == TokenType.IDENT:
             self._advance_tokens()
             function.ident = self._parse_identifier()
-        elif not self._expected_token(TokenType.LPAREN):
+
+        if not self._expected_token(TokenType.LPAREN):
             return None
 
-        function.parameters = self._parse_function_parameters(function.ident)
+        function.parameters = self._parse_function_parameters()
 
         if not self._expected_token(TokenType.LBRACE):
             return None
@@ -268,7 +278,7 @@ class Parser:
 
         return function
 
-    def _parse_function_parameters(self, ident) -> List[Identifier]:
+    def _parse_function_parameters(self) -> List[Identifier]:
         params: List[Identifier] = []
 
         assert self._peek_token is not None
@@ -277,8 +287,6 @@ class Parser:
 
             return params
 
-        if ident is not None:
-            self._advance_tokens()
         self._advance_tokens()
 
         assert self._current_token is not None
@@ -346,6 +354,19 @@ class Parser:
 
         return if_expression
 
+    def _parse_index(self, left: Expression) -> Optional[Index]:
+        assert self._current_token is not None
+        index = Index(token=self._current_token, left=left)
+
+        self._advance_tokens()
+
+        index.index = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expected_token(TokenType.RBRACKET):
+            return None
+
+        return index
+
     def _parse_infix_expression(self, left: Expression) -> Infix:
         assert self._current_token is not None
         infix = Infix(token=self._current_token,
@@ -439,6 +460,22 @@ class Parser:
         except KeyError:
             return Precedence.LOWEST
 
+    def _parse_string(self) -> String:
+        assert self._current_token is not None
+
+        return String(token=self._current_token,
+                      value=self._current_token.literal)
+
+    def _parse_vector(self) -> Optional[Vector]:
+        assert self._current_token is not None
+        vector = Vector(token=self._current_token)
+        vector.elements = self._parse_expression_list(TokenType.RBRACKET)
+
+        if vector.elements is None:
+            return None
+
+        return vector
+
     def _register_infix_fns(self) -> InfixParseFns:
         return {
             TokenType.PLUS: self._parse_infix_expression,
@@ -454,6 +491,7 @@ class Parser:
             TokenType.SIMILAR: self._parse_infix_expression,
             TokenType.DIFF: self._parse_infix_expression,
             TokenType.LPAREN: self._parse_call,
+            TokenType.LBRACKET: self._parse_index,
         }
 
     def _register_prefix_fns(self) -> PrefixParseFns:
@@ -464,8 +502,10 @@ class Parser:
             TokenType.IDENT: self._parse_identifier,
             TokenType.IF: self._parse_if,
             TokenType.INT: self._parse_integer,
+            TokenType.LBRACKET: self._parse_vector,
             TokenType.LPAREN: self._parse_grouped_expression,
             TokenType.MINUS: self._parse_prefix_expression,
             TokenType.NEGATION: self._parse_prefix_expression,
+            TokenType.STRING: self._parse_string,
             TokenType.TRUE: self._parse_boolean,
         }
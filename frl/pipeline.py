@@ -0,0 +1,205 @@
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+import frl.ast as ast
+from frl.constant_folding import fold_constants
+from frl.cse import eliminate_common_subexpressions
+from frl.dead_code import eliminate_dead_code
+from frl.evaluator import evaluate
+from frl.feedback import enable_type_feedback
+from frl.inference import infer_types
+from frl.inliner import inline_functions
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.tiering import enable_tiering
+
+
+DEFAULT_OPTIMIZATION_LEVEL = 1
+OPTIMIZATION_LEVELS = (0, 1, 2)
+
+
+class OptimizationPass(NamedTuple):
+    name: str
+    # Transforms a resolved program in place and returns how many changes
+    # it made, or the list of them.
+    run: Callable[[ast.Program], Any]
+
+
+class PassStats(NamedTuple):
+    name: str
+    time: float
+    nodes_before: int
+    nodes_after: int
+    changes: int
+
+    def __str__(self) -> str:
+        delta = self.nodes_after - self.nodes_before
+
+        return f'{self.name}: {self.time * 1000:.2f} ms, ' + \
+            f'{self.changes} changes, ' + \
+            f'{self.nodes_before} -> {self.nodes_after} nodes ({delta:+d})'
+
+
+class VerificationFailure(NamedTuple):
+    # The pass after which the program first gave another result.
+    name: str
+    source: str
+    expected: str
+    actual: str
+
+    def __str__(self) -> str:
+        return f'{self.name}: {self.source.strip()} gave {self.actual}, ' + \
+            f'expected {self.expected}'
+
+
+class Pipeline:
+    """
+    Ordered list of AST transforms run over resolved programs. Every pass
+    keeps the slots assigned by the resolver, so the program can be
+    evaluated right after any of them.
+    """
+
+    def __init__(self, passes: List[OptimizationPass]) -> None:
+        self.passes = passes
+
+    def run(self, program: ast.Program) -> List[PassStats]:
+        stats: List[PassStats] = []
+        nodes = _size(program)
+
+        for optimization in self.passes:
+            start = perf_counter()
+            result = optimization.run(program)
+            elapsed = perf_counter() - start
+
+            after = _size(program)
+            stats.append(PassStats(optimization.name,
+                                   elapsed,
+                                   nodes,
+                                   after,
+                                   result if type(result) == int
+                                   else len(result)))
+            nodes = after
+
+        return stats
+
+    def verify(self, corpus: List[str]) -> List[VerificationFailure]:
+        """
+        Evaluate every program of the corpus without optimizations and
+        after each pass, and report the first pass that changes the result
+        of each program.
+        """
+        failures: List[VerificationFailure] = []
+
+        for source in corpus:
+            expected = _result(_parse(source))
+
+            # Evaluating leaves inline caches sized for the frames of the
+            # time, so every step starts again from the source.
+            for index, optimization in enumerate(self.passes):
+                program = _parse(source)
+                Pipeline(self.passes[:index + 1]).run(program)
+                actual = _result(program)
+
+                if actual != expected:
+                    failures.append(VerificationFailure(optimization.name,
+                                                        source,
+                                                        expected,
+                                                        actual))
+                    break
+
+        return failures
+
+
+def _parse(source: str) -> ast.Program:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    resolver = Resolver()
+    resolver.resolve(program)
+
+    if len(parser.errors) > 0 or len(resolver.errors) > 0:
+        raise ValueError('\n'.join(parser.errors + resolver.errors))
+
+    return program
+
+
+def _result(program: ast.Program) -> str:
+    result: Optional[Object] = evaluate(program, Environment())
+
+    return 'nothing' if result is None \
+        else f'{result.type().name} {result.inspect()}'
+
+
+def _size(program: ast.Program) -> int:
+    return sum(1 for _ in ast.walk(program))
+
+
+def optimization_pipeline(level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                          closed_world: bool = False,
+                          type_feedback: bool = False) -> Pipeline:
+    """
+    Preset pipelines, from cheapest to compile to fastest to run:
+
+        -O0  no passes, every call runs in the tree-walking evaluator
+        -O1  constant folding and dead code elimination, and hot functions
+             are compiled
+        -O2  inlining, then folding, common subexpression elimination,
+             dead code elimination and type inference, and hot functions
+             are compiled with unboxed arithmetic
+
+    Type inference goes last among the transforms so that the handlers it
+    installs are on the final nodes, and tiering after them so that the
+    functions compiled are the optimized ones. closed_world is passed on to
+    the passes that take it.
+
+    With type_feedback, a last transform profiles the operand types of the
+    operators inference left generic, and specializes them at run time.
+    """
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f'Unknown optimization level: {level}')
+
+    passes: List[OptimizationPass] = []
+
+    if level >= 2:
+        passes.append(OptimizationPass(
+            'inline',
+            lambda program: inline_functions(program,
+                                             closed_world=closed_world)))
+
+    if level >= 1:
+        passes.append(OptimizationPass('fold', fold_constants))
+
+    if level >= 2:
+        passes.append(OptimizationPass('cse',
+                                       eliminate_common_subexpressions))
+
+    if level >= 1:
+        passes.append(OptimizationPass(
+            'dead-code',
+            lambda program: eliminate_dead_code(program, closed_world)))
+
+    if level >= 2:
+        passes.append(OptimizationPass(
+            'infer-types',
+            lambda program: infer_types(program, closed_world)))
+
+    if type_feedback:
+        passes.append(OptimizationPass('type-feedback',
+                                       enable_type_feedback))
+
+    if level >= 1:
+        passes.append(OptimizationPass(
+            'tier',
+            lambda program: enable_tiering(program, unboxed=level >= 2)))
+
+    return Pipeline(passes)
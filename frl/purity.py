@@ -0,0 +1,153 @@
+from typing import (
+    cast,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import frl.ast as ast
+
+
+# A binding is identified by the node that opens its scope (the program or
+# a function) and the slot inside that scope.
+Binding = Tuple[int, int]
+
+
+class _FunctionInfo:
+
+    def __init__(self, node: ast.Function) -> None:
+        self.node = node
+        self.free_bindings: Set[Binding] = set()
+        self.has_nested_functions: bool = False
+
+
+class _PurityAnalysis:
+
+    def __init__(self) -> None:
+        self.functions: List[_FunctionInfo] = []
+        # Every declaration of each binding: the named function or the
+        # function literal assigned by `var`, or None for anything else.
+        self.declarations: Dict[Binding, List[Optional[ast.Function]]] = {}
+
+        self._scopes: List[ast.ASTNode] = []
+        self._infos: List[_FunctionInfo] = []
+
+    def visit_program(self, program: ast.Program) -> None:
+        self._scopes.append(program)
+
+        for statement in program.statements:
+            self._visit(statement)
+
+        self._scopes.pop()
+
+    def _declare(self,
+                 identifier: ast.Identifier,
+                 function: Optional[ast.Function]) -> None:
+        binding = (id(self._scopes[-1]), identifier.slot)
+        self.declarations.setdefault(binding, []).append(function)
+
+    def _visit(self, node: Optional[ast.ASTNode]) -> None:
+        if node is None:
+            return
+
+        node_type = type(node)
+
+        if node_type == ast.Identifier:
+            node = cast(ast.Identifier, node)
+
+            if len(self._infos) > 0 and node.depth > 0:
+                scope = self._scopes[-1 - node.depth]
+                self._infos[-1].free_bindings.add((id(scope), node.slot))
+        elif node_type == ast.LetStatement:
+            node = cast(ast.LetStatement, node)
+
+            assert node.name is not None
+            value = node.value
+            self._declare(node.name,
+                          cast(ast.Function, value)
+                          if type(value) == ast.Function else None)
+            self._visit(node.value)
+        elif node_type == ast.Function:
+            node = cast(ast.Function, node)
+
+            self._visit_function(node)
+        else:
+            for child in ast.children(node):
+                self._visit(child)
+
+    def _visit_function(self, function: ast.Function) -> None:
+        if function.ident is not None:
+            self._declare(function.ident, function)
+
+        if len(self._infos) > 0:
+            self._infos[-1].has_nested_functions = True
+
+        info = _FunctionInfo(function)
+        self.functions.append(info)
+        self._infos.append(info)
+        self._scopes.append(function)
+
+        for parameter in function.parameters:
+            self._declare(parameter, None)
+
+        self._visit(function.body)
+
+        self._scopes.pop()
+        self._infos.pop()
+
+
+def find_pure_functions(program: ast.Program) -> List[ast.Function]:
+    """
+    Functions of a resolved program whose result depends only on their
+    arguments.
+
+    A function is pure when it creates no closures and every variable it
+    reads from outside its own frame is bound, exactly once, to a pure
+    function (itself included), so recursion and calls between pure helpers
+    are allowed. The program is assumed to be complete: code resolved later
+    against the same globals could rebind those names.
+    """
+    analysis = _PurityAnalysis()
+    analysis.visit_program(program)
+
+    pure: Dict[int, _FunctionInfo] = {
+        id(info.node): info
+        for info in analysis.functions
+        if not info.has_nested_functions
+    }
+
+    changed = True
+    while changed:
+        changed = False
+
+        for key, info in list(pure.items()):
+            for binding in info.free_bindings:
+                declarations = analysis.declarations.get(binding, [])
+                function = declarations[0] if len(declarations) == 1 else None
+
+                if function is None or id(function) not in pure:
+                    del pure[key]
+                    changed = True
+                    break
+
+    return [info.node for info in pure.values()]
+
+
+def find_function_bindings(
+        program: ast.Program) -> Dict[Binding, ast.Function]:
+    """
+    Bindings of a resolved program that are declared exactly once, by a
+    named function or by `var` with a function literal, so every read of
+    them yields that function (or fails because it is not initialized yet).
+    """
+    analysis = _PurityAnalysis()
+    analysis.visit_program(program)
+
+    bindings: Dict[Binding, ast.Function] = {}
+    for binding, declarations in analysis.declarations.items():
+        if len(declarations) == 1 and declarations[0] is not None:
+            bindings[binding] = declarations[0]
+
+    return bindings
@@ -1,11 +1,20 @@
 import readline
 from os import system, name
-from typing import List
+from typing import (
+    Callable,
+    Dict,
+    List,
+)
 
-from frl.ast import Program
-from frl.evaluator import evaluate
-from frl.lexer import Lexer
-from frl.parser import Parser
+from frl.instrumentation import (
+    profile_nodes,
+    trace_memory,
+)
+from frl.pipeline import DEFAULT_OPTIMIZATION_LEVEL
+from frl.session import (
+    Session,
+    STAGES,
+)
 from frl.token import (
     Token,
     TokenType
@@ -28,27 +37,94 @@ def clear():
         _ = system('clear')
 
 
-def _print_parse_errors(errors: List[str]) -> None:
+def _print_errors(errors: List[str]) -> None:
     for error in errors:
         print(error)
 
 
-def start_repl() -> None:
-    while (source := input(f'{colors.CYAN}>>{colors.RESET} ')) != 'exit()':
+def _run(session: Session, source: str) -> None:
+    evaluated = session.run(source)
 
-        if source == "clear()":
-            clear()
+    if len(session.errors) > 0:
+        _print_errors(session.errors)
+    elif evaluated is not None:
+        print(evaluated.inspect())
 
-        lexer: Lexer = Lexer(source)
-        parser: Parser = Parser(lexer)
 
-        program: Program = parser.parse_program()
+def _time(session: Session, source: str) -> None:
+    _run(session, source)
 
-        if len(parser.errors) > 0:
-            _print_parse_errors(parser.errors)
-            continue
+    for stage in STAGES:
+        if stage in session.timings:
+            print(f'{stage:<9} {session.timings[stage] * 1000:9.3f} ms')
+
+        if stage == 'optimize':
+            for stats in session.passes:
+                print(f'  {stats}')
+
+    print(f'{"total":<9} {sum(session.timings.values()) * 1000:9.3f} ms')
+
+
+def _profile(session: Session, source: str) -> None:
+    with profile_nodes() as profile:
+        _run(session, source)
+
+    for node in profile:
+        print(node)
+
+
+def _mem(session: Session, source: str) -> None:
+    with trace_memory() as trace:
+        _run(session, source)
+
+    print(f'peak {trace.peak / 1024:.1f} KiB, ' +
+          f'retained {trace.retained / 1024:.1f} KiB')
+
+    for class_name, count in trace.objects.most_common():
+        print(f'{class_name}: {count}')
 
-        evaluated = evaluate(program)
+    for line in trace.top:
+        print(line)
+
+
+# Commands that run the rest of the line and report on it.
+_META_COMMANDS: Dict[str, Callable[[Session, str], None]] = {
+    ':time': _time,
+    ':profile': _profile,
+    ':mem': _mem,
+}
+
+
+def evaluate_line(session: Session, source: str) -> None:
+    """
+    Run a line of the REPL and print what it gives. A line can start with
+    a meta-command:
+
+        :time <source>     time of each stage, from lexing to evaluation
+        :profile <source>  evaluation time by node type
+        :mem <source>      runtime objects and memory allocated
+    """
+    if not source.startswith(':'):
+        _run(session, source)
+        return
+
+    command, _, rest = source.partition(' ')
+    meta_command = _META_COMMANDS.get(command)
+
+    if meta_command is None:
+        print(f'Unknown command: {command}, expected one of ' +
+              ', '.join(_META_COMMANDS))
+    else:
+        meta_command(session, rest)
+
+
+def start_repl(optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL) -> None:
+    session = Session(optimization_level)
+
+    while (source := input(f'{colors.CYAN}>>{colors.RESET} ')) != 'exit()':
+
+        if source == "clear()":
+            clear()
+            continue
 
-        if evaluated is not None:
-            print(evaluated.inspect())
+        evaluate_line(session, source)
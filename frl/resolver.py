@@ -0,0 +1,265 @@
+from functools import partial
+from typing import (
+    Callable,
+    cast,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+
+import frl.ast as ast
+from frl.builtins import BUILTINS
+from frl.inline_cache import InlineCache
+from frl.object import (
+    Float,
+    new_integer,
+    String,
+)
+
+
+Scope = Dict[str, int]
+
+
+class Resolver:
+    """
+    Static pass run between the parser and the evaluator. Every identifier
+    is bound to the (depth, slot) of its declaration so the evaluator can
+    read and write variables by list index instead of searching scopes by
+    name, number literals get their runtime object built once and every
+    call site gets an inline cache.
+
+    Only the program and function bodies open scopes; `var` inside an `if`
+    block declares in the enclosing function. The global scope is kept
+    between calls to `resolve`, so one resolver can serve several programs
+    that share the same global environment.
+    """
+
+    def __init__(self) -> None:
+        self._errors: List[str] = []
+        self._scopes: List[Scope] = [{}]
+        # Slots used by each scope. Usually the number of names, but a
+        # repeated parameter takes a slot of its own.
+        self._sizes: List[int] = [0]
+        self._functions: List[ast.Function] = []
+
+    @property
+    def errors(self) -> List[str]:
+        return self._errors
+
+    def resolve(self, program: ast.Program) -> None:
+        self._hoist(program.statements)
+        self._resolve(program.statements)
+
+        program.frame_size = self._sizes[0]
+
+    def _declare(self,
+                 identifier: ast.Identifier,
+                 parameter: bool = False) -> None:
+        # Parameters always get a new slot so that arguments can be stored
+        # by position; with repeated names the last parameter wins.
+        scope = self._scopes[-1]
+        if parameter or identifier.value not in scope:
+            scope[identifier.value] = self._sizes[-1]
+            self._sizes[-1] += 1
+
+        identifier.depth = 0
+        identifier.slot = scope[identifier.value]
+
+    def _hoist(self, statements: List[ast.Statement]) -> None:
+        # Named functions are declared before the body is resolved so that
+        # they can call each other regardless of the order of definition.
+        for statement in statements:
+            if type(statement) == ast.ExpressionStatement:
+                expression = cast(ast.ExpressionStatement,
+                                  statement).expression
+                if type(expression) == ast.Function:
+                    function = cast(ast.Function, expression)
+                    if function.ident is not None:
+                        self._declare(function.ident)
+
+    def _is_builtin(self, expression: ast.Expression) -> bool:
+        # Built-in functions act as a scope around the globals: any
+        # declaration of the same name hides them.
+        if type(expression) != ast.Identifier:
+            return False
+
+        name = cast(ast.Identifier, expression).value
+
+        return name in BUILTINS and \
+            all(name not in scope for scope in self._scopes)
+
+    def _mark_tail_position(self,
+                            expression: Optional[ast.Expression]) -> None:
+        if type(expression) == ast.Call:
+            cast(ast.Call, expression).tail = True
+        elif type(expression) == ast.If:
+            if_expression = cast(ast.If, expression)
+
+            self._mark_tail_block(if_expression.consequence)
+            self._mark_tail_block(if_expression.alternative)
+
+    def _mark_tail_block(self, block: Optional[ast.Block]) -> None:
+        # The value of a block is the value of its last statement.
+        if block is None or len(block.statements) == 0:
+            return
+
+        last = block.statements[-1]
+        if type(last) == ast.ExpressionStatement:
+            self._mark_tail_position(
+                cast(ast.ExpressionStatement, last).expression)
+
+    def _resolve(self, statements: List[ast.Statement]) -> None:
+        # Nodes still to resolve, and the steps that close a function once
+        # its body is resolved, on a list instead of the Python stack, so
+        # that deeply nested programs reach the stack machine.
+        pending: List[Union[ast.ASTNode, Callable[[], None], None]] = \
+            list(reversed(statements))
+
+        while pending:
+            current = pending.pop()
+
+            if current is None:
+                continue
+            elif not isinstance(current, ast.ASTNode):
+                current()
+                continue
+
+            self._resolve_node(current, pending)
+
+    def _resolve_node(self,
+                      node: ast.ASTNode,
+                      pending: List[Union[ast.ASTNode,
+                                          Callable[[], None],
+                                          None]]) -> None:
+        # Resolves what does not depend on the children and pushes these in
+        # reverse, so that they are resolved in source order.
+        node_type = type(node)
+
+        if node_type == ast.ExpressionStatement:
+            node = cast(ast.ExpressionStatement, node)
+
+            pending.append(node.expression)
+        elif node_type == ast.LetStatement:
+            node = cast(ast.LetStatement, node)
+
+            # The name is visible inside its own value so that
+            # `var f = fun(n) { f(n - 1) }` can recurse.
+            assert node.name is not None
+            self._declare(node.name)
+            pending.append(node.value)
+        elif node_type == ast.ReturnStatement:
+            node = cast(ast.ReturnStatement, node)
+
+            # A return leaves its function wherever it is, even in an `if`
+            # whose value is bound or used as an operand: the evaluators
+            # pass its TailCall up through the enclosing expressions to the
+            # call, which runs it.
+            if len(self._functions) > 0:
+                self._mark_tail_position(node.return_value)
+
+            pending.append(node.return_value)
+        elif node_type == ast.Block:
+            node = cast(ast.Block, node)
+
+            pending.extend(reversed(node.statements))
+        elif node_type == ast.Identifier:
+            node = cast(ast.Identifier, node)
+
+            self._resolve_identifier(node)
+        elif node_type == ast.Integer:
+            node = cast(ast.Integer, node)
+
+            assert node.value is not None
+            node.constant = new_integer(node.value)
+        elif node_type == ast.Float:
+            node = cast(ast.Float, node)
+
+            assert node.value is not None
+            node.constant = Float(node.value)
+        elif node_type == ast.String:
+            node = cast(ast.String, node)
+
+            assert node.value is not None
+            node.constant = String(node.value)
+        elif node_type == ast.Prefix:
+            node = cast(ast.Prefix, node)
+
+            pending.append(node.right)
+        elif node_type == ast.Infix:
+            node = cast(ast.Infix, node)
+
+            pending.append(node.right)
+            pending.append(node.left)
+        elif node_type == ast.If:
+            node = cast(ast.If, node)
+
+            pending.append(node.alternative)
+            pending.append(node.consequence)
+            pending.append(node.condition)
+        elif node_type == ast.Function:
+            node = cast(ast.Function, node)
+
+            self._open_function(node)
+
+            assert node.body is not None
+            pending.append(partial(self._close_function, node))
+            pending.extend(reversed(node.body.statements))
+        elif node_type == ast.Call:
+            node = cast(ast.Call, node)
+
+            node.cache = InlineCache()
+
+            assert node.arguments is not None
+            pending.extend(reversed(node.arguments))
+
+            if self._is_builtin(node.function):
+                node.builtin = BUILTINS[cast(ast.Identifier,
+                                             node.function).value]
+            else:
+                pending.append(node.function)
+        elif node_type == ast.Vector:
+            node = cast(ast.Vector, node)
+
+            assert node.elements is not None
+            pending.extend(reversed(node.elements))
+        elif node_type == ast.Index:
+            node = cast(ast.Index, node)
+
+            pending.append(node.index)
+            pending.append(node.left)
+
+    def _open_function(self, function: ast.Function) -> None:
+        if function.ident is not None:
+            self._declare(function.ident)
+
+        if len(self._functions) > 0:
+            self._functions[-1].has_closures = True
+
+        function.has_closures = False
+        self._functions.append(function)
+        self._scopes.append({})
+        self._sizes.append(0)
+
+        for parameter in function.parameters:
+            self._declare(parameter, parameter=True)
+
+        assert function.body is not None
+        self._hoist(function.body.statements)
+
+    def _close_function(self, function: ast.Function) -> None:
+        self._mark_tail_block(function.body)
+
+        self._scopes.pop()
+        function.frame_size = self._sizes.pop()
+        self._functions.pop()
+
+    def _resolve_identifier(self, identifier: ast.Identifier) -> None:
+        for depth, scope in enumerate(reversed(self._scopes)):
+            if identifier.value in scope:
+                identifier.depth = depth
+                identifier.slot = scope[identifier.value]
+
+                return
+
+        self._errors.append(f'Identifier not found: {identifier.value}')
@@ -0,0 +1,329 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import json
+from os import cpu_count
+from re import match
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+)
+
+from frl.batch import run_program
+from frl.pipeline import DEFAULT_OPTIMIZATION_LEVEL
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7878
+# Requests evaluated or waiting for a worker at once. Past it the server
+# stops reading from its clients until some finish.
+DEFAULT_MAX_PENDING = 1024
+# Latencies kept for the percentiles.
+LATENCY_HISTORY = 10000
+# Longest line read by the server and the client, in bytes. Longer
+# requests and answers are skipped and answered with an error.
+DEFAULT_LINE_LIMIT = 1 << 24
+
+_PERCENTILES = (50, 90, 99)
+
+# The id at the start of a line. Requests and answers put it first, so a
+# line too long to read can still be matched.
+_LINE_ID = r'\s*\{\s*"id"\s*:\s*(-?\d+|"[^"\\]*"|null)'
+
+# Sends an answer to the client of a connection.
+Respond = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values, 0.0 without values."""
+    if len(values) == 0:
+        return 0.0
+
+    rank = max(int(len(values) * percent / 100 + 0.5), 1)
+
+    return values[min(rank, len(values)) - 1]
+
+
+class LineTooLong(Exception):
+    """
+    A line longer than the limit of its reader, skipped by read_line.
+    """
+
+    def __init__(self, line_id: Any) -> None:
+        super().__init__('Line too long')
+        # The id the line started with, or None.
+        self.id = line_id
+
+
+async def read_line(reader: asyncio.StreamReader) -> bytes:
+    """
+    The next line of a stream, empty at the end of it. A line longer than
+    the limit of the reader is read and dropped a chunk at a time, so the
+    next line can still be read, and raises LineTooLong.
+    """
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as error:
+        # The last line, without a newline.
+        return error.partial
+    except asyncio.LimitOverrunError:
+        pass
+
+    start = b''
+    while True:
+        try:
+            await reader.readuntil(b'\n')
+            break
+        except asyncio.IncompleteReadError:
+            break
+        except asyncio.LimitOverrunError as error:
+            chunk = await reader.readexactly(error.consumed)
+            start = start or chunk
+
+    found = match(_LINE_ID, start.decode(errors='replace'))
+
+    raise LineTooLong(json.loads(found.group(1)) if found else None)
+
+
+class EvaluationServer:
+    """
+    Long-running server that evaluates programs on a pool of worker
+    processes, started and warmed up once, so that clients pay neither
+    for starting Python nor for importing frl.
+
+    The protocol is one JSON object per line in each direction:
+
+        {"id": 1, "source": "1 + 1"}
+        {"id": 1, "type": "INTEGERS", "value": "2", "errors": [], ...}
+
+        {"id": 2, "command": "stats"}
+        {"id": 2, "stats": {"pending": 0, "latency_ms": {"p50": ...}, ...}}
+
+    Clients can pipeline: send many requests without waiting for the
+    answers, which come as soon as each program finishes, not in order,
+    with the id of their request. Every worker keeps a cache of the
+    programs it has parsed, see frl.batch.
+
+    A request longer than line_limit, or one whose worker died, gets an
+    error answer; a new pool replaces the one of a dead worker.
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 line_limit: int = DEFAULT_LINE_LIMIT) -> None:
+        self.workers = workers if workers is not None else cpu_count() or 1
+        self.optimization_level = optimization_level
+        self.line_limit = line_limit
+        # Requests evaluated or waiting for a worker.
+        self.pending: int = 0
+        self.completed: int = 0
+        self._executor = ProcessPoolExecutor(self.workers)
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_HISTORY)
+        self._max_pending = max_pending
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._connections: Set['asyncio.Task[Any]'] = set()
+
+    @property
+    def address(self) -> Any:
+        """The socket path, or the host and port, listened on."""
+        assert self._server is not None
+
+        return self._server.sockets[0].getsockname()
+
+    async def start(self,
+                    path: Optional[str] = None,
+                    host: str = DEFAULT_HOST,
+                    port: int = DEFAULT_PORT) -> None:
+        """
+        Start every worker, then listen on a Unix socket when there is a
+        path, or on TCP. Port 0 picks a free port, see address.
+        """
+        self._slots = asyncio.Semaphore(self._max_pending)
+
+        # Submitted together, each task needs a process of its own.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor,
+                                 run_program,
+                                 '0',
+                                 self.optimization_level)
+            for _ in range(self.workers)))
+
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._serve, path, limit=self.line_limit)
+        else:
+            self._server = await asyncio.start_server(
+                self._serve, host, port, limit=self.line_limit)
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None
+
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening, drop the clients still connected and the pool."""
+        if self._server is not None:
+            self._server.close()
+
+            connections = list(self._connections)
+            for connection in connections:
+                connection.cancel()
+            await asyncio.gather(*connections, return_exceptions=True)
+
+            await self._server.wait_closed()
+            self._server = None
+
+        self._executor.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        return {
+            'workers': self.workers,
+            'pending': self.pending,
+            'completed': self.completed,
+            'latency_ms': {
+                f'p{percent}': percentile(latencies, percent) * 1000
+                for percent in _PERCENTILES
+            },
+        }
+
+    async def _serve(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        connection = asyncio.current_task()
+        assert connection is not None
+        self._connections.add(connection)
+
+        # Several answers can be sent at once, but only one can wait for
+        # the socket.
+        drain = asyncio.Lock()
+        tasks: Set['asyncio.Future[None]'] = set()
+
+        async def respond(response: Dict[str, Any]) -> None:
+            writer.write(json.dumps(response).encode() + b'\n')
+            async with drain:
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await read_line(reader)
+                except LineTooLong as error:
+                    await respond({'id': error.id,
+                                   'error': 'Request too long'})
+                    continue
+
+                if not line:
+                    break
+
+                task = await self._request(line, respond)
+                if task is not None:
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+            # An answer fails when its client is gone: nothing to do.
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            # The server is closing.
+            for task in tasks:
+                task.cancel()
+        except ConnectionError:
+            # The client left without reading its answers.
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+    async def _request(self,
+                       line: bytes,
+                       respond: Respond) -> Optional['asyncio.Future[None]']:
+        # Answers a request at once, or starts its evaluation.
+        assert self._slots is not None
+        received = perf_counter()
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            await respond({'id': None, 'error': 'Invalid JSON'})
+            return None
+
+        if not isinstance(request, dict):
+            await respond({'id': None, 'error': 'Expected an object'})
+        elif request.get('command') == 'stats':
+            await respond({'id': request.get('id'), 'stats': self.stats()})
+        elif isinstance(request.get('source'), str):
+            await self._slots.acquire()
+
+            return asyncio.ensure_future(
+                self._evaluate(request, received, respond))
+        else:
+            await respond({'id': request.get('id'),
+                           'error': 'Expected a source or a command'})
+
+        return None
+
+    async def _evaluate(self,
+                        request: Dict[str, Any],
+                        received: float,
+                        respond: Respond) -> None:
+        assert self._slots is not None
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        self.pending += 1
+
+        try:
+            result = await loop.run_in_executor(executor,
+                                                run_program,
+                                                request['source'],
+                                                self.optimization_level)
+        except BrokenProcessPool:
+            # A worker died, for instance killed for its memory, and took
+            # the pool down with every request it was running.
+            if self._executor is executor:
+                self._executor = ProcessPoolExecutor(self.workers)
+
+            await respond({'id': request.get('id'),
+                           'error': 'Worker stopped'})
+            return
+        finally:
+            self.pending -= 1
+            self._slots.release()
+
+        self.completed += 1
+        self._latencies.append(perf_counter() - received)
+
+        await respond({
+            'id': request.get('id'),
+            'type': result.type_name,
+            'value': result.value,
+            'errors': list(result.errors),
+            'time': result.time,
+        })
+
+
+async def serve(path: Optional[str] = None,
+                host: str = DEFAULT_HOST,
+                port: int = DEFAULT_PORT,
+                workers: Optional[int] = None,
+                optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL) -> None:
+    """Run a server until cancelled."""
+    server = EvaluationServer(workers, optimization_level)
+
+    try:
+        await server.start(path, host, port)
+        await server.serve_forever()
+    finally:
+        await server.close()
@@ -0,0 +1,145 @@
+from time import perf_counter
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Error,
+    Object,
+)
+from frl.parser import Parser
+from frl.pipeline import (
+    DEFAULT_OPTIMIZATION_LEVEL,
+    optimization_pipeline,
+    PassStats,
+)
+from frl.resolver import Resolver
+from frl.token import (
+    Token,
+    TokenType,
+)
+
+
+# Stages of running an input, in order.
+STAGES = ('lex', 'parse', 'resolve', 'optimize', 'evaluate')
+
+
+class _Tokens(Lexer):
+    # Replays the tokens of a source lexed beforehand, so that lexing and
+    # parsing are timed apart.
+
+    def __init__(self, tokens: List[Token]) -> None:
+        self._tokens: Iterator[Token] = iter(tokens)
+        self._eof = tokens[-1]
+
+    def next_token(self) -> Token:
+        return next(self._tokens, self._eof)
+
+
+def _tokenize(source: str) -> List[Token]:
+    lexer = Lexer(source)
+    tokens = [lexer.next_token()]
+
+    while tokens[-1].token_type != TokenType.EOF:
+        tokens.append(lexer.next_token())
+
+    return tokens
+
+
+class Session:
+    """
+    Programs run one after another against the same globals, as the lines
+    of a REPL. The resolver keeps the global names and the environment
+    their values, so a `var` or `fun` of one input is visible to the next
+    ones and a library defined once is never parsed or evaluated again.
+
+    Function values keep their nodes, and with them their inline caches,
+    result caches and compiled tiers, across inputs.
+
+    Later inputs can declare the same names again, so the optimization
+    passes never trust globals, as without closed_world.
+    """
+
+    def __init__(self,
+                 optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL) -> None:
+        self._pipeline = optimization_pipeline(optimization_level)
+        self._resolver = Resolver()
+        self._errors: List[str] = []
+        self.env = Environment()
+        # Seconds spent in each of the STAGES reached by the last input,
+        # and the statistics of its optimization passes.
+        self.timings: Dict[str, float] = {}
+        self.passes: List[PassStats] = []
+
+    @property
+    def errors(self) -> List[str]:
+        """Parser or resolver errors of the last input."""
+        return self._errors
+
+    def parse(self, source: str) -> Optional[Program]:
+        """
+        Parse, resolve and optimize an input against the globals of the
+        session. None when it has errors.
+        """
+        self.timings = {}
+        self.passes = []
+
+        start = perf_counter()
+        tokens = _tokenize(source)
+        start = self._time('lex', start)
+
+        parser: Parser = Parser(_Tokens(tokens))
+        program: Program = parser.parse_program()
+        start = self._time('parse', start)
+
+        if len(parser.errors) > 0:
+            self._errors = parser.errors
+            return None
+
+        # The resolver collects the errors of every input.
+        known = len(self._resolver.errors)
+        self._resolver.resolve(program)
+        start = self._time('resolve', start)
+
+        if len(self._resolver.errors) > known:
+            self._errors = self._resolver.errors[known:]
+            return None
+
+        self._errors = []
+        self.passes = self._pipeline.run(program)
+        self._time('optimize', start)
+
+        return program
+
+    def run(self, source: str) -> Optional[Object]:
+        """
+        Evaluate an input in the session. None when it has errors or no
+        value, such as a `var` statement.
+        """
+        program = self.parse(source)
+        if program is None:
+            return None
+
+        start = perf_counter()
+        try:
+            result = evaluate(program, self.env)
+        except RecursionError as exception:
+            # Deep non-tail recursion only fails this input, the session
+            # goes on with the globals stored so far.
+            result = Error(f'{type(exception).__name__}: {exception}')
+        self._time('evaluate', start)
+
+        return result
+
+    def _time(self, stage: str, start: float) -> float:
+        now = perf_counter()
+        self.timings[stage] = now - start
+
+        return now
@@ -0,0 +1,85 @@
+from time import perf_counter
+from typing import (
+    List,
+    NamedTuple,
+    Optional,
+)
+
+import frl.ast as ast
+from frl.closures import (
+    Code,
+    compile_function,
+)
+
+
+DEFAULT_COMPILE_THRESHOLD = 100
+
+
+class Tier:
+    """
+    Tiering state of a function. Calls start in the tree-walking
+    evaluator; once a function value has been called `threshold` times,
+    counting the iterations of tail recursion, the body is compiled and
+    every later call of any value of the function runs the compiled code.
+    """
+
+    def __init__(self,
+                 threshold: int = DEFAULT_COMPILE_THRESHOLD,
+                 unboxed: bool = False) -> None:
+        self.threshold = threshold
+        self.unboxed = unboxed
+        self.compiled: Optional[Code] = None
+        self.compile_time: float = 0.0
+
+    def compile(self, function: ast.Function) -> Code:
+        start = perf_counter()
+        self.compiled = compile_function(function, self.unboxed)
+        self.compile_time = perf_counter() - start
+
+        return self.compiled
+
+
+class TierStats(NamedTuple):
+    name: str
+    compiled: bool
+    compile_time: float
+
+    def __str__(self) -> str:
+        if not self.compiled:
+            return f'{self.name}: interpreted'
+
+        return f'{self.name}: compiled in {self.compile_time * 1000:.2f} ms'
+
+
+def enable_tiering(program: ast.Program,
+                   threshold: int = DEFAULT_COMPILE_THRESHOLD,
+                   unboxed: bool = False) -> int:
+    """
+    Let the evaluator compile the functions of a resolved program when they
+    get hot. Short programs never pay for compilation, long-running ones
+    move to the compiled code on their own. With unboxed, the compiled
+    code keeps the intermediate values of arithmetic as raw numbers.
+
+    :rtype int: The number of functions that can be compiled.
+    """
+    functions = 0
+
+    for node in ast.walk(program):
+        if isinstance(node, ast.Function):
+            node.tier = Tier(threshold, unboxed)
+            functions += 1
+
+    return functions
+
+
+def tier_stats(program: ast.Program) -> List[TierStats]:
+    names = ast.function_names(program)
+    stats: List[TierStats] = []
+
+    for node in ast.walk(program):
+        if isinstance(node, ast.Function) and node.tier is not None:
+            stats.append(TierStats(names.get(id(node), 'fun'),
+                                   node.tier.compiled is not None,
+                                   node.tier.compile_time))
+
+    return stats
@@ -30,6 +30,7 @@ class TokenType(Enum):
     ILLEGAL = auto()  # Cualquier caracter que no hayamos definido
     INT = auto()  # {numero}
     LBRACE = auto()  # {
+    LBRACKET = auto()  # [
     LET = auto()  # var
     LPAREN = auto()  # (
     LE = auto()  # <=
@@ -40,10 +41,12 @@ class TokenType(Enum):
     NOT_EQ = auto()  # !=
     PLUS = auto()  # +
     RBRACE = auto()  # }
+    RBRACKET = auto()  # ]
     RETURN = auto()  # return
     RPAREN = auto()  # )
     SEMICOLON = auto()  # ;
     SIMILAR = auto()  # ===
+    STRING = auto()  # "texto"
     TRUE = auto()  # true
 
 
@@ -0,0 +1,960 @@
+from functools import partial
+from re import search
+from types import CodeType
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import frl.ast as ast
+from frl.builtins import (
+    Apply,
+    BUILTINS,
+)
+from frl.evaluator import (
+    DIVISION_BY_ZERO,
+    evaluate_vector_infix_expression,
+    FALSE,
+    INDEX_OUT_OF_RANGE,
+    NOT_A_FUNCTION,
+    NOT_A_NUMBER,
+    NOT_INDEXABLE,
+    NOT_INITIALIZED,
+    NULL,
+    TRUE,
+    TYPE_MISMATCH,
+    UNKNOWN_INFIX_OPERATOR,
+    WRONG_NUMBER_OF_ARGUMENTS,
+)
+from frl.object import (
+    Boolean,
+    CompiledFunction,
+    Error,
+    Float,
+    Integer,
+    new_integer,
+    Null,
+    Object,
+    ObjectType,
+    PersistentList,
+    PersistentMap,
+    Stream,
+    String,
+    Vector,
+)
+from frl.purity import (
+    Binding,
+    find_function_bindings,
+)
+from frl.vector import (
+    new_vector,
+    vector_negate,
+)
+
+
+# What to do with the value of the last statement of a block.
+_DISCARD = 0
+_ASSIGN = 1
+_RETURN = 2
+_PROGRAM = 3
+
+_MAIN = '_main'
+
+_OPERATORS: Dict[str, str] = {
+    '+': '_add',
+    '-': '_sub',
+    '*': '_mul',
+    '/': '_div',
+    '<': '_lt',
+    '<=': '_le',
+    '>': '_gt',
+    '>=': '_ge',
+    '==': '_eq',
+    '!=': '_ne',
+    '===': '_same',
+    '!==': '_not_same',
+}
+
+_COMPARISONS = ('<', '<=', '>', '>=', '==', '!=', '===', '!==')
+
+# Python operators for operands proven to be numbers of the same type.
+# Division keeps its helper for the zero check and integer division.
+_PYTHON_OPERATORS: Dict[str, str] = {
+    '+': '+',
+    '-': '-',
+    '*': '*',
+    '<': '<',
+    '<=': '<=',
+    '>': '>',
+    '>=': '>=',
+    '==': '==',
+    '!=': '!=',
+    '===': '==',
+    '!==': '!=',
+}
+
+
+class FRostriError(Exception):
+    """
+    Run-time error raised by generated code. It aborts the whole program,
+    as an Error object does in the evaluator.
+    """
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+class _NoValue:
+    # Result of a program whose last statement is a `var`.
+    pass
+
+
+_NO_VALUE = _NoValue()
+_NUMBERS = (int, float)
+
+
+class _TailCall:
+    # Call in tail position that is not a loop. It is returned to the
+    # nearest call not in tail position, which makes it, and the tail
+    # calls it returns in turn, in a loop instead of nesting Python frames.
+
+    def __init__(self, function: Callable[..., Any], *args: Any) -> None:
+        self.function = function
+        self.args = args
+
+
+def _type_name(value: Any) -> str:
+    value_type = type(value)
+
+    if value_type is bool:
+        return 'BOOLEAN'
+    elif value_type is int:
+        return 'INTEGERS'
+    elif value_type is float:
+        return 'FLOAT'
+    elif value is None:
+        return 'NULL'
+    elif value_type is Vector:
+        return 'VECTOR'
+    elif value_type is PersistentList:
+        return 'LIST'
+    elif value_type is PersistentMap:
+        return 'MAP'
+    elif value_type is String:
+        return 'STRING'
+    elif value_type is Stream:
+        return 'STREAM'
+
+    return 'FUNCTION'
+
+
+def _operator_error(operator: str, left: Any, right: Any) -> FRostriError:
+    left_type = _type_name(left)
+    right_type = _type_name(right)
+    message = TYPE_MISMATCH if left_type != right_type \
+        else UNKNOWN_INFIX_OPERATOR
+
+    return FRostriError(message.format(left_type, operator, right_type))
+
+
+def _is_vector_operation(left: Any, right: Any) -> bool:
+    return (type(left) is Vector or type(left) in _NUMBERS) and \
+        (type(right) is Vector or type(right) in _NUMBERS)
+
+
+def _vector_operation(operator: str, left: Any, right: Any) -> Vector:
+    result = evaluate_vector_infix_expression(operator,
+                                              _box_number(left),
+                                              _box_number(right))
+
+    if type(result) is Error:
+        raise FRostriError(cast(Error, result).message)
+
+    return cast(Vector, result)
+
+
+def _box_number(value: Any) -> Object:
+    if type(value) is int:
+        return new_integer(value)
+    elif type(value) is float:
+        return Float(value)
+
+    return value
+
+
+def _add(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left + right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('+', left, right)
+    elif type(left) is String and type(right) is String:
+        return left.concat(right)
+
+    raise _operator_error('+', left, right)
+
+
+def _sub(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left - right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('-', left, right)
+
+    raise _operator_error('-', left, right)
+
+
+def _mul(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left * right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('*', left, right)
+
+    raise _operator_error('*', left, right)
+
+
+def _div(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        if right == 0:
+            raise FRostriError(DIVISION_BY_ZERO)
+        elif type(left) is int and type(right) is int:
+            return left // right
+
+        return left / right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('/', left, right)
+
+    raise _operator_error('/', left, right)
+
+
+def _lt(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left < right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('<', left, right)
+
+    raise _operator_error('<', left, right)
+
+
+def _le(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left <= right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('<=', left, right)
+
+    raise _operator_error('<=', left, right)
+
+
+def _gt(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left > right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('>', left, right)
+
+    raise _operator_error('>', left, right)
+
+
+def _ge(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left >= right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('>=', left, right)
+
+    raise _operator_error('>=', left, right)
+
+
+def _eq(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left == right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('==', left, right)
+
+    return _same(left, right)
+
+
+def _ne(left: Any, right: Any) -> Any:
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return left != right
+    elif _is_vector_operation(left, right):
+        return _vector_operation('!=', left, right)
+
+    return not _same(left, right)
+
+
+def _same(left: Any, right: Any) -> bool:
+    if type(left) is not type(right):
+        return False
+    elif type(left) in _NUMBERS:
+        return left == right
+    elif type(left) is String:
+        return left.value == right.value
+
+    return left is right
+
+
+def _not_same(left: Any, right: Any) -> bool:
+    return not _same(left, right)
+
+
+def _neg(right: Any) -> Any:
+    if type(right) in _NUMBERS:
+        return -right
+    elif type(right) is Vector:
+        return vector_negate(right.values)
+
+    return None
+
+
+def _not(right: Any) -> bool:
+    return right is False or right is None
+
+
+def _vector(*elements: Any) -> Vector:
+    for element in elements:
+        if type(element) not in _NUMBERS:
+            raise FRostriError(NOT_A_NUMBER.format(_type_name(element)))
+
+    return new_vector(elements)
+
+
+def _index(left: Any, index: Any) -> Any:
+    if (type(left) is not Vector and type(left) is not String) or \
+            type(index) is not int:
+        raise FRostriError(NOT_INDEXABLE.format(_type_name(left),
+                                                _type_name(index)))
+
+    if type(left) is String:
+        string = cast(String, left)
+        if index < 0 or index >= string.length:
+            raise FRostriError(INDEX_OUT_OF_RANGE.format(index))
+
+        return String(string.char_at(index))
+
+    values = cast(Vector, left).values
+    if index < 0 or index >= len(values):
+        raise FRostriError(INDEX_OUT_OF_RANGE.format(index))
+
+    return float(values[index])
+
+
+def _call(function: Any, *args: Any) -> Any:
+    return _resume(_tail_call(function, *args))
+
+
+def _tail_call(function: Any, *args: Any) -> _TailCall:
+    if not callable(function):
+        raise FRostriError(NOT_A_FUNCTION.format(_type_name(function)))
+
+    expected = function.__code__.co_argcount
+    if len(args) != expected:
+        raise FRostriError(
+            WRONG_NUMBER_OF_ARGUMENTS.format(expected, len(args)))
+
+    return _TailCall(function, *args)
+
+
+def _resume(value: Any) -> Any:
+    while type(value) is _TailCall:
+        value = value.function(*value.args)
+
+    return value
+
+
+def _unbox(value: Object) -> Any:
+    value_type = type(value)
+
+    if value_type is Integer or value_type is Float or \
+            value_type is Boolean:
+        return value.value  # type: ignore
+    elif value_type is Null:
+        return None
+    elif value_type is CompiledFunction:
+        return cast(CompiledFunction, value).function
+
+    return value
+
+
+def _apply(box: Callable[[Any], Object],
+           function: Object,
+           args: List[Object]) -> Object:
+    # How built-in functions call compiled functions, from objects to
+    # objects.
+    try:
+        return box(_call(_unbox(function), *(_unbox(arg) for arg in args)))
+    except FRostriError as error:
+        return Error(error.message)
+
+
+def _builtin(box: Callable[[Any], Object],
+             apply: Apply,
+             name: str,
+             *args: Any) -> Any:
+    # Built-in functions work on objects: lists and maps keep the objects
+    # they are given.
+    result = BUILTINS[name].call([box(arg) for arg in args], apply)
+
+    if type(result) is Error:
+        raise FRostriError(cast(Error, result).message)
+
+    return _unbox(result)
+
+
+_RUNTIME: Dict[str, Any] = {
+    '_add': _add,
+    '_sub': _sub,
+    '_mul': _mul,
+    '_div': _div,
+    '_lt': _lt,
+    '_le': _le,
+    '_gt': _gt,
+    '_ge': _ge,
+    '_eq': _eq,
+    '_ne': _ne,
+    '_same': _same,
+    '_not_same': _not_same,
+    '_neg': _neg,
+    '_not': _not,
+    '_vector': _vector,
+    '_index': _index,
+    '_call': _call,
+    '_tail_call': _tail_call,
+    '_resume': _resume,
+    '_TailCall': _TailCall,
+    '_NO_VALUE': _NO_VALUE,
+}
+
+
+class Transpiler:
+    """
+    Translates a resolved program into the source of a Python function,
+    `_main`, that computes the same result with Python values: int, float,
+    bool, None for null and plain Python functions for FRostri functions.
+
+    Variables become Python locals named after the identifier and the
+    depth of the function that declares them, so FRostri closures map to
+    Python closures. Operators go through small helpers that reproduce the
+    FRostri type rules, and errors are raised as FRostriError. A function
+    that calls itself in tail position is compiled to a loop; other tail
+    calls are returned as pending calls that the nearest call not in tail
+    position makes in a loop, as in the evaluator.
+    """
+
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+        self._indent: int = 0
+        self._temps: int = 0
+        self._scopes: List[ast.ASTNode] = []
+        self._bindings: Dict[Binding, ast.Function] = {}
+        # Functions that may return a pending tail call.
+        self._trampolined: Set[int] = set()
+        # Every generated def by name, to map Python functions back to the
+        # FRostri function they come from.
+        self._functions: Dict[str, ast.Function] = {}
+        # String literals by generated name, so that each literal is always
+        # the same object, as in the evaluator.
+        self._constants: Dict[str, Object] = {}
+
+    @property
+    def constants(self) -> Dict[str, Object]:
+        return self._constants
+
+    @property
+    def functions(self) -> Dict[str, ast.Function]:
+        return self._functions
+
+    def transpile(self, program: ast.Program) -> str:
+        self._bindings = find_function_bindings(program)
+        self._find_tail_calls(program)
+        self._scopes.append(program)
+
+        self._emit(f'def {_MAIN}():')
+        self._indent += 1
+        self._statements(program.statements, _PROGRAM)
+        self._indent -= 1
+
+        self._scopes.pop()
+
+        return '\n'.join(self._lines) + '\n'
+
+    def _binding(self, identifier: ast.Identifier) -> Binding:
+        return (id(self._scopes[-1 - identifier.depth]), identifier.slot)
+
+    def _block(self,
+               block: Optional[ast.Block],
+               mode: int,
+               target: str) -> None:
+        mark = len(self._lines)
+
+        if block is None or len(block.statements) == 0:
+            self._finish('None', mode, target)
+        else:
+            self._statements(block.statements, mode, target)
+
+        if len(self._lines) == mark:
+            self._emit('pass')
+
+    def _call(self, call: ast.Call) -> str:
+        assert call.arguments is not None
+        if call.builtin is not None:
+            values = self._operands(list(call.arguments))
+
+            return f'_builtin({", ".join([repr(call.builtin.name), *values])})'
+
+        values = self._operands([call.function, *call.arguments])
+        function, args = values[0], ', '.join(values[1:])
+
+        callee = self._known_function(call.function)
+        if callee is not None and \
+                len(callee.parameters) == len(call.arguments):
+            if id(callee) in self._trampolined:
+                return f'_resume({function}({args}))'
+
+            return f'{function}({args})'
+
+        return f'_call({function}, {args})' if args else f'_call({function})'
+
+    def _condition(self, expression: ast.Expression) -> str:
+        value = self._expression(expression)
+
+        if type(expression) == ast.Boolean or \
+                (type(expression) == ast.Infix and
+                 cast(ast.Infix, expression).operator in _COMPARISONS) or \
+                (type(expression) == ast.Prefix and
+                 cast(ast.Prefix, expression).operator == '!'):
+            # Always a Python bool.
+            return value
+
+        if not value.isidentifier():
+            temp = self._new_temp()
+            self._emit(f'{temp} = {value}')
+            value = temp
+
+        return f'{value} is not False and {value} is not None'
+
+    def _emit(self, line: str) -> None:
+        self._lines.append('    ' * self._indent + line)
+
+    def _expression(self, expression: Optional[ast.Expression]) -> str:
+        node_type = type(expression)
+
+        if node_type == ast.Integer or node_type == ast.Float:
+            return repr(cast(ast.Integer, expression).value)
+        elif node_type == ast.Boolean:
+            return 'True' if cast(ast.Boolean, expression).value else 'False'
+        elif node_type == ast.String:
+            constant = cast(ast.String, expression).constant
+
+            assert constant is not None
+            name = f'_string{len(self._constants)}'
+            self._constants[name] = constant
+
+            return name
+        elif node_type == ast.Identifier:
+            return self._name(cast(ast.Identifier, expression))
+        elif node_type == ast.Prefix:
+            prefix = cast(ast.Prefix, expression)
+            right = self._expression(prefix.right)
+
+            if prefix.operator == '!':
+                return f'_not({right})'
+            elif prefix.operator == '-' and _is_number(prefix.right):
+                return f'(-{right})'
+            elif prefix.operator == '-':
+                return f'_neg({right})'
+
+            return 'None'
+        elif node_type == ast.Infix:
+            infix = cast(ast.Infix, expression)
+            assert infix.right is not None
+            left, right = self._operands([infix.left, infix.right])
+
+            if _is_unchecked(infix):
+                return f'({left} {_PYTHON_OPERATORS[infix.operator]} {right})'
+
+            return f'{_OPERATORS[infix.operator]}({left}, {right})'
+        elif node_type == ast.If:
+            temp = self._new_temp()
+            self._if(cast(ast.If, expression), _ASSIGN, temp)
+
+            return temp
+        elif node_type == ast.Function:
+            return self._function(cast(ast.Function, expression))
+        elif node_type == ast.Call:
+            return self._call(cast(ast.Call, expression))
+        elif node_type == ast.Vector:
+            vector = cast(ast.Vector, expression)
+
+            assert vector.elements is not None
+            elements = self._operands(list(vector.elements))
+
+            return f'_vector({", ".join(elements)})'
+        elif node_type == ast.Index:
+            index = cast(ast.Index, expression)
+            left, position = self._operands([index.left, index.index])
+
+            return f'_index({left}, {position})'
+
+        return 'None'
+
+    def _finish(self, value: str, mode: int, target: str) -> None:
+        if mode == _ASSIGN:
+            self._emit(f'{target} = {value}')
+        elif mode == _RETURN or mode == _PROGRAM:
+            self._emit(f'return {value}')
+        elif not _is_literal(value):
+            # Still evaluated: it may fail.
+            self._emit(value)
+
+    def _function(self, function: ast.Function) -> str:
+        name = self._new_temp('_f')
+        binding: Optional[str] = None
+        if function.ident is not None:
+            binding = self._python_name(function.ident.value,
+                                        len(self._scopes) - 1)
+
+        self._scopes.append(function)
+
+        level = len(self._scopes) - 1
+        parameters: List[str] = []
+        for index, parameter in enumerate(function.parameters):
+            if parameter.value in [p.value for p in
+                                   function.parameters[index + 1:]]:
+                # Repeated parameter: only the last one is visible.
+                parameters.append(self._new_temp('_unused'))
+            else:
+                parameters.append(self._python_name(parameter.value, level))
+
+        self._emit(f'def {name}({", ".join(parameters)}):')
+        self._functions[name] = function
+        self._indent += 1
+
+        loops = self._has_self_tail_call(function)
+        if loops:
+            self._emit('while True:')
+            self._indent += 1
+
+        assert function.body is not None
+        self._block(function.body, _RETURN, '')
+
+        if loops:
+            self._indent -= 1
+        self._indent -= 1
+        self._scopes.pop()
+
+        if binding is not None:
+            self._emit(f'{binding} = {name}')
+            return binding
+
+        return name
+
+    def _find_tail_calls(self, program: ast.Program) -> None:
+        # Before any code is generated, so that calls to functions defined
+        # later know whether they return pending tail calls.
+        pending: List[Tuple[ast.ASTNode, ast.ASTNode, ast.ASTNode]] = \
+            [(program, program, program)]
+
+        while pending:
+            node, function, scope = pending.pop()
+
+            if type(node) == ast.Function:
+                for child in ast.children(node):
+                    pending.append((child, node, function))
+                continue
+            elif type(function) == ast.Function and \
+                    _is_tail_call(node) and \
+                    not self._is_self_tail_call(node,
+                                                cast(ast.Function, function),
+                                                scope):
+                self._trampolined.add(id(function))
+
+            for child in ast.children(node):
+                pending.append((child, function, scope))
+
+    def _has_self_tail_call(self, function: ast.Function) -> bool:
+        pending: List[ast.ASTNode] = [function.body] if function.body else []
+
+        while pending:
+            node = pending.pop()
+            if type(node) == ast.Function:
+                continue
+            elif self._is_self_tail_call(node, function, self._scopes[-2]):
+                return True
+
+            pending.extend(ast.children(node))
+
+        return False
+
+    def _if(self, if_expression: ast.If, mode: int, target: str) -> None:
+        assert if_expression.condition is not None
+        self._emit(f'if {self._condition(if_expression.condition)}:')
+
+        # Inside a branch a trailing `var` makes the `if` evaluate to null.
+        branch_mode = _RETURN if mode == _PROGRAM else mode
+
+        self._indent += 1
+        self._block(if_expression.consequence, branch_mode, target)
+        self._indent -= 1
+
+        if if_expression.alternative is not None or mode != _DISCARD:
+            self._emit('else:')
+            self._indent += 1
+            self._block(if_expression.alternative, branch_mode, target)
+            self._indent -= 1
+
+    def _is_self_tail_call(self,
+                           node: ast.ASTNode,
+                           function: ast.Function,
+                           scope: ast.ASTNode) -> bool:
+        # A call of the function by its name, from the scope that declares
+        # it, in tail position of its own body.
+        if not _is_tail_call(node):
+            return False
+
+        call = cast(ast.Call, node)
+        assert call.arguments is not None
+        if type(call.function) != ast.Identifier or \
+                len(call.arguments) != len(function.parameters):
+            return False
+
+        identifier = cast(ast.Identifier, call.function)
+        return identifier.depth == 1 and \
+            self._bindings.get((id(scope), identifier.slot)) is function
+
+    def _known_function(self,
+                        expression: ast.Expression) -> Optional[ast.Function]:
+        if type(expression) != ast.Identifier:
+            return None
+
+        return self._bindings.get(
+            self._binding(cast(ast.Identifier, expression)))
+
+    def _name(self, identifier: ast.Identifier) -> str:
+        level = len(self._scopes) - 1 - identifier.depth
+
+        return self._python_name(identifier.value, level)
+
+    def _new_temp(self, prefix: str = '_t') -> str:
+        self._temps += 1
+
+        return f'{prefix}{self._temps}'
+
+    def _operands(self,
+                  expressions: List[Optional[ast.Expression]]) -> List[str]:
+        # Operands are evaluated left to right. When an operand needs
+        # statements of its own (an `if`), the operands before it are saved
+        # in temporaries first so they are still evaluated before it.
+        values: List[str] = []
+
+        for expression in expressions:
+            mark = len(self._lines)
+            value = self._expression(expression)
+
+            if len(self._lines) > mark:
+                for index, previous in enumerate(values):
+                    if not _is_literal(previous):
+                        temp = self._new_temp()
+                        self._lines.insert(mark,
+                                           '    ' * self._indent +
+                                           f'{temp} = {previous}')
+                        mark += 1
+                        values[index] = temp
+
+            values.append(value)
+
+        return values
+
+    def _python_name(self, name: str, level: int) -> str:
+        if name.startswith('$'):
+            # Temporaries added by the optimizer. Names from the source end
+            # in a digit, so these cannot clash with them.
+            return f'_{name[1:]}_{level}_'
+
+        return f'{name}_{level}'
+
+    def _statement(self,
+                   statement: ast.Statement,
+                   mode: int,
+                   target: str) -> None:
+        node_type = type(statement)
+
+        if node_type == ast.LetStatement:
+            let_statement = cast(ast.LetStatement, statement)
+
+            assert let_statement.name is not None
+            value = self._expression(let_statement.value)
+            self._emit(f'{self._name(let_statement.name)} = {value}')
+
+            if mode == _PROGRAM:
+                self._emit('return _NO_VALUE')
+            elif mode != _DISCARD:
+                self._finish('None', mode, target)
+        elif node_type == ast.ReturnStatement:
+            return_statement = cast(ast.ReturnStatement, statement)
+
+            self._value(return_statement.return_value, _RETURN, target)
+        elif node_type == ast.ExpressionStatement:
+            expression_statement = cast(ast.ExpressionStatement, statement)
+
+            self._value(expression_statement.expression, mode, target)
+
+    def _statements(self,
+                    statements: List[ast.Statement],
+                    mode: int,
+                    target: str = '') -> None:
+        if len(statements) == 0:
+            self._finish('None', mode, target)
+
+        for index, statement in enumerate(statements):
+            last = index == len(statements) - 1
+            self._statement(statement, mode if last else _DISCARD, target)
+
+    def _tail_call(self, call: ast.Call) -> str:
+        assert call.arguments is not None
+        values = self._operands([call.function, *call.arguments])
+
+        callee = self._known_function(call.function)
+        if callee is not None and \
+                len(callee.parameters) == len(call.arguments):
+            return f'_TailCall({", ".join(values)})'
+
+        return f'_tail_call({", ".join(values)})'
+
+    def _tail_self_call(self, call: ast.Call, function: ast.Function) -> None:
+        assert call.arguments is not None
+        values = self._operands(list(call.arguments))
+
+        if len(values) > 0:
+            level = len(self._scopes) - 1
+            names = [self._python_name(parameter.value, level)
+                     for parameter in function.parameters]
+            self._emit(f'{", ".join(names)} = {", ".join(values)}')
+
+        self._emit('continue')
+
+    def _value(self,
+               expression: Optional[ast.Expression],
+               mode: int,
+               target: str) -> None:
+        if type(expression) == ast.If:
+            self._if(cast(ast.If, expression), mode, target)
+            return
+
+        function = self._scopes[-1]
+        if mode == _RETURN and type(function) == ast.Function and \
+                expression is not None and _is_tail_call(expression):
+            if self._is_self_tail_call(expression,
+                                       cast(ast.Function, function),
+                                       self._scopes[-2]):
+                self._tail_self_call(cast(ast.Call, expression),
+                                     cast(ast.Function, function))
+            else:
+                self._finish(self._tail_call(cast(ast.Call, expression)),
+                             mode,
+                             target)
+            return
+
+        value = self._expression(expression)
+        if mode != _DISCARD or type(expression) != ast.Function:
+            self._finish(value, mode, target)
+
+
+class CompiledProgram:
+
+    def __init__(self,
+                 source: str,
+                 code: CodeType,
+                 functions: Dict[str, ast.Function],
+                 constants: Dict[str, Object]) -> None:
+        self.source = source
+        self.code = code
+        self._functions = functions
+        self._constants = constants
+
+    def run(self) -> Optional[Object]:
+        namespace: Dict[str, Any] = dict(_RUNTIME)
+        namespace['_builtin'] = partial(_builtin,
+                                        self.box,
+                                        partial(_apply, self.box))
+        namespace.update(self._constants)
+        exec(self.code, namespace)
+        main: Callable[[], Any] = namespace[_MAIN]
+
+        try:
+            value = main()
+        except FRostriError as error:
+            return Error(error.message)
+        except RecursionError as exception:
+            # Deep recursion not in tail position, as in frl.session.
+            return Error(f'{type(exception).__name__}: {exception}')
+        except NameError as error:
+            # Python quotes the variable in the message. Generated names
+            # are the FRostri name plus a level suffix.
+            found = search(r"'(\w+)'", str(error))
+            name = found.group(1).rsplit('_', 1)[0] if found else ''
+            return Error(NOT_INITIALIZED.format(name))
+
+        if value is _NO_VALUE:
+            return None
+
+        return self.box(value)
+
+    def box(self, value: Any) -> Object:
+        value_type = type(value)
+
+        if value_type is bool:
+            return TRUE if value else FALSE
+        elif value_type is int:
+            return new_integer(value)
+        elif value_type is float:
+            return Float(value)
+        elif value is None:
+            return NULL
+        elif value_type is Vector or value_type is PersistentList or \
+                value_type is PersistentMap or value_type is String or \
+                value_type is Stream:
+            return value
+
+        return CompiledFunction(value, self._functions[value.__name__])
+
+
+def compile_program(program: ast.Program) -> CompiledProgram:
+    """
+    Translate a resolved program to Python and compile it with the built-in
+    compile() into a code object ready to run.
+    """
+    transpiler = Transpiler()
+    source = transpiler.transpile(program)
+    code = compile(source, '<frostri>', 'exec')
+
+    return CompiledProgram(source,
+                           code,
+                           transpiler.functions,
+                           transpiler.constants)
+
+
+def _is_number(expression: Optional[ast.Expression]) -> bool:
+    return expression is not None and \
+        expression.inferred in (ObjectType.INTEGERS, ObjectType.FLOAT)
+
+
+def _is_unchecked(infix: ast.Infix) -> bool:
+    # Static inference proved both operands to be numbers of the same type.
+    return _is_number(infix.left) and \
+        infix.left.inferred == cast(ast.Expression, infix.right).inferred and \
+        infix.operator in _PYTHON_OPERATORS
+
+
+def _is_tail_call(node: ast.ASTNode) -> bool:
+    return type(node) == ast.Call and \
+        cast(ast.Call, node).tail and \
+        cast(ast.Call, node).builtin is None
+
+
+def _is_literal(value: str) -> bool:
+    return value in ('None', 'True', 'False') or \
+        value.replace('.', '', 1).isdigit()
@@ -0,0 +1,122 @@
+from array import array
+from itertools import accumulate
+from operator import mul
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+)
+
+from frl.object import Vector
+
+try:
+    # NumPy is optional, see BACKEND.
+    import numpy  # type: ignore[import, import-not-found]
+except ImportError:
+    numpy = None  # type: ignore
+
+
+# Where vector values live: 'numpy' runs every operation as one vectorized
+# call, 'array' falls back to a loop over an array('d').
+BACKEND = 'numpy' if numpy is not None else 'array'
+
+
+def new_vector(values: Iterable[float]) -> Vector:
+    if numpy is not None:
+        return Vector(numpy.array(list(values), dtype=numpy.float64))
+
+    return Vector(array('d', values))
+
+
+def vector_map(operation: Callable[[Any, Any], Any],
+               left: Any,
+               right: Any) -> Vector:
+    """
+    Apply a binary operation element by element. Each operand is the
+    values of a vector or a number, and two vectors have the same length.
+    Booleans produced by comparisons become 1.0 and 0.0.
+    """
+    if numpy is not None:
+        return Vector(numpy.asarray(operation(left, right),
+                                    dtype=numpy.float64))
+
+    if type(left) is not array:
+        return Vector(array('d', (operation(left, value) for value in right)))
+    elif type(right) is not array:
+        return Vector(array('d', (operation(value, right) for value in left)))
+
+    return Vector(array('d', map(operation, left, right)))
+
+
+def vector_negate(values: Any) -> Vector:
+    if numpy is not None:
+        return Vector(-values)
+
+    return Vector(array('d', (-value for value in values)))
+
+
+def has_zero(values: Any) -> bool:
+    if numpy is not None:
+        return bool((values == 0).any())
+
+    return 0 in values
+
+
+# Whole-vector reductions and transforms behind the built-in functions.
+# Each one is a single NumPy call, or a C-level builtin over the array.
+
+
+def vector_sum(values: Any) -> float:
+    if numpy is not None:
+        return float(numpy.sum(values))
+
+    return float(sum(values))
+
+
+def vector_min(values: Any) -> float:
+    if numpy is not None:
+        return float(numpy.min(values))
+
+    return min(values)
+
+
+def vector_max(values: Any) -> float:
+    if numpy is not None:
+        return float(numpy.max(values))
+
+    return max(values)
+
+
+def vector_dot(left: Any, right: Any) -> float:
+    if numpy is not None:
+        return float(numpy.dot(left, right))
+
+    return float(sum(map(mul, left, right)))
+
+
+def vector_cumsum(values: Any) -> Vector:
+    if numpy is not None:
+        return Vector(numpy.cumsum(values))
+
+    return Vector(array('d', accumulate(values)))
+
+
+def vector_filter_greater(values: Any, threshold: float) -> Vector:
+    if numpy is not None:
+        return Vector(values[values > threshold])
+
+    return Vector(array('d', filter(float(threshold).__lt__, values)))
+
+
+def vector_filter_less(values: Any, threshold: float) -> Vector:
+    if numpy is not None:
+        return Vector(values[values < threshold])
+
+    return Vector(array('d', filter(float(threshold).__gt__, values)))
+
+
+def vector_range(size: int) -> Vector:
+    if numpy is not None:
+        return Vector(numpy.arange(max(size, 0), dtype=numpy.float64))
+
+    return Vector(array('d', range(size)))
@@ -1,14 +1,106 @@
+from argparse import ArgumentParser
+from sys import (
+    exit,
+    stderr,
+    stdin,
+    stdout,
+)
+
+from frl.cli import (
+    EXIT_INVALID,
+    read_files,
+    run_batch,
+    run_client,
+    run_file,
+    run_lines,
+    run_server,
+)
+from frl.pipeline import (
+    DEFAULT_OPTIMIZATION_LEVEL,
+    OPTIMIZATION_LEVELS,
+)
 from frl.repl import start_repl
+from frl.server import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+)
 from utils.colors import TextColors
 
 colors = TextColors()
 
+STDIN = '-'
+
 
 def main() -> None:
+    arguments = ArgumentParser(
+        description='FRostri programming language',
+        epilog='Without arguments it starts the REPL. `run FILE` runs a '
+               'program and `run -`, or just `-`, runs every line read from '
+               'standard input as a program. `batch FILE...` runs each file '
+               'as an independent program on a pool of processes, and '
+               '`batch -` each line of standard input. `serve` starts an '
+               'evaluation server and `client -` sends it every line of '
+               'standard input.')
+    arguments.add_argument('-O', dest='optimization_level', type=int,
+                           choices=OPTIMIZATION_LEVELS,
+                           default=DEFAULT_OPTIMIZATION_LEVEL,
+                           help='optimization level (default: %(default)s)')
+    arguments.add_argument('-j', dest='workers', type=int, default=None,
+                           help='processes for batch and serve '
+                                '(default: one per CPU)')
+    arguments.add_argument('--socket', dest='path', default=None,
+                           help='Unix socket of serve and client, '
+                                'instead of TCP')
+    arguments.add_argument('--host', default=DEFAULT_HOST,
+                           help='host of serve and client '
+                                '(default: %(default)s)')
+    arguments.add_argument('--port', type=int, default=DEFAULT_PORT,
+                           help='port of serve and client '
+                                '(default: %(default)s)')
+    arguments.add_argument('command', nargs='*',
+                           metavar='run FILE | - | batch FILE... | serve | '
+                                   'client -',
+                           help='programs to run instead of the REPL')
+    options = arguments.parse_args()
+    command = options.command
+
+    if command == [STDIN] or command == ['run', STDIN]:
+        exit(run_lines(stdin, stdout, options.optimization_level))
+    elif len(command) == 2 and command[0] == 'run':
+        exit(run_file(command[1], stdout, stderr, options.optimization_level))
+    elif len(command) > 1 and command[0] == 'batch':
+        sources = stdin.read().splitlines() if command[1:] == [STDIN] \
+            else read_files(command[1:], stderr)
+
+        if sources is None:
+            exit(EXIT_INVALID)
+
+        exit(run_batch(sources,
+                       stdout,
+                       stderr,
+                       options.workers,
+                       options.optimization_level))
+    elif command == ['serve']:
+        run_server(options.path,
+                   options.host,
+                   options.port,
+                   options.workers,
+                   options.optimization_level)
+        exit()
+    elif command == ['client', STDIN]:
+        exit(run_client(stdin.read().splitlines(),
+                        stdout,
+                        stderr,
+                        options.path,
+                        options.host,
+                        options.port))
+    elif len(command) > 0:
+        arguments.error(f'unknown command: {" ".join(command)}')
+
     print(f'{colors.GREEN}Welcome to the FRostri programming language REPL{colors.RESET}')
     print('Type \'help\' for mor information')
 
-    start_repl()
+    start_repl(options.optimization_level)
 
 
 if __name__ == '__main__':
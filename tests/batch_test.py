@@ -0,0 +1,64 @@
+from typing import (
+    Any,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.batch import (
+    _parse,
+    BatchEvaluator,
+    evaluate_batch,
+    ProgramResult,
+)
+
+
+SOURCES = [
+    'fun f(n) { if (n < 2) { n } else { f(n - 1) + f(n - 2) } }; f(10)',
+    'var a = 1;',
+    '1 / 0',
+    'a + 1',
+    'var a = ;',
+    'fun f(n) { f(n + 1) + 1 }; f(0)',
+    '[1, 2] * 2',
+]
+
+
+class BatchTest(TestCase):
+
+    def test_results_keep_order_and_errors_are_isolated(self) -> None:
+        for workers in (1, 2):
+            report = evaluate_batch(SOURCES, workers=workers, chunk_size=2)
+
+            self.assertEqual(report.workers, workers)
+            self.assertEqual(len(report.results), len(SOURCES))
+            self.assertEqual([self._summary(result)
+                              for result in report.results], [
+                ('INTEGERS', '55', ()),
+                (None, None, ()),
+                ('ERROR', 'Error: Division by zero', ()),
+                (None, None, ('Identifier not found: a',)),
+                (None, None, ("No function found for parse ';'",)),
+                ('ERROR', 'Error: RecursionError: maximum recursion depth '
+                          'exceeded', ()),
+                ('VECTOR', '[2.0, 4.0]', ()),
+            ])
+            self.assertEqual(report.failed, 4)
+            self.assertGreater(report.throughput, 0)
+
+    def test_workers_are_reused(self) -> None:
+        with BatchEvaluator(workers=1) as batch:
+            _parse.cache_clear()
+            batch.run(SOURCES[:1] * 10)
+            batch.run(SOURCES[:1])
+
+        self.assertEqual(_parse.cache_info().misses, 1)
+        self.assertEqual(_parse.cache_info().hits, 10)
+
+    def _summary(self, result: ProgramResult) -> Tuple[Any, ...]:
+        # Without the time, and without the end of Python messages, which
+        # change between versions.
+        value = result.value
+        if value is not None and 'RecursionError' in value:
+            value = value[:value.index('exceeded') + len('exceeded')]
+
+        return result.type_name, value, result.errors
@@ -0,0 +1,162 @@
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.builtins import BUILTINS
+from frl.evaluator import evaluate
+from frl.inference import infer_types
+from frl.lexer import Lexer
+from frl.machine import evaluate as run_machine
+from frl.object import (
+    Environment,
+    Object,
+    ObjectType,
+)
+from frl.parser import Parser
+from frl.pipeline import optimization_pipeline
+from frl.resolver import Resolver
+from frl.tiering import enable_tiering
+from frl.transpiler import compile_program
+
+
+SOURCES: List[Tuple[str, ObjectType, str]] = [
+    ('sum([1, 2, 3.5])', ObjectType.FLOAT, '6.5'),
+    ('sum([])', ObjectType.FLOAT, '0.0'),
+    ('min([3, 1, 2]) + max([3, 1, 2])', ObjectType.FLOAT, '4.0'),
+    ('mean([1, 2])', ObjectType.FLOAT, '1.5'),
+    ('dot([1, 2], [3, 4])', ObjectType.FLOAT, '11.0'),
+    ('cumsum([1, 2, 3])', ObjectType.VECTOR, '[1.0, 3.0, 6.0]'),
+    ('filter_gt([1, 5, 2, 7], 2)', ObjectType.VECTOR, '[5.0, 7.0]'),
+    ('filter_lt([1, 5, 2, 7], 2.5)', ObjectType.VECTOR, '[1.0, 2.0]'),
+    ('len(range(10))', ObjectType.INTEGERS, '10'),
+    ('sum(range(1000000))', ObjectType.FLOAT, '499999500000.0'),
+    ('var v = range(5); sum(v) / len(v)', ObjectType.FLOAT, '2.0'),
+    ('fun f(v) { sum(v * 2) }; f([1, 2]) + f([3])', ObjectType.FLOAT, '12.0'),
+    ('min([])', ObjectType.ERROR, 'Error: Empty vector in min'),
+    ('dot([1], [1, 2])',
+     ObjectType.ERROR, 'Error: Vector length mismatch: 1 and 2'),
+    ('sum(1)', ObjectType.ERROR,
+     'Error: Wrong argument type for sum: expected VECTOR, got INTEGERS'),
+    ('filter_gt([1], true)', ObjectType.ERROR,
+     'Error: Wrong argument type for filter_gt: expected INTEGERS or '
+     'FLOAT, got BOOLEAN'),
+    ('sum([1], [2])', ObjectType.ERROR,
+     'Error: Wrong number of arguments: expected 1, got 2'),
+    ('sum(1 + true)', ObjectType.ERROR,
+     'Error: Type mismatch: INTEGERS + BOOLEAN'),
+    ('push(push(list(), 1), [2])', ObjectType.LIST, 'list(1, [2.0])'),
+    ('nth(push(list(), fun(x) { x * 2 }), 0)(21)', ObjectType.INTEGERS, '42'),
+    ('''
+        fun build(n, l) {
+            if (n == 0) { return l; }
+            return build(n - 1, push(l, n));
+        };
+        var l = build(100, list());
+        nth(l, 0) + nth(l, 99) + len(l);
+     ''', ObjectType.INTEGERS, '201'),
+    ('''
+        var l = push(push(list(), 1), 2);
+        var m = update(l, 0, 5);
+        nth(l, 0) * 10 + nth(m, 0);
+     ''', ObjectType.INTEGERS, '15'),
+    ('nth(list(), 0)', ObjectType.ERROR, 'Error: Index out of range: 0'),
+    ('update(push(list(), 1), -1, 1)',
+     ObjectType.ERROR, 'Error: Index out of range: -1'),
+    ('lookup(put(put(map(), 1, 10), 1.0, 20), 1)', ObjectType.INTEGERS, '20'),
+    ('lookup(map(), 5)', ObjectType.NULL, 'null'),
+    ('put(put(map(), true, list()), 2, [2])',
+     ObjectType.MAP, 'map(true: list(), 2: [2.0])'),
+    ('len(put(put(map(), 1, 1), 2, 2))', ObjectType.INTEGERS, '2'),
+    ('put(map(), [1], 2)',
+     ObjectType.ERROR, 'Error: Unsupported map key: VECTOR'),
+    ('nth(1, 1)', ObjectType.ERROR,
+     'Error: Wrong argument type for nth: expected LIST, got INTEGERS'),
+]
+
+
+class BuiltinsTest(TestCase):
+
+    def test_builtins(self) -> None:
+        for source, expected_type, expected in SOURCES:
+            self._test_object(evaluate(self._parse(source), Environment()),
+                              expected_type,
+                              expected)
+
+    def test_backends_give_same_results(self) -> None:
+        for source, expected_type, expected in SOURCES:
+            self._test_object(run_machine(self._parse(source), Environment()),
+                              expected_type,
+                              expected)
+            self._test_object(compile_program(self._parse(source)).run(),
+                              expected_type,
+                              expected)
+
+            program = self._parse(source)
+            infer_types(program, closed_world=True)
+            enable_tiering(program, threshold=1, unboxed=True)
+
+            self._test_object(evaluate(program, Environment()),
+                              expected_type,
+                              expected)
+
+            program = self._parse(source)
+            optimization_pipeline(2, closed_world=True).run(program)
+
+            self._test_object(evaluate(program, Environment()),
+                              expected_type,
+                              expected)
+
+    def test_declarations_hide_builtins(self) -> None:
+        sources: List[str] = [
+            'fun sum(v) { 7 }; sum([1])',
+            'var sum = fun(v) { 7 }; sum([1])',
+            'fun f(sum) { sum([1]) }; f(fun(v) { 7 })',
+        ]
+
+        for source in sources:
+            self._test_object(evaluate(self._parse(source), Environment()),
+                              ObjectType.INTEGERS,
+                              '7')
+
+    def test_builtins_are_not_values(self) -> None:
+        parser: Parser = Parser(Lexer('var total = sum;'))
+        program: Program = parser.parse_program()
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(resolver.errors, ['Identifier not found: sum'])
+
+    def test_inferred_types(self) -> None:
+        program = self._parse('len([1]) + 1; sum([1]);')
+        infer_types(program)
+
+        self.assertEqual(program.statements[0].expression.inferred,
+                         ObjectType.INTEGERS)
+        self.assertEqual(program.statements[1].expression.inferred,
+                         BUILTINS['sum'].returns)
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
+
+    def _test_object(self,
+                     evaluated: Optional[Object],
+                     expected_type: ObjectType,
+                     expected: str) -> None:
+        assert evaluated is not None
+        self.assertEqual(evaluated.type(), expected_type)
+        self.assertEqual(evaluated.inspect(), expected)
@@ -0,0 +1,114 @@
+from io import StringIO
+from os import remove
+from tempfile import NamedTemporaryFile
+from typing import Tuple
+from unittest import TestCase
+
+from frl.cli import (
+    EXIT_ERROR,
+    EXIT_INVALID,
+    EXIT_OK,
+    run_batch,
+    run_file,
+    run_lines,
+)
+
+
+class CliTest(TestCase):
+
+    def test_run_file(self) -> None:
+        source = '''
+            fun f(n) { if (n < 2) { n } else { f(n - 1) + f(n - 2) } };
+            f(10);
+        '''
+        self.assertEqual(self._run_file(source), (EXIT_OK, '55\n', ''))
+        self.assertEqual(self._run_file('var a = 1;'), (EXIT_OK, '', ''))
+        self.assertEqual(self._run_file('1 / 0'),
+                         (EXIT_ERROR, '', 'Error: Division by zero\n'))
+        self.assertEqual(self._run_file('a + 1'),
+                         (EXIT_INVALID, '', 'Identifier not found: a\n'))
+
+    def test_missing_file(self) -> None:
+        output = StringIO()
+        errors = StringIO()
+
+        self.assertEqual(run_file('/no/such/file.frl', output, errors),
+                         EXIT_INVALID)
+        self.assertEqual(errors.getvalue(),
+                         'Cannot read /no/such/file.frl: '
+                         'No such file or directory\n')
+
+    def test_run_lines(self) -> None:
+        lines = [
+            'fun square(x) { x * x };\n',
+            'var a = square(3);\n',
+            '\n',
+            'a + 1\n',
+            'square(1 / 0)\n',
+            'square(2)',
+        ]
+        output = StringIO()
+
+        self.assertEqual(run_lines(lines, output), EXIT_ERROR)
+        self.assertEqual(output.getvalue().splitlines(), [
+            'fun square(x) (x * x)',
+            '',
+            '',
+            '10',
+            'Error: Division by zero',
+            '4',
+        ])
+
+        output = StringIO()
+        self.assertEqual(run_lines(['var = 1;', 'b', '1'], output),
+                         EXIT_INVALID)
+        self.assertEqual(output.getvalue().splitlines()[1:],
+                         ['Identifier not found: b', '1'])
+
+    def test_deep_recursion_fails_one_line(self) -> None:
+        lines = [
+            'fun sum(n) { if (n == 0) { return 0; } return n + sum(n - 1); }',
+            'sum(5000)',
+            '1 + 1',
+        ]
+        output = StringIO()
+
+        self.assertEqual(run_lines(lines, output), EXIT_ERROR)
+
+        results = output.getvalue().splitlines()
+        self.assertEqual(len(results), 3)
+        self.assertTrue(results[1].startswith('Error: RecursionError: '))
+        self.assertEqual(results[2], '2')
+
+        self.assertEqual(self._run_file('\n'.join(lines[:2]))[0],
+                         EXIT_ERROR)
+
+    def test_run_batch(self) -> None:
+        output = StringIO()
+        errors = StringIO()
+
+        self.assertEqual(
+            run_batch(['1 + 1', 'var a = 1;', 'a', '1 / 0'], output, errors,
+                      workers=1),
+            EXIT_INVALID)
+        self.assertEqual(output.getvalue().splitlines(), [
+            '2',
+            '',
+            'Identifier not found: a',
+            'Error: Division by zero',
+        ])
+        self.assertTrue(errors.getvalue().startswith('4 programs, 2 failed'))
+
+    def _run_file(self, source: str) -> Tuple[int, str, str]:
+        with NamedTemporaryFile('w', suffix='.frl', delete=False) as file:
+            file.write(source)
+
+        output = StringIO()
+        errors = StringIO()
+
+        try:
+            code = run_file(file.name, output, errors)
+        finally:
+            remove(file.name)
+
+        return code, output.getvalue(), errors.getvalue()
@@ -0,0 +1,86 @@
+from typing import (
+    List,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.constant_folding import fold_constants
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import Environment
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+class ConstantFoldingTest(TestCase):
+
+    def test_folded_expressions(self) -> None:
+        tests: List[Tuple[str, str, int]] = [
+            ('1 + 2 * 3', '7', 2),
+            ('7 / 2 + 0.5', '3.5', 2),
+            ('-(2 - 5)', '3', 2),
+            ('!(1 < 2)', 'false', 2),
+            ('1 == 1.0', 'true', 1),
+            ('var a = 2 * 2; a', 'var a = 4;a', 1),
+            ('fun f(x) { x + 2 * 3 }; f(1)', 'fun f(x) (x + 6)f(1)', 1),
+            ('if (1 < 2) { 10 } else { 20 }', '10', 2),
+            ('if (false) { 10 } else { 20 + 1 }', '21', 2),
+            ('f(2 * 3); fun f(x) { x }', 'f(6)fun f(x) x', 1),
+        ]
+
+        for source, expected, folded in tests:
+            program = self._parse(source)
+
+            self.assertEqual(fold_constants(program), folded)
+            self.assertEqual(str(program), expected)
+
+    def test_failing_operations_are_kept(self) -> None:
+        sources: List[str] = [
+            '1 / 0',
+            '1 + true',
+            '-true',
+            'if (false) { 1 }',
+            'if (true) { var a = 1; }',
+        ]
+
+        for source in sources:
+            program = self._parse(source)
+            printed = str(program)
+
+            self.assertEqual(fold_constants(program), 0)
+            self.assertEqual(str(program), printed)
+
+    def test_same_results(self) -> None:
+        sources: List[str] = [
+            '2000 * 3000 - 1',
+            '1.5 * 2 === 3',
+            '5 / 0 + 1',
+            '''
+                fun f(n) {
+                    if (1 < 2) { return n * (2 + 3); }
+                    return 0;
+                };
+                f(4);
+            ''',
+        ]
+
+        for source in sources:
+            expected = evaluate(self._parse(source), Environment())
+
+            program = self._parse(source)
+            fold_constants(program)
+            evaluated = evaluate(program, Environment())
+
+            assert evaluated is not None and expected is not None
+            self.assertEqual(evaluated.inspect(), expected.inspect())
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        Resolver().resolve(program)
+
+        return program
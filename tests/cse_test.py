@@ -0,0 +1,148 @@
+from typing import (
+    List,
+    Optional,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.cse import eliminate_common_subexpressions
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.transpiler import compile_program
+
+
+class CSETest(TestCase):
+
+    def test_repeated_expressions_are_computed_once(self) -> None:
+        source: str = '''
+            fun f(a, b, c) {
+                var y = (a * b + c) * 2;
+                var z = a * b + c - 1;
+                y + z
+            };
+        '''
+        program = self._parse(source)
+
+        self.assertEqual(eliminate_common_subexpressions(program), 1)
+        self.assertEqual(str(program.statements[0]),
+                         'fun f(a, b, c) var $cse0 = ((a * b) + c);'
+                         'var y = ($cse0 * 2);var z = ($cse0 - 1);(y + z)')
+        self.assertEqual(program.statements[0].expression.frame_size, 6)
+
+    def test_variables_are_reused(self) -> None:
+        source: str = '''
+            fun f(a, b) {
+                var x = a * b;
+                var y = -(a * b);
+                x + y + a * b
+            };
+        '''
+        program = self._parse(source)
+
+        self.assertEqual(eliminate_common_subexpressions(program), 2)
+        self.assertEqual(str(program.statements[0]),
+                         'fun f(a, b) var x = (a * b);var y = (-x);'
+                         '((x + y) + x)')
+        self.assertEqual(program.statements[0].expression.frame_size, 4)
+
+    def test_redeclared_inputs(self) -> None:
+        source: str = '''
+            fun f(a, b) {
+                var s = a + b;
+                var a = 1;
+                a + b + (a + b) + s
+            };
+        '''
+        program = self._parse(source)
+
+        self.assertEqual(eliminate_common_subexpressions(program), 1)
+        self.assertEqual(str(program.statements[0]),
+                         'fun f(a, b) var s = (a + b);var a = 1;'
+                         'var $cse0 = (a + b);(($cse0 + $cse0) + s)')
+
+    def test_expressions_that_are_not_eliminated(self) -> None:
+        sources: List[str] = [
+            # Global code.
+            'var a = 1; a * 2 + a * 2',
+            # Different inputs.
+            'fun f(a, b) { a * b + b * a }',
+            # Declared again inside an if between the two.
+            'fun f(a, c) { (a + 1) + if (c) { var a = 2; a } + (a + 1) }',
+            # Moving it would evaluate it before a call.
+            'fun f(a, g) { g(a) + (a + 1) * (a + 1) }',
+            # Moving it could fail before a variable read fails.
+            'fun f(a) { g + (a * 2) + (a * 2); fun g() { 1 }; }',
+        ]
+
+        for source in sources:
+            program = self._parse(source)
+
+            self.assertEqual(eliminate_common_subexpressions(program), 0)
+
+    def test_same_results(self) -> None:
+        sources: List[str] = [
+            '''
+                fun f(a, b, c) {
+                    var x = a * b + c;
+                    var y = (a * b + c) * 2;
+                    if (x > 0) { (a * b) * (a * b) } else { -c + -c };
+                    x + y + a * b
+                };
+                f(2, 3, 4) + f(-2, 3, 4);
+            ''',
+            '''
+                fun f(a, b) {
+                    var s = a + b;
+                    var a = s + b;
+                    a + b + (a + b) + s
+                };
+                f(2, 3.5);
+            ''',
+            '''
+                fun f(n) {
+                    if (n == 0) { return 0; }
+                    return (n * n) - (n * n) + f(n - 1);
+                };
+                f(100);
+            ''',
+            '''
+                fun f(a) { a / 0 + a / 0 };
+                f(1);
+            ''',
+        ]
+
+        for source in sources:
+            expected = evaluate(self._parse(source), Environment())
+
+            program = self._parse(source)
+            self.assertGreater(eliminate_common_subexpressions(program), 0)
+
+            self._test_same_object(evaluate(program, Environment()),
+                                   expected)
+            self._test_same_object(compile_program(program).run(), expected)
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
+
+    def _test_same_object(self,
+                          evaluated: Optional[Object],
+                          expected: Optional[Object]) -> None:
+        assert evaluated is not None and expected is not None
+        self.assertEqual(type(evaluated), type(expected))
+        self.assertEqual(evaluated.inspect(), expected.inspect())
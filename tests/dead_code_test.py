@@ -0,0 +1,161 @@
+from typing import (
+    List,
+    Optional,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.dead_code import (
+    eliminate_dead_code,
+    RemovedCode,
+)
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+class DeadCodeTest(TestCase):
+
+    def test_code_after_return(self) -> None:
+        source: str = '''
+            fun f(x) {
+                if (x > 0) { return 1; var y = 2; } else { return 2; }
+                x + 1;
+                return 3;
+            };
+            f(1);
+        '''
+        program = self._parse(source)
+        removed = eliminate_dead_code(program)
+
+        self.assertEqual(removed, [
+            RemovedCode('unreachable', 'var y = 2;'),
+            RemovedCode('unreachable', '(x + 1)'),
+            RemovedCode('unreachable', 'return 3;'),
+        ])
+        self.assertEqual(str(program), 'fun f(x) if (x > 0) return 1;'
+                                       'else return 2;f(1)')
+
+    def test_literal_conditions(self) -> None:
+        source: str = '''
+            var a = if (true) { 1 } else { 2 };
+            var b = if (false) { 1 } else { 2 };
+            a + b;
+        '''
+        program = self._parse(source)
+        removed = eliminate_dead_code(program)
+
+        self.assertEqual(removed, [
+            RemovedCode('unreachable', '2'),
+            RemovedCode('unreachable', '1'),
+        ])
+        self.assertEqual(str(program),
+                         'var a = if true 1;var b = if false else 2;(a + b)')
+
+    def test_unused_declarations(self) -> None:
+        source: str = '''
+            fun f(x) {
+                var unused = 5;
+                var used = 1;
+                fun helper() { other() };
+                fun other() { 2 };
+                5 * 2;
+                x + used;
+            };
+            f(1);
+        '''
+        program = self._parse(source)
+        removed = eliminate_dead_code(program)
+
+        self.assertEqual([code.reason for code in removed],
+                         ['unused'] * 4)
+        self.assertEqual(str(program),
+                         'fun f(x) var used = 1;(x + used)f(1)')
+
+    def test_globals_need_closed_world(self) -> None:
+        source: str = '''
+            var a = 1;
+            fun unused() { 2 };
+            var b = 3;
+            b;
+        '''
+        self.assertEqual(eliminate_dead_code(self._parse(source)), [])
+
+        program = self._parse(source)
+        removed = eliminate_dead_code(program, closed_world=True)
+
+        self.assertEqual(removed, [
+            RemovedCode('unused', 'var a = 1;'),
+            RemovedCode('unused', 'fun unused() 2'),
+        ])
+
+    def test_code_that_may_fail_is_kept(self) -> None:
+        sources: List[str] = [
+            'var a = 1 / 0; 5',
+            'var b = 1; var a = b; 5',
+            'var a = 1 + true; 5',
+            'fun f() { 1 }; var a = f(); 5',
+        ]
+
+        for source in sources:
+            program = self._parse(source)
+
+            self.assertEqual(eliminate_dead_code(program, closed_world=True),
+                             [])
+
+    def test_same_results(self) -> None:
+        sources: List[str] = [
+            'fun f() { var a = 1; }; f()',
+            'fun f() { }; f()',
+            'fun f() { 1; return 2; 3 }; f()',
+            'fun f(x) { if (x) { return 1; } else { return 2; } 3 }; f(false)',
+            'var a = if (false) { 1 }; a',
+            '''
+                fun count(n, acc) {
+                    var step = 1;
+                    if (n == 0) { return acc; }
+                    return count(n - step, acc + 1);
+                    count(0, 0);
+                };
+                count(1000, 0);
+            ''',
+            'return 1; 2',
+        ]
+
+        for source in sources:
+            expected = evaluate(self._parse(source), Environment())
+
+            program = self._parse(source)
+            eliminate_dead_code(program, closed_world=True)
+
+            self._test_same_object(evaluate(program, Environment()),
+                                   expected)
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
+
+    def _test_same_object(self,
+                          evaluated: Optional[Object],
+                          expected: Optional[Object]) -> None:
+        if expected is None:
+            self.assertIsNone(evaluated)
+            return
+
+        assert evaluated is not None
+        self.assertEqual(type(evaluated), type(expected))
+        self.assertEqual(evaluated.inspect(), expected.inspect())
@@ -1,4 +1,5 @@
 from typing import (
+    Any,
     cast,
     List,
     Tuple,
@@ -6,15 +7,22 @@ from typing import (
 from unittest import TestCase
 
 from frl.ast import Program
-from frl.evaluator import evaluate
+from frl.evaluator import (
+    evaluate,
+    NULL,
+)
 from frl.lexer import Lexer
 from frl.object import (
     Boolean,
+    Environment,
+    Error,
     Float,
+    Function,
     Integer,
     Object,
 )
 from frl.parser import Parser
+from frl.resolver import Resolver
 
 
 class EvaluatorTest(TestCase):
@@ -70,16 +78,261 @@ class EvaluatorTest(TestCase):
             evaluated = self._evaluate_tests(source)
             self._test_boolean_object(evaluated, expected)
 
+    def test_infix_expressions(self) -> None:
+        tests: List[Tuple[str, Any]] = [
+            ('5 + 5 + 5 + 5 - 10', 10),
+            ('2 * 2 * 2 * 2 * 2', 32),
+            ('-50 + 100 + -50', 0),
+            ('2 * (5 + 10)', 30),
+            ('7 / 2', 3),
+            ('3 * 3 * 3 + 10', 37),
+            ('1.5 + 1', 2.5),
+            ('7.0 / 2', 3.5),
+            ('1 < 2', True),
+            ('1 >= 2', False),
+            ('1 == 1.0', True),
+            ('1 === 1.0', False),
+            ('1 !== 1.0', True),
+            ('2.5 === 2.5', True),
+            ('true == true', True),
+            ('true != false', True),
+            ('(1 < 2) == true', True),
+            ('true == 1', False),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_object(evaluated, expected)
+
+    def test_if_else_evaluation(self) -> None:
+        tests: List[Tuple[str, Any]] = [
+            ('if (true) { 10 }', 10),
+            ('if (false) { 10 }', None),
+            ('if (1) { 10 }', 10),
+            ('if (1 < 2) { 10 } else { 20 }', 10),
+            ('if (1 > 2) { 10 } else { 20 }', 20),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_object(evaluated, expected)
+
+    def test_return_evaluation(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('return 10;', 10),
+            ('return 10; 9;', 10),
+            ('9; return 2 * 5; 9;', 10),
+            ('''
+                if (10 > 1) {
+                    if (20 > 10) {
+                        return 1;
+                    }
+
+                    return 0;
+                }
+            ''', 1),
+            # A return inside an if used as a value leaves the function.
+            ('fun f() { var x = if (true) { return 1; }; 5 }; f()', 1),
+            ('fun f() { 2 + if (true) { return 1; } }; f()', 1),
+            ('fun f() { g(if (true) { return 1; }) }; fun g(x) { 2 }; f()', 1),
+            ('var x = if (true) { return 1; }; 5', 1),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_error_handling(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('5 + true;', 'Type mismatch: INTEGERS + BOOLEAN'),
+            ('5 + true; 9;', 'Type mismatch: INTEGERS + BOOLEAN'),
+            ('true + false', 'Unknown operator: BOOLEAN + BOOLEAN'),
+            ('if (1 < 2) { return true * false; }',
+             'Unknown operator: BOOLEAN * BOOLEAN'),
+            ('1 / 0', 'Division by zero'),
+            ('var x = 5; x(1)', 'Not a function: INTEGERS'),
+            ('fun f(x) { x }; f(1, 2)',
+             'Wrong number of arguments: expected 1, got 2'),
+            ('f(); fun f() { 1 }', 'Identifier not initialized: f'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+
+            self.assertIsInstance(evaluated, Error)
+            evaluated = cast(Error, evaluated)
+            self.assertEqual(evaluated.message, expected)
+
+    def test_let_statements(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('var a = 5; a;', 5),
+            ('var a = 5 * 5; a;', 25),
+            ('var a = 5; var b = a; b;', 5),
+            ('var a = 5; var b = a; var c = a + b + 5; c;', 15),
+            ('var a = 5; var a = a + 1; a;', 6),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_function_object(self) -> None:
+        evaluated = self._evaluate_tests('fun(x) { x + 2; };')
+
+        self.assertIsInstance(evaluated, Function)
+
+        evaluated = cast(Function, evaluated)
+        self.assertEqual(len(evaluated.node.parameters), 1)
+        self.assertEqual(str(evaluated.node.parameters[0]), 'x')
+        self.assertEqual(str(evaluated.node.body), '(x + 2)')
+
+    def test_function_calls(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('var identity = fun(x) { x }; identity(5);', 5),
+            ('var identity = fun(x) { return x; }; identity(5);', 5),
+            ('var double = fun(x) { x * 2 }; double(5);', 10),
+            ('var add = fun(x, y) { x + y }; add(5, add(5, 5));', 15),
+            ('fun(x) { x }(5)', 5),
+            ('fun add(x, y) { x + y }; add(2, 3);', 5),
+            ('fun five() { 5 }; five();', 5),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_closures(self) -> None:
+        source: str = '''
+            var new_adder = fun(x) {
+                fun(y) { x + y };
+            };
+            var add_two = new_adder(2);
+            add_two(3);
+        '''
+
+        evaluated = self._evaluate_tests(source)
+        self._test_integer_object(evaluated, 5)
+
+    def test_nested_closures(self) -> None:
+        source: str = '''
+            var a = 1;
+            var f = fun(b) {
+                fun(c) {
+                    fun(d) { a + b + c + d }
+                }
+            };
+            var a = 100;
+            f(10)(20)(30);
+        '''
+
+        evaluated = self._evaluate_tests(source)
+        self._test_integer_object(evaluated, 160)
+
+    def test_shadowing(self) -> None:
+        source: str = '''
+            var x = 10;
+            var f = fun(x) { var y = x * 2; y };
+            f(1) + x;
+        '''
+
+        evaluated = self._evaluate_tests(source)
+        self._test_integer_object(evaluated, 12)
+
+    def test_recursion(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('''
+                fun fact(n) {
+                    if (n < 2) { return 1; }
+                    return n * fact(n - 1);
+                };
+                fact(10);
+            ''', 3628800),
+            ('''
+                var fib = fun(n) {
+                    if (n < 2) { n } else { fib(n - 1) + fib(n - 2) }
+                };
+                fib(15);
+            ''', 610),
+            ('''
+                fun is_even(n) {
+                    if (n == 0) { true } else { is_odd(n - 1) }
+                };
+                fun is_odd(n) {
+                    if (n == 0) { false } else { is_even(n - 1) }
+                };
+                if (is_even(10)) { 1 } else { 0 };
+            ''', 1),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_tail_calls(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('''
+                fun count(n, acc) {
+                    if (n == 0) { return acc; }
+                    return count(n - 1, acc + 1);
+                };
+                count(20000, 0);
+            ''', 20000),
+            ('''
+                fun is_even(n) { if (n == 0) { 1 } else { is_odd(n - 1) } };
+                fun is_odd(n) { if (n == 0) { 0 } else { is_even(n - 1) } };
+                is_even(20001);
+            ''', 0),
+            ('''
+                fun last(n, f) {
+                    if (n == 0) { return f(); }
+                    var g = fun() { n };
+                    last(n - 1, g);
+                };
+                last(5000, fun() { 0 });
+            ''', 1),
+            # A return in an if used as a value is still a tail call: it
+            # leaves the function with the value of the call.
+            ('''
+                fun count(n, acc) {
+                    var done = if (n > 0) { return count(n - 1, acc + 1); };
+                    acc;
+                };
+                count(20000, 0);
+            ''', 20000),
+            ('''
+                fun g(n) { n };
+                fun f() { var x = if (true) { return g(1); }; x + 1 };
+                f() + 10 * (1 + if (true) { f() } else { 0 });
+            ''', 21),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
     def _evaluate_tests(self, source: str) -> Object:
         lexer: Lexer = Lexer(source)
         parser: Parser = Parser(lexer)
         program: Program = parser.parse_program()
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+        env: Environment = Environment()
 
-        evaluated = evaluate(program)
+        evaluated = evaluate(program, env)
 
         assert evaluated is not None
         return evaluated
 
+    def _test_object(self, evaluated: Object, expected: Any) -> None:
+        if type(expected) == bool:
+            self._test_boolean_object(evaluated, expected)
+        elif type(expected) == int:
+            self._test_integer_object(evaluated, expected)
+        elif type(expected) == float:
+            self._test_float_object(evaluated, expected)
+        else:
+            self.assertIs(evaluated, NULL)
+
     def _test_boolean_object(self, evaluated: Object, expected: bool) -> None:
         self.assertIsInstance(evaluated, Boolean)
 
@@ -0,0 +1,131 @@
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.feedback import (
+    enable_type_feedback,
+    feedback_stats,
+    FeedbackStats,
+    MAX_DEOPTIMIZATIONS,
+)
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+    ObjectType,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+class FeedbackTest(TestCase):
+
+    def test_specialized_operators_give_same_results(self) -> None:
+        operators: List[str] = ['+', '-', '*', '/', '<', '<=', '>', '>=',
+                                '==', '!=', '===', '!==']
+        values: List[Tuple[str, str]] = [('7', '2'), ('7.5', '2.5'),
+                                         ('3', '0'), ('3.0', '0.0'),
+                                         ('2000', '3000'), ('1', '1.0')]
+
+        for operator in operators:
+            for left, right in values:
+                source: str = f'''
+                    fun op(x, y) {{ x {operator} y }};
+                    fun repeat(n) {{
+                        if (n == 0) {{ return op({left}, {right}); }}
+                        op({left}, {right});
+                        return repeat(n - 1);
+                    }};
+                    repeat(20);
+                '''
+                expected = evaluate(*self._prepare(source))
+                evaluated, _ = self._evaluate_tests(source)
+
+                self._test_same_object(evaluated, expected)
+
+    def test_integer_loop_is_specialized(self) -> None:
+        source: str = '''
+            fun sum(n, acc) {
+                if (n == 0) { return acc; }
+                return sum(n - 1, acc + n);
+            };
+            sum(100, 0);
+        '''
+        evaluated, stats = self._evaluate_tests(source)
+
+        assert evaluated is not None
+        self.assertEqual(evaluated.inspect(), '5050')
+        self.assertEqual(stats, [
+            FeedbackStats('(n == 0)', ObjectType.INTEGERS, 0),
+            FeedbackStats('(n - 1)', ObjectType.INTEGERS, 0),
+            FeedbackStats('(acc + n)', ObjectType.INTEGERS, 0),
+        ])
+
+    def test_type_change_deoptimizes(self) -> None:
+        source: str = '''
+            fun add(x, y) { x + y };
+            fun repeat(n, x) {
+                if (n == 0) { return x; }
+                return repeat(n - 1, add(x, 1) - 1);
+            };
+            repeat(10, 1) + repeat(10, 1.5);
+        '''
+        evaluated, stats = self._evaluate_tests(source)
+
+        assert evaluated is not None
+        self.assertEqual(evaluated.inspect(), '2.5')
+        self.assertEqual(stats[0], FeedbackStats('(x + y)', None, 1))
+        self.assertEqual(stats[3],
+                         FeedbackStats('(add(x, 1) - 1)', None, 1))
+
+    def test_unstable_types_stay_generic(self) -> None:
+        source: str = '''
+            fun add(x, y) { x + y };
+            fun repeat(n, x) {
+                if (n == 0) { return x; }
+                add(x, x);
+                return repeat(n - 1, x);
+            };
+            fun alternate(n) {
+                if (n == 0) { return 0; }
+                repeat(10, 1);
+                repeat(10, 1.5);
+                return alternate(n - 1);
+            };
+            alternate(10);
+        '''
+        _, stats = self._evaluate_tests(source)
+
+        self.assertEqual(stats[0],
+                         FeedbackStats('(x + y)', None, MAX_DEOPTIMIZATIONS))
+
+    def _evaluate_tests(self,
+                        source: str) -> Tuple[Optional[Object],
+                                              List[FeedbackStats]]:
+        program, env = self._prepare(source)
+        enable_type_feedback(program)
+        evaluated = evaluate(program, env)
+
+        return evaluated, feedback_stats(program)
+
+    def _prepare(self, source: str) -> Tuple[Program, Environment]:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        Resolver().resolve(program)
+
+        return program, Environment()
+
+    def _test_same_object(self,
+                          evaluated: Optional[Object],
+                          expected: Optional[Object]) -> None:
+        assert evaluated is not None and expected is not None
+        self.assertEqual(type(evaluated), type(expected))
+        self.assertEqual(evaluated.inspect(), expected.inspect())
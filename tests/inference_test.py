@@ -0,0 +1,233 @@
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+from unittest import TestCase
+
+import frl.ast as ast
+from frl.evaluator import evaluate
+from frl.inference import infer_types
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+    ObjectType,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.session import Session
+from frl.transpiler import compile_program
+
+
+class InferenceTest(TestCase):
+
+    def test_literals_and_bindings(self) -> None:
+        source: str = '''
+            var a = 5;
+            var b = a * 2.5;
+            var c = a < 3;
+            var d = if (c) { 1 } else { 2.0 };
+            var e = -a;
+            a; b; c; d; e;
+        '''
+        program = self._parse(source)
+        infer_types(program, closed_world=True)
+
+        self.assertEqual(self._identifiers(program), {
+            'a': ObjectType.INTEGERS,
+            'b': ObjectType.FLOAT,
+            'c': ObjectType.BOOLEAN,
+            'd': None,
+            'e': ObjectType.INTEGERS,
+        })
+
+    def test_globals_need_closed_world(self) -> None:
+        source: str = '''
+            var a = 5;
+            fun f(x) { x + a };
+            f(a);
+        '''
+        program = self._parse(source)
+        self.assertEqual(infer_types(program), 0)
+        self.assertEqual(self._identifiers(program),
+                         {'a': None, 'f': None, 'x': None})
+
+        program = self._parse(source)
+        self.assertEqual(infer_types(program, closed_world=True), 1)
+        self.assertEqual(self._identifiers(program), {
+            'a': ObjectType.INTEGERS,
+            'x': ObjectType.INTEGERS,
+        })
+
+    def test_local_functions_are_inferred_in_open_world(self) -> None:
+        source: str = '''
+            fun outer(n) {
+                fun step(i) { i + 1 };
+                step(step(1));
+            };
+            outer(1);
+        '''
+        program = self._parse(source)
+        infer_types(program)
+
+        self.assertEqual(self._identifiers(program)['i'],
+                         ObjectType.INTEGERS)
+
+    def test_parameters_of_escaping_functions(self) -> None:
+        source: str = '''
+            fun inc(x) { x + 1 };
+            fun apply(f, y) { f(y) };
+            fun double(z) { z * 2 };
+            apply(inc, 1.5) + double(2);
+        '''
+        program = self._parse(source)
+        infer_types(program, closed_world=True)
+
+        identifiers = self._identifiers(program)
+        self.assertIsNone(identifiers['x'])
+        self.assertEqual(identifiers['y'], ObjectType.FLOAT)
+        self.assertEqual(identifiers['z'], ObjectType.INTEGERS)
+
+    def test_function_literals_used_as_values_escape(self) -> None:
+        sources: List[str] = [
+            '''
+                fun outer() {
+                    var l = push(list(), fun sq(x) { return x * x; });
+                    var a = sq(2);
+                    return nth(l, 0);
+                }
+                var h = outer();
+                h(1.5)
+            ''',
+            '''
+                fun outer() {
+                    var l = push(list(), fun inc(x) { return x + 1; });
+                    var a = inc(2);
+                    return nth(l, 0);
+                }
+                var h = outer();
+                h("a")
+            ''',
+            '''
+                fun outer() { var a = 0; fun sq(x) { x * x } }
+                var h = outer();
+                h(1.5)
+            ''',
+            '''
+                fun outer() {
+                    var g = fun sq(x) { x * x };
+                    var a = sq(2);
+                    g
+                }
+                var h = outer();
+                h(1.5)
+            ''',
+        ]
+
+        for source in sources:
+            expected = evaluate(self._parse(source), Environment())
+
+            program = self._parse(source)
+            infer_types(program)
+
+            self.assertIsNone(self._identifiers(program)['x'])
+            self._test_same_object(evaluate(program, Environment()),
+                                   expected)
+            self._test_same_object(Session(2).run(source), expected)
+
+    def test_parameters_join_all_calls(self) -> None:
+        source: str = '''
+            fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+            fun half(x) { x / 2 };
+            fib(10) + half(3) + half(3.0);
+        '''
+        program = self._parse(source)
+        infer_types(program, closed_world=True)
+
+        identifiers = self._identifiers(program)
+        self.assertEqual(identifiers['n'], ObjectType.INTEGERS)
+        self.assertIsNone(identifiers['x'])
+
+    def test_same_results_with_unchecked_operators(self) -> None:
+        sources: List[str] = [
+            'var a = 7; var b = 2; a / b + a * b - -a',
+            'var a = 7.5; var b = 0.5; a / b + a * b - -a',
+            'var a = 1; var b = 0; a / b',
+            'var a = 1; var b = 1.0; a == b',
+            'var a = 1; var b = 1; a === b',
+            'var a = 2000; var b = 3000; a * b',
+            '''
+                fun fib(n) {
+                    if (n < 2) { n } else { fib(n - 1) + fib(n - 2) }
+                };
+                fib(15);
+            ''',
+            '''
+                fun count(n, acc) {
+                    if (n == 0) { return acc; }
+                    return count(n - 1, acc + 0.5);
+                };
+                count(100, 0.0);
+            ''',
+            '''
+                fun f(x) { -x };
+                f(1) + f(true);
+            ''',
+            '''
+                fun f(x) { x + 1 };
+                f(1) + f(2.5);
+            ''',
+        ]
+
+        for source in sources:
+            expected = evaluate(self._parse(source), Environment())
+
+            program = self._parse(source)
+            infer_types(program, closed_world=True)
+
+            self._test_same_object(evaluate(program, Environment()),
+                                   expected)
+            self._test_same_object(compile_program(program).run(), expected)
+
+    def test_transpiler_uses_python_operators(self) -> None:
+        source: str = '''
+            fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+            fib(10);
+        '''
+        program = self._parse(source)
+        infer_types(program, closed_world=True)
+        compiled = compile_program(program)
+
+        self.assertIn('(n_1 < 2)', compiled.source)
+        self.assertIn('(n_1 - 1)', compiled.source)
+        self.assertNotIn('_add', compiled.source)
+
+    def _identifiers(self,
+                     program: ast.Program) -> Dict[str, Optional[ObjectType]]:
+        # The inferred type of the last read of each name.
+        identifiers: Dict[str, Optional[ObjectType]] = {}
+
+        for node in ast.walk(program):
+            if isinstance(node, ast.Identifier) and node.inferred != \
+                    ObjectType.FUNCTION:
+                identifiers[node.value] = node.inferred
+
+        return identifiers
+
+    def _parse(self, source: str) -> ast.Program:
+        parser: Parser = Parser(Lexer(source))
+        program: ast.Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        Resolver().resolve(program)
+
+        return program
+
+    def _test_same_object(self,
+                          evaluated: Optional[Object],
+                          expected: Optional[Object]) -> None:
+        assert evaluated is not None and expected is not None
+        self.assertEqual(type(evaluated), type(expected))
+        self.assertEqual(evaluated.inspect(), expected.inspect())
@@ -0,0 +1,148 @@
+from typing import (
+    List,
+    Optional,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.constant_folding import fold_constants
+from frl.evaluator import evaluate
+from frl.inliner import inline_functions
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+class InlinerTest(TestCase):
+
+    def test_literal_arguments_fold_away(self) -> None:
+        source: str = '''
+            fun sq(x) { return x * x; };
+            fun area(w, h) { w * h };
+            sq(3) + area(2, 2.5);
+        '''
+        program = self._parse(source)
+
+        self.assertEqual(inline_functions(program, closed_world=True), 2)
+        self.assertEqual(fold_constants(program), 3)
+        self.assertEqual(str(program.statements[-1]), '14.0')
+
+    def test_parameters_are_substituted(self) -> None:
+        source: str = '''
+            fun sq(x) { x * x };
+            fun f(n) { sq(n) + 1 };
+            f(3);
+        '''
+        program = self._parse(source)
+
+        self.assertEqual(inline_functions(program), 0)
+        self.assertEqual(inline_functions(program, closed_world=True), 2)
+        self.assertEqual(str(program.statements[1]), 'fun f(n) ((n * n) + 1)')
+        self.assertEqual(str(program.statements[2]), '((3 * 3) + 1)')
+
+    def test_other_arguments_are_evaluated_once_in_order(self) -> None:
+        source: str = '''
+            fun sub(a, b) { b - a };
+            fun f(n) { sub(n + 1, n * 2) };
+            f(3);
+        '''
+        program = self._parse(source)
+        inline_functions(program, closed_world=True)
+
+        self.assertEqual(str(program.statements[1]),
+                         'fun f(n) if true var a = (n + 1);var b = (n * 2);'
+                         '(b - a)')
+        self.assertEqual(program.statements[1].expression.frame_size, 3)
+
+    def test_functions_that_are_not_inlined(self) -> None:
+        sources: List[str] = [
+            # Recursive.
+            'fun f(n) { if (n < 1) { 0 } else { f(n - 1) } }; f(3)',
+            # Too big.
+            'fun f(x) { x + x + x + x + x + x + x + x + x }; f(1)',
+            # More than one statement.
+            'fun f(x) { var y = x; y }; f(1)',
+            # Creates a closure.
+            'fun f(x) { fun(y) { x + y } }; f(1)(2)',
+            # Called before it is defined.
+            'fun g() { f(1) }; fun f(x) { x };',
+            # Wrong number of arguments.
+            'fun f(x) { x }; f(1, 2)',
+            # Global arguments would need global slots.
+            'var a = 1; fun f(x) { x }; f(a)',
+        ]
+
+        for source in sources:
+            program = self._parse(source)
+
+            self.assertEqual(inline_functions(program, closed_world=True), 0)
+
+    def test_same_results(self) -> None:
+        sources: List[str] = [
+            '''
+                var k = 3;
+                fun sq(x) { return x * x; };
+                fun add(a, b) { a + b + k };
+                fun f(n) { add(sq(n), sq(n + 1)) + sq(4) };
+                f(2);
+            ''',
+            '''
+                fun div(a, b) { a / b };
+                fun f(n) { div(n, n - n) };
+                f(2);
+            ''',
+            '''
+                fun first(a, b) { a };
+                fun f(n) { first(n, n / 0) };
+                f(1);
+            ''',
+            '''
+                fun f(n) {
+                    fun pick(c, a, b) { if (c) { a } else { b } };
+                    pick(n > 0, n * 2, -n);
+                };
+                f(3) + f(-3);
+            ''',
+            '''
+                fun step(n, acc) { count(n - 1, acc + 1) };
+                fun count(n, acc) {
+                    if (n == 0) { return acc; }
+                    return step(n, acc);
+                };
+                count(10000, 0);
+            ''',
+        ]
+
+        for source in sources:
+            expected = evaluate(self._parse(source), Environment())
+
+            program = self._parse(source)
+            self.assertGreater(inline_functions(program, closed_world=True), 0)
+            fold_constants(program)
+
+            self._test_same_object(evaluate(program, Environment()),
+                                   expected)
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
+
+    def _test_same_object(self,
+                          evaluated: Optional[Object],
+                          expected: Optional[Object]) -> None:
+        assert evaluated is not None and expected is not None
+        self.assertEqual(type(evaluated), type(expected))
+        self.assertEqual(evaluated.inspect(), expected.inspect())
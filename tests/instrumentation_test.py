@@ -0,0 +1,119 @@
+from typing import Counter
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.instrumentation import (
+    call_site_stats,
+    CallSiteStats,
+    profile_nodes,
+    track_allocations,
+)
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Integer,
+    new_integer,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+class InstrumentationTest(TestCase):
+
+    def test_small_integers_are_shared(self) -> None:
+        self.assertIs(new_integer(-256), new_integer(-256))
+        self.assertIs(new_integer(1024), new_integer(1024))
+        self.assertIsNot(new_integer(1025), new_integer(1025))
+        self.assertEqual(new_integer(1025).value, 1025)
+
+    def test_literals_are_built_at_load_time(self) -> None:
+        created = self._track_allocations('5; 2.5; 100000; -7; true;')
+
+        self.assertEqual(created['Integer'], 0)
+        self.assertEqual(created['Float'], 0)
+
+    def test_small_arithmetic_results_are_not_allocated(self) -> None:
+        source: str = '''
+            fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+            fib(10);
+        '''
+        created = self._track_allocations(source)
+
+        self.assertEqual(created['Integer'], 0)
+        self.assertEqual(created['Function'], 1)
+        self.assertEqual(created['Environment'], 177)
+
+    def test_large_arithmetic_results_are_allocated(self) -> None:
+        created = self._track_allocations('2000 + 1; 2000 * 2; 1.5 * 2;')
+
+        self.assertEqual(created['Integer'], 2)
+        self.assertEqual(created['Float'], 1)
+
+    def test_nested_blocks_count_once(self) -> None:
+        constructor = Integer.__init__
+
+        with track_allocations() as outer:
+            Integer(1)
+
+            with track_allocations() as inner:
+                Integer(2)
+
+        Integer(3)
+
+        self.assertEqual(outer['Integer'], 2)
+        self.assertEqual(inner['Integer'], 1)
+        self.assertIs(Integer.__init__, constructor)
+
+    def test_call_site_hit_rates(self) -> None:
+        source: str = '''
+            fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+            var add = fun(x) { fun(y) { x + y } };
+            var twice = fun(f, x) { f(f(x)) };
+            twice(add(1), 0) + twice(fun(x) { x }, 0) + fib(5);
+        '''
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+        Resolver().resolve(program)
+
+        evaluated = evaluate(program, Environment())
+
+        assert evaluated is not None
+        self.assertEqual(evaluated.inspect(), '7')
+        self.assertEqual(call_site_stats(program), [
+            CallSiteStats('fib((n - 1))', 6, 1),
+            CallSiteStats('fib((n - 2))', 6, 1),
+            CallSiteStats('f(f(x))', 0, 2),
+            CallSiteStats('f(x)', 0, 2),
+            CallSiteStats('twice(add(1), 0)', 0, 1),
+            CallSiteStats('add(1)', 0, 1),
+            CallSiteStats('twice(fun(x) x, 0)', 0, 1),
+            CallSiteStats('fib(5)', 0, 1),
+        ])
+        self.assertEqual(call_site_stats(program)[0].hit_rate, 6 / 7)
+
+    def test_profile_counts_evaluations_by_node_type(self) -> None:
+        parser: Parser = Parser(Lexer(
+            'fun f(n) { if (n < 1) { 0 } else { f(n - 1) + 1 } }; f(3)'))
+        program: Program = parser.parse_program()
+        Resolver().resolve(program)
+
+        with profile_nodes() as profile:
+            evaluate(program, Environment())
+
+        evaluations = {node.node_type: node.evaluations for node in profile}
+        self.assertEqual(evaluations['Call'], 4)
+        self.assertEqual(evaluations['If'], 4)
+        self.assertTrue(str(profile[0]).startswith(
+            f'{profile[0].node_type}: {profile[0].evaluations} evaluations, '))
+
+    def _track_allocations(self, source: str) -> 'Counter[str]':
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+        Resolver().resolve(program)
+        env: Environment = Environment()
+
+        with track_allocations() as created:
+            evaluate(program, env)
+
+        return created
@@ -65,7 +65,7 @@ class LexerTest(TestCase):
         self.assertEquals(tokens, expected_tokens)
 
     def test_delimeters(self) -> None:
-        source: str = '(){},;'
+        source: str = '(){}[],;'
         lexer: Lexer = Lexer(source)
 
         tokens: List[Token] = []
@@ -77,6 +77,8 @@ class LexerTest(TestCase):
             Token(TokenType.RPAREN, ')'),
             Token(TokenType.LBRACE, '{'),
             Token(TokenType.RBRACE, '}'),
+            Token(TokenType.LBRACKET, '['),
+            Token(TokenType.RBRACKET, ']'),
             Token(TokenType.COMMA, ','),
             Token(TokenType.SEMICOLON, ';'),
         ]
@@ -331,3 +333,23 @@ class LexerTest(TestCase):
         ]
 
         self.assertEquals(tokens, expected_tokens)
+
+    def test_string(self) -> None:
+        source: str = 'var s = "hola\\n \\"mundo\\""; "sin cerrar'
+        lexer: Lexer = Lexer(source)
+
+        tokens: List[Token] = []
+
+        for i in range(6):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.LET, 'var'),
+            Token(TokenType.IDENT, 's'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.STRING, 'hola\n "mundo"'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.ILLEGAL, '"sin cerrar'),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
@@ -0,0 +1,174 @@
+from typing import (
+    cast,
+    List,
+    Optional,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.machine import Machine
+from frl.object import (
+    Environment,
+    Integer,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+class MachineTest(TestCase):
+
+    def test_same_results_as_evaluator(self) -> None:
+        sources: List[str] = [
+            '5',
+            '-12.5',
+            '!!true',
+            '2 * (5 + 10) / 3',
+            '1 === 1.0',
+            '5 + true; 9;',
+            'if (1 > 2) { 10 }',
+            'if (1 < 2) { 10 } else { 20 }',
+            '9; return 2 * 5; 9;',
+            'if (10 > 1) { if (20 > 10) { return 1; } return 0; }',
+            'var a = 5; var b = a; var c = a + b + 5; c;',
+            'var a = 1;',
+            'fun(x) { x + 2; };',
+            'fun f(x) { x }; f(1, 2)',
+            'var x = 5; x(1)',
+            'f(); fun f() { 1 }',
+            'fun five() { }; five();',
+            'var add = fun(x, y) { x + y }; add(5, add(5, 5));',
+            '''
+                var new_adder = fun(x) { fun(y) { x + y } };
+                new_adder(2)(3);
+            ''',
+            '''
+                fun fact(n) {
+                    if (n < 2) { return 1; }
+                    return n * fact(n - 1);
+                };
+                fact(10);
+            ''',
+            '''
+                fun f(n) {
+                    if (n == 0) { return 1 / 0; }
+                    return 1 + f(n - 1);
+                };
+                f(3);
+            ''',
+            '''
+                fun count(n, acc) {
+                    if (n == 0) { return acc; }
+                    count(n - 1, acc + 1);
+                };
+                count(100, 0) + 1;
+            ''',
+            'fun f() { var x = if (true) { return 1; }; 5 }; f()',
+            'fun f() { 2 + if (true) { return 1; } }; f()',
+            'fun f() { -if (true) { return 1; } }; f()',
+            'fun f() { [if (true) { return 1; }] }; f()',
+            'fun f() { if (true) { return 1; }[0] }; f()',
+            'fun f(x) { g(if (x) { return 1; }, 2) }; fun g(a, b) { b }; f(1)',
+            'fun f() { return if (true) { return 1; } else { 2 }; }; f()',
+            '''
+                fun g(n) { n };
+                fun f() { var x = if (true) { return g(1); }; x + 1 };
+                f();
+            ''',
+            '''
+                fun f(a) { a * 2 + if (a > 3) { return 100; } else { 1 } };
+                f(2) + f(5);
+            ''',
+        ]
+
+        for source in sources:
+            expected = evaluate(*self._prepare(source))
+            machine = Machine(*self._prepare(source))
+
+            self.assertTrue(machine.run())
+            self._test_same_object(machine.result, expected)
+
+    def test_deep_recursion(self) -> None:
+        source: str = '''
+            fun sum(n) {
+                if (n == 0) { return 0; }
+                return n + sum(n - 1);
+            };
+            sum(20000);
+        '''
+        machine = Machine(*self._prepare(source))
+
+        self.assertTrue(machine.run())
+        self._test_integer_object(machine.result, 200010000)
+
+    def test_deeply_nested_expression(self) -> None:
+        for size in (900, 20000):
+            source: str = ' + '.join(['1'] * size)
+            machine = Machine(*self._prepare(source))
+
+            self.assertTrue(machine.run())
+            self._test_integer_object(machine.result, size)
+
+    def test_constant_stack_for_tail_calls(self) -> None:
+        source: str = '''
+            fun count(n, acc) {
+                if (n == 0) { return acc; }
+                return count(n - 1, acc + 1);
+            };
+            count(1000, 0);
+        '''
+        machine = Machine(*self._prepare(source))
+
+        depth: int = 0
+        while not machine.step():
+            depth = max(depth, machine.pending)
+
+        self._test_integer_object(machine.result, 1000)
+        self.assertLess(depth, 20)
+
+    def test_pause_and_resume(self) -> None:
+        source: str = '''
+            fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+            fib(10);
+        '''
+        machine = Machine(*self._prepare(source))
+
+        self.assertFalse(machine.run(max_steps=50))
+        self.assertIsNone(machine.result)
+        self.assertEqual(machine.steps, 50)
+
+        while not machine.run(max_steps=50):
+            pass
+
+        self._test_integer_object(machine.result, 55)
+
+    def _prepare(self, source: str) -> tuple:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        Resolver().resolve(program)
+
+        return program, Environment()
+
+    def _test_integer_object(self,
+                             evaluated: Optional[Object],
+                             expected: int) -> None:
+        self.assertIsInstance(evaluated, Integer)
+
+        evaluated = cast(Integer, evaluated)
+        self.assertEqual(evaluated.value, expected)
+
+    def _test_same_object(self,
+                          evaluated: Optional[Object],
+                          expected: Optional[Object]) -> None:
+        if expected is None:
+            self.assertIsNone(evaluated)
+            return
+
+        assert evaluated is not None
+        self.assertEqual(type(evaluated), type(expected))
+        self.assertEqual(evaluated.inspect(), expected.inspect())
@@ -0,0 +1,106 @@
+from typing import (
+    cast,
+    List,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.memoization import (
+    cache_stats,
+    CacheStats,
+    memoize,
+    ResultCache,
+)
+from frl.object import (
+    Environment,
+    Integer,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+class MemoizationTest(TestCase):
+
+    def test_memoized_recursion(self) -> None:
+        source: str = '''
+            fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+            fib(80);
+        '''
+        evaluated, stats = self._evaluate_tests(source)
+
+        self._test_integer_object(evaluated, 23416728348467685)
+        self.assertEqual(stats, [CacheStats('fib', 78, 81, 0, 81)])
+
+    def test_keys_include_argument_types(self) -> None:
+        source: str = '''
+            var half = fun(x) { x / 2 };
+            half(3) + half(3.0) + half(3);
+        '''
+        evaluated, stats = self._evaluate_tests(source)
+
+        self.assertEqual(evaluated.inspect(), '3.5')
+        self.assertEqual(stats, [CacheStats('half', 1, 2, 0, 2)])
+
+    def test_tail_calls_fill_the_cache(self) -> None:
+        source: str = '''
+            fun count(n, acc) {
+                if (n == 0) { return acc; }
+                return count(n - 1, acc + 1);
+            };
+            count(10, 0) + count(9, 1);
+        '''
+        evaluated, stats = self._evaluate_tests(source)
+
+        self._test_integer_object(evaluated, 20)
+        self.assertEqual(stats, [CacheStats('count', 1, 11, 0, 11)])
+
+    def test_impure_functions_are_not_cached(self) -> None:
+        source: str = '''
+            var offset = 1;
+            fun shifted(x) { x + offset };
+            var a = shifted(1);
+            var offset = 2;
+            a + shifted(1);
+        '''
+        evaluated, stats = self._evaluate_tests(source)
+
+        self._test_integer_object(evaluated, 5)
+        self.assertEqual(stats, [])
+
+    def test_least_recently_used_eviction(self) -> None:
+        cache = ResultCache(max_size=2)
+        one, two, three = Integer(1), Integer(2), Integer(3)
+
+        cache.put(1, one)
+        cache.put(2, two)
+        self.assertIs(cache.get(1), one)
+
+        cache.put(3, three)
+
+        self.assertIsNone(cache.get(2))
+        self.assertIs(cache.get(1), one)
+        self.assertIs(cache.get(3), three)
+        self.assertEqual((cache.hits, cache.misses, cache.evictions),
+                         (3, 1, 1))
+
+    def _evaluate_tests(self,
+                        source: str) -> Tuple[Object, List[CacheStats]]:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+        Resolver().resolve(program)
+        memoize(program)
+
+        evaluated = evaluate(program, Environment())
+
+        assert evaluated is not None
+        return evaluated, cache_stats(program)
+
+    def _test_integer_object(self, evaluated: Object, expected: int) -> None:
+        self.assertIsInstance(evaluated, Integer)
+
+        evaluated = cast(Integer, evaluated)
+        self.assertEqual(evaluated.value, expected)
@@ -0,0 +1,149 @@
+from typing import (
+    Dict,
+    Hashable,
+    List,
+)
+from unittest import TestCase
+
+from frl.object import (
+    Boolean,
+    Float,
+    map_key,
+    new_integer,
+    PersistentList,
+    PersistentMap,
+    String,
+)
+
+
+class _Key:
+    # Key with a chosen hash, to force collisions.
+
+    def __init__(self, value: int, hash_: int) -> None:
+        self.value = value
+        self.hash = hash_
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Key) and self.value == other.value
+
+    def __hash__(self) -> int:
+        return self.hash
+
+
+class ObjectTest(TestCase):
+
+    def test_persistent_list(self) -> None:
+        values = PersistentList()
+        expected: List[int] = []
+        versions = []
+
+        # Enough elements for three levels of trie.
+        for value in range(40000):
+            values = values.push(new_integer(value))
+            expected.append(value)
+
+            if value % 1000 == 0:
+                versions.append((values, list(expected)))
+
+        for index in range(0, 40000, 7):
+            values = values.set(index, new_integer(-index))
+            expected[index] = -index
+
+        self.assertEqual(values.count, len(expected))
+        self.assertEqual([value.value for value in values], expected)
+        self.assertEqual([values.get(index).value for index in range(40000)],
+                         expected)
+
+        # Older versions are not changed by the updates.
+        for version, version_values in versions:
+            self.assertEqual([value.value for value in version],
+                             version_values)
+
+    def test_persistent_list_shares_structure(self) -> None:
+        values = PersistentList()
+        for value in range(2000):
+            values = values.push(new_integer(value))
+
+        updated = values.set(5, new_integer(-5))
+
+        self.assertIsNot(updated.root, values.root)
+        self.assertIs(updated.root[1], values.root[1])
+        self.assertIs(updated.tail, values.tail)
+
+    def test_persistent_map(self) -> None:
+        entries = PersistentMap()
+        expected: Dict[Hashable, int] = {}
+        versions = []
+
+        for index in range(20000):
+            key = new_integer(index * 7919 % 30011)
+            entries = entries.put(map_key(key), key, new_integer(index))
+            expected[map_key(key)] = index
+
+            if index % 1000 == 0:
+                versions.append((entries, dict(expected)))
+
+        self.assertEqual(entries.count, len(expected))
+        for key, value in expected.items():
+            self.assertEqual(entries.get(key).value, value)
+
+        for version, version_entries in versions:
+            self.assertEqual(version.count, len(version_entries))
+            for key, value in version_entries.items():
+                self.assertEqual(version.get(key).value, value)
+
+        self.assertIsNone(entries.get(map_key(new_integer(-1))))
+
+    def test_persistent_map_collisions(self) -> None:
+        # Keys 0 to 4 have the same hash; key 10 only the same low 32 bits.
+        keys = [_Key(value, 42 if value < 5 else 42 | (value << 20))
+                for value in range(10)] + [_Key(10, 42 + (1 << 32))]
+
+        entries = PersistentMap()
+        for key in keys:
+            entries = entries.put(key, new_integer(key.value),
+                                  new_integer(key.value))
+        entries = entries.put(_Key(3, 42), new_integer(3), new_integer(33))
+
+        self.assertEqual(entries.count, 11)
+        self.assertEqual([entries.get(key).value for key in keys],
+                         [0, 1, 2, 33, 4, 5, 6, 7, 8, 9, 10])
+        self.assertIsNone(entries.get(_Key(99, 42)))
+
+    def test_map_keys(self) -> None:
+        self.assertEqual(map_key(new_integer(1)), map_key(Float(1.0)))
+        self.assertNotEqual(map_key(new_integer(1)), map_key(Boolean(True)))
+        self.assertIsNone(map_key(PersistentList()))
+
+        entries = PersistentMap().put(map_key(Boolean(True)),
+                                      Boolean(True),
+                                      new_integer(1))
+        self.assertEqual(entries.inspect(), 'map(true: 1)')
+
+    def test_string_concatenation(self) -> None:
+        text = String()
+        pieces: List[str] = []
+
+        # Deep enough that any recursion over the rope would fail.
+        for index in range(100000):
+            piece = f'{index % 10}' * 70
+            text = text.concat(String(piece))
+            pieces.append(piece)
+
+        expected = ''.join(pieces)
+
+        self.assertEqual(text.length, len(expected))
+        self.assertEqual(text.char_at(0), expected[0])
+        self.assertEqual(text.char_at(123457), expected[123457])
+        self.assertEqual(text.char_at(len(expected) - 1), expected[-1])
+        self.assertLessEqual(text._depth, 2 * text.length.bit_length())
+        self.assertEqual(text.value, expected)
+        self.assertEqual(text._depth, 0)
+
+    def test_short_strings_are_flattened(self) -> None:
+        text = String('ab').concat(String('cd')).concat(String())
+
+        self.assertEqual(text.inspect(), 'abcd')
+        self.assertEqual(text._depth, 0)
+        self.assertEqual(map_key(text), map_key(String('abcd')))
+        self.assertNotEqual(map_key(String('1')), map_key(new_integer(1)))
@@ -19,12 +19,15 @@ from frl.ast import (
     Function,
     Identifier,
     If,
+    Index,
     Infix,
     Integer,
     LetStatement,
     Prefix,
     Program,
     ReturnStatement,
+    String,
+    Vector,
 )
 
 
@@ -315,6 +318,9 @@ class ParserTest(TestCase):
              'suma(a, b, 1, (2 * 3), (4 + 5), suma(6, (7 * 8)))', 1),
             ('suma(a + b + c * d / f + g);',
              'suma((((a + b) + ((c * d) / f)) + g))', 1),
+            ('a * [1, 2][b * c] * d;', '((a * ([1, 2][(b * c)])) * d)', 1),
+            ('-a[1] + f(b)[2];', '((-(a[1])) + (f(b)[2]))', 1),
+            ('[a * b, [c][0]];', '[(a * b), ([c][0])]', 1),
         ]
 
         for source, expected_result, expected_statement_count in test_sources:
@@ -348,6 +354,61 @@ class ParserTest(TestCase):
         self._test_infix_expression(call.arguments[1], 2, '*', 3)
         self._test_infix_expression(call.arguments[2], 4, '+', 5)
 
+    def test_vector_expression(self) -> None:
+        source: str = '[1, 2 * 3, 4 + 5]; [];'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program, 2)
+
+        vector = cast(Vector, cast(ExpressionStatement,
+                                   program.statements[0]).expression)
+        self.assertIsInstance(vector, Vector)
+
+        assert vector.elements is not None
+        self.assertEquals(len(vector.elements), 3)
+        self._test_literal_expression(vector.elements[0], 1)
+        self._test_infix_expression(vector.elements[1], 2, '*', 3)
+        self._test_infix_expression(vector.elements[2], 4, '+', 5)
+
+        empty = cast(Vector, cast(ExpressionStatement,
+                                  program.statements[1]).expression)
+        self.assertEquals(empty.elements, [])
+
+    def test_string_literal(self) -> None:
+        source: str = '"hola \\"mundo\\"";'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program)
+
+        string = cast(String, cast(ExpressionStatement,
+                                   program.statements[0]).expression)
+        self.assertIsInstance(string, String)
+        self.assertEquals(string.value, 'hola "mundo"')
+        self.assertEquals(str(string), '"hola \\"mundo\\""')
+
+    def test_index_expression(self) -> None:
+        source: str = 'values[1 + 1];'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program)
+
+        index = cast(Index, cast(ExpressionStatement,
+                                 program.statements[0]).expression)
+        self.assertIsInstance(index, Index)
+        self._test_identifier(index.left, 'values')
+
+        assert index.index is not None
+        self._test_infix_expression(index.index, 1, '+', 1)
+
     def test_if_expression(self) -> None:
         source: str = 'if (x < y) { z }'
         lexer: Lexer = Lexer(source)
@@ -460,6 +521,8 @@ class ParserTest(TestCase):
 
             program: Program = parser.parse_program()
 
+            self.assertEqual(len(parser.errors), 0)
+
             function = cast(Function, cast(ExpressionStatement,
                                            program.statements[0]).expression)
 
@@ -0,0 +1,97 @@
+from typing import List
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.lexer import Lexer
+from frl.parser import Parser
+from frl.pipeline import (
+    OptimizationPass,
+    optimization_pipeline,
+    Pipeline,
+)
+from frl.resolver import Resolver
+
+
+CORPUS: List[str] = [
+    'fun sq(x) { x * x }; fun f(n) { sq(n) + sq(n + 1) }; f(3)',
+    'fun f(a, b) { var s = a * b + 1; s * (a * b + 1) }; f(2, 2.5)',
+    'fun f(n) { if (n < 1) { return 0; } 2 * 3; f(n - 1) + n }; f(10)',
+    'fun f(x) { x / 0 }; f(1)',
+    'var a = 2; fun f(x) { x * a }; f(4) + f(1.5)',
+    'fun f(x) { if (true) { x } else { -x } }; f(7) == 7',
+]
+
+
+class PipelineTest(TestCase):
+
+    def test_levels(self) -> None:
+        self.assertEqual([optimization.name for optimization
+                          in optimization_pipeline(0).passes], [])
+        self.assertEqual([optimization.name for optimization
+                          in optimization_pipeline(1).passes],
+                         ['fold', 'dead-code', 'tier'])
+        self.assertEqual([optimization.name for optimization
+                          in optimization_pipeline(2).passes],
+                         ['inline', 'fold', 'cse', 'dead-code',
+                          'infer-types', 'tier'])
+        self.assertEqual([optimization.name for optimization
+                          in optimization_pipeline(
+                              1, type_feedback=True).passes],
+                         ['fold', 'dead-code', 'type-feedback', 'tier'])
+
+        with self.assertRaises(ValueError):
+            optimization_pipeline(3)
+
+    def test_stats(self) -> None:
+        program = self._parse('fun f() { 1; 2 + 3 }; f()')
+        stats = optimization_pipeline(1).run(program)
+
+        self.assertEqual([(pass_stats.name,
+                           pass_stats.nodes_before,
+                           pass_stats.nodes_after,
+                           pass_stats.changes)
+                          for pass_stats in stats],
+                         [('fold', 14, 12, 1),
+                          ('dead-code', 12, 10, 1),
+                          ('tier', 10, 10, 1)])
+        self.assertTrue(str(stats[0]).startswith('fold: '))
+        self.assertTrue(str(stats[0]).endswith(
+            ' ms, 1 changes, 14 -> 12 nodes (-2)'))
+        self.assertEqual(str(program), 'fun f() 5f()')
+
+    def test_presets_preserve_results(self) -> None:
+        for level in (1, 2):
+            for closed_world in (False, True):
+                pipeline = optimization_pipeline(level, closed_world)
+
+                self.assertEqual(pipeline.verify(CORPUS), [])
+
+        pipeline = optimization_pipeline(2, type_feedback=True)
+        self.assertEqual(pipeline.verify(CORPUS), [])
+
+    def test_verification_finds_the_wrong_pass(self) -> None:
+        def drop_last_statement(program: Program) -> int:
+            program.statements = program.statements[:-1]
+
+            return 1
+
+        pipeline = Pipeline([*optimization_pipeline(1).passes,
+                             OptimizationPass('broken', drop_last_statement)])
+        failures = pipeline.verify(CORPUS[:1])
+
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0].name, 'broken')
+        self.assertEqual(failures[0].expected, 'INTEGERS 25')
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
@@ -0,0 +1,67 @@
+from typing import (
+    List,
+    Set,
+)
+from unittest import TestCase
+
+from frl.ast import (
+    Function,
+    Program,
+    walk,
+)
+from frl.lexer import Lexer
+from frl.parser import Parser
+from frl.purity import find_pure_functions
+from frl.resolver import Resolver
+
+
+class PurityTest(TestCase):
+
+    def test_pure_functions(self) -> None:
+        source: str = '''
+            fun square(x) { x * x };
+            fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+            var twice = fun(x) { var y = square(x); y + y };
+            fun is_even(n) { if (n == 0) { true } else { is_odd(n - 1) } };
+            fun is_odd(n) { if (n == 0) { false } else { is_even(n - 1) } };
+        '''
+
+        self.assertEqual(self._pure_functions(source),
+                         {'square', 'fib', 'twice', 'is_even', 'is_odd'})
+
+    def test_impure_functions(self) -> None:
+        source: str = '''
+            var offset = 10;
+            fun shifted(x) { x + offset };
+            fun adder(x) { fun(y) { x + y } };
+            fun uses_shifted(x) { shifted(x) };
+            fun rebound(x) { x };
+            var rebound = 5;
+            fun uses_rebound(x) { rebound(x) };
+            fun apply(f, x) { f(x) };
+        '''
+
+        self.assertEqual(self._pure_functions(source), {'rebound', 'apply'})
+
+    def _pure_functions(self, source: str) -> Set[str]:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(parser.errors), 0)
+        self.assertEqual(len(resolver.errors), 0)
+
+        names: List[str] = []
+        pure = find_pure_functions(program)
+        for node in walk(program):
+            if isinstance(node, Function) and node in pure:
+                names.append(self._name(program, node))
+
+        return set(names)
+
+    def _name(self, program: Program, function: Function) -> str:
+        if function.ident is not None:
+            return function.ident.value
+
+        return str(program).split(' = ' + str(function))[0].split(' ')[-1]
@@ -0,0 +1,58 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import List
+from unittest import TestCase
+
+from frl.repl import evaluate_line
+from frl.session import (
+    Session,
+    STAGES,
+)
+
+
+class ReplTest(TestCase):
+
+    def setUp(self) -> None:
+        self.session = Session()
+        self._output('fun f(n) { if (n < 1) { 0 } else { f(n - 1) + 1 } };')
+
+    def test_plain_line(self) -> None:
+        self.assertEqual(self._output('f(3)'), ['3'])
+        self.assertEqual(self._output('g(3)'), ['Identifier not found: g'])
+
+    def test_time(self) -> None:
+        lines = self._output(':time f(3)')
+
+        self.assertEqual(lines[0], '3')
+        for stage in STAGES:
+            self.assertTrue(any(line.startswith(stage) for line in lines))
+        self.assertTrue(lines[-1].startswith('total'))
+
+    def test_profile(self) -> None:
+        lines = self._output(':profile f(3)')
+
+        self.assertEqual(lines[0], '3')
+        self.assertTrue(any(line.startswith('Call: 4 evaluations')
+                            for line in lines))
+        self.assertTrue(any(line.startswith('If: 4 evaluations')
+                            for line in lines))
+
+    def test_mem(self) -> None:
+        lines = self._output(':mem fold(stream_range(0, 100), list(), '
+                             'fun(l, x) { push(l, x) })')
+
+        self.assertTrue(lines[0].startswith('list(0, 1, 2'))
+        self.assertTrue(lines[1].startswith('peak '))
+        self.assertIn('PersistentList: 101', lines)
+
+    def test_unknown_command(self) -> None:
+        self.assertEqual(
+            self._output(':trace f(3)'),
+            ['Unknown command: :trace, expected one of :time, :profile, :mem'])
+
+    def _output(self, source: str) -> List[str]:
+        output = StringIO()
+        with redirect_stdout(output):
+            evaluate_line(self.session, source)
+
+        return output.getvalue().splitlines()
@@ -0,0 +1,169 @@
+from typing import (
+    cast,
+    List,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.ast import (
+    Call,
+    ExpressionStatement,
+    Function,
+    Identifier,
+    If,
+    Infix,
+    LetStatement,
+    Program,
+    ReturnStatement,
+)
+from frl.lexer import Lexer
+from frl.parser import Parser
+from frl.resolver import Resolver
+
+
+class ResolverTest(TestCase):
+
+    def test_global_slots(self) -> None:
+        program, resolver = self._resolve('var a = 1; var b = 2; var a = 3;')
+
+        self.assertEqual(len(resolver.errors), 0)
+        self.assertEqual(program.frame_size, 2)
+
+        slots: List[Tuple[int, int]] = []
+        for statement in program.statements:
+            name = cast(LetStatement, statement).name
+            assert name is not None
+            slots.append((name.depth, name.slot))
+
+        self.assertEqual(slots, [(0, 0), (0, 1), (0, 0)])
+
+    def test_function_slots(self) -> None:
+        source: str = '''
+            var a = 1;
+            var f = fun(x, y) {
+                var z = x + y;
+                fun(w) { a + z + w };
+            };
+        '''
+        program, resolver = self._resolve(source)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        outer = cast(Function, cast(LetStatement, program.statements[1]).value)
+        self.assertEqual(outer.frame_size, 3)
+
+        assert outer.body is not None
+        inner = cast(Function, cast(ExpressionStatement,
+                                    outer.body.statements[1]).expression)
+        self.assertEqual(inner.frame_size, 1)
+
+        assert inner.body is not None
+        body = cast(ExpressionStatement, inner.body.statements[0]).expression
+        body = cast(Infix, body)
+        left = cast(Infix, body.left)
+
+        self._test_address(left.left, 2, 0)
+        self._test_address(left.right, 1, 2)
+        self._test_address(body.right, 0, 0)
+
+    def test_hoisted_functions(self) -> None:
+        source: str = '''
+            fun first() { second() };
+            fun second() { 1 };
+        '''
+        program, resolver = self._resolve(source)
+
+        self.assertEqual(len(resolver.errors), 0)
+        self.assertEqual(program.frame_size, 2)
+
+    def test_identifier_not_found(self) -> None:
+        _, resolver = self._resolve('var a = 1; fun(x) { x + b };')
+
+        self.assertEqual(resolver.errors, ['Identifier not found: b'])
+
+    def test_globals_persist_between_programs(self) -> None:
+        resolver: Resolver = Resolver()
+
+        first = Parser(Lexer('var a = 1;')).parse_program()
+        resolver.resolve(first)
+        second = Parser(Lexer('var b = a;')).parse_program()
+        resolver.resolve(second)
+
+        self.assertEqual(len(resolver.errors), 0)
+        self.assertEqual(second.frame_size, 2)
+
+        value = cast(LetStatement, second.statements[0]).value
+        self._test_address(cast(Identifier, value), 0, 0)
+
+    def test_tail_positions(self) -> None:
+        source: str = '''
+            fun f(n) {
+                if (n == 0) { return g(n); }
+                var x = g(n) + 1;
+                if (x > 1) { f(n - 1) } else { g(x) };
+            };
+            fun g(n) { n };
+            g(1);
+        '''
+        program, resolver = self._resolve(source)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        function = cast(Function, cast(ExpressionStatement,
+                                       program.statements[0]).expression)
+        assert function.body is not None
+        statements = function.body.statements
+
+        first_if = cast(If,
+                        cast(ExpressionStatement, statements[0]).expression)
+        assert first_if.consequence is not None
+        returned = cast(ReturnStatement, first_if.consequence.statements[0])
+        self.assertTrue(cast(Call, returned.return_value).tail)
+
+        let_value = cast(Infix, cast(LetStatement, statements[1]).value)
+        self.assertFalse(cast(Call, let_value.left).tail)
+
+        last_if = cast(If, cast(ExpressionStatement, statements[2]).expression)
+        for block in (last_if.consequence, last_if.alternative):
+            assert block is not None
+            call = cast(ExpressionStatement, block.statements[0]).expression
+            self.assertTrue(cast(Call, call).tail)
+
+        global_call = cast(ExpressionStatement, program.statements[2])
+        self.assertFalse(cast(Call, global_call.expression).tail)
+
+    def test_deeply_nested_expression(self) -> None:
+        # Left-associative operators parse in a loop, so the nesting only
+        # shows up from the resolver on.
+        source: str = 'fun f(x) { ' + ' + '.join(['x'] * 20000) + ' }; f(1)'
+        program, resolver = self._resolve(source)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        function = cast(Function, cast(ExpressionStatement,
+                                       program.statements[0]).expression)
+        assert function.body is not None
+        sum_ = cast(ExpressionStatement, function.body.statements[0])
+
+        infix = cast(Infix, sum_.expression)
+        while type(infix.left) == Infix:
+            infix = cast(Infix, infix.left)
+
+        self._test_address(infix.left, 0, 0)
+
+    def _resolve(self, source: str) -> Tuple[Program, Resolver]:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        return program, resolver
+
+    def _test_address(self, expression, depth: int, slot: int) -> None:
+        self.assertIsInstance(expression, Identifier)
+
+        identifier = cast(Identifier, expression)
+        self.assertEqual((identifier.depth, identifier.slot), (depth, slot))
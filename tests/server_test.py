@@ -0,0 +1,193 @@
+import asyncio
+import os
+from os.path import join
+from tempfile import TemporaryDirectory
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+from unittest import TestCase
+from unittest.mock import patch
+
+from frl.client import EvaluationClient
+from frl.server import (
+    DEFAULT_HOST,
+    EvaluationServer,
+    percentile,
+)
+
+
+def _crash(source: str, optimization_level: int) -> None:
+    # Run in a worker instead of frl.batch.run_program.
+    os._exit(1)
+
+
+SOURCES = [
+    'fun f(n) { if (n < 2) { n } else { f(n - 1) + f(n - 2) } }; f(12)',
+    '1 / 0',
+    'a',
+    '"uno" + "dos"',
+]
+
+
+class ServerTest(TestCase):
+
+    def test_pipelined_requests(self) -> None:
+        for unix in (False, True):
+            with TemporaryDirectory() as directory:
+                path = join(directory, 'frl.sock') if unix else None
+                responses, stats = asyncio.run(self._evaluate(SOURCES * 5,
+                                                              path))
+
+            self.assertEqual([(response['type'],
+                               response['value'],
+                               response['errors'])
+                              for response in responses[:4]], [
+                ('INTEGERS', '144', []),
+                ('ERROR', 'Error: Division by zero', []),
+                (None, None, ['Identifier not found: a']),
+                ('STRING', 'unodos', []),
+            ])
+            self.assertEqual(responses[4:], responses[:4] * 4)
+
+            self.assertEqual(stats['pending'], 0)
+            self.assertEqual(stats['completed'], 20)
+            self.assertGreater(stats['latency_ms']['p99'], 0)
+            self.assertLessEqual(stats['latency_ms']['p50'],
+                                 stats['latency_ms']['p99'])
+
+    def test_invalid_requests(self) -> None:
+        async def request() -> None:
+            server = EvaluationServer(workers=1)
+            await server.start(port=0)
+            reader, writer = await asyncio.open_connection(
+                *server.address[:2])
+
+            try:
+                writer.write(b'not json\n[1]\n{"id": 7, "sauce": "1"}\n')
+                await writer.drain()
+
+                lines = [await reader.readline() for _ in range(3)]
+            finally:
+                writer.close()
+                await server.close()
+
+            self.assertEqual(lines, [
+                b'{"id": null, "error": "Invalid JSON"}\n',
+                b'{"id": null, "error": "Expected an object"}\n',
+                b'{"id": 7, "error": "Expected a source or a command"}\n',
+            ])
+
+        asyncio.run(request())
+
+    def test_long_lines(self) -> None:
+        async def request() -> List[Any]:
+            server = EvaluationServer(workers=1, line_limit=1024)
+            await server.start(port=0)
+            answers: List[Any] = []
+
+            try:
+                client = await EvaluationClient.connect(
+                    port=server.address[1], line_limit=1024)
+
+                for source in ('1 +' * 1000 + ' 1',
+                               'fun f(s, n) { if (n == 0) { s } else '
+                               '{ f(s + s, n - 1) } }; f("ab", 10)',
+                               '1 + 1'):
+                    try:
+                        response = await client.evaluate(source)
+                        answers.append(response['value'])
+                    except ValueError as error:
+                        answers.append(str(error))
+
+                await client.close()
+            finally:
+                await server.close()
+
+            return answers
+
+        self.assertEqual(asyncio.run(request()),
+                         ['Request too long', 'Response too long', '2'])
+
+    def test_stopped_worker(self) -> None:
+        async def request() -> List[Any]:
+            server = EvaluationServer(workers=1)
+            await server.start(port=0)
+            answers: List[Any] = []
+
+            try:
+                client = await EvaluationClient.connect(port=server.address[1])
+
+                with patch('frl.server.run_program', _crash):
+                    with self.assertRaises(ValueError) as error:
+                        await client.evaluate('1 + 1')
+                answers.append(str(error.exception))
+
+                # On a new pool.
+                answers.append((await client.evaluate('1 + 1'))['value'])
+                await client.close()
+            finally:
+                await server.close()
+
+            return answers
+
+        self.assertEqual(asyncio.run(request()), ['Worker stopped', '2'])
+
+    def test_unreadable_answers_fail_every_request(self) -> None:
+        async def answer(reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+            await reader.readline()
+            writer.write(b'not json\n')
+            await writer.drain()
+            await reader.read()
+            writer.close()
+
+        async def request() -> None:
+            server = await asyncio.start_server(answer, DEFAULT_HOST, 0)
+            client = await EvaluationClient.connect(
+                port=server.sockets[0].getsockname()[1])
+
+            try:
+                with self.assertRaises(ConnectionError):
+                    await client.evaluate_all(['1', '2'])
+                with self.assertRaises(ConnectionError):
+                    await client.evaluate('3')
+                with self.assertRaises(ValueError):
+                    await client.close()
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(request())
+
+    def test_percentile(self) -> None:
+        values = [float(value) for value in range(1, 101)]
+
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+
+    async def _evaluate(self,
+                        sources: List[str],
+                        path: Optional[str]) -> Any:
+        server = EvaluationServer(workers=2)
+        await server.start(path, port=0)
+
+        try:
+            client = await (EvaluationClient.connect(path) if path else
+                            EvaluationClient.connect(port=server.address[1]))
+            responses: List[Dict[str, Any]] = \
+                await client.evaluate_all(sources)
+            stats = await client.stats()
+            await client.close()
+        finally:
+            await server.close()
+
+        # Without the time of evaluation, which changes every time.
+        return [{key: value for key, value in response.items()
+                 if key not in ('id', 'time')}
+                for response in responses], stats
@@ -0,0 +1,93 @@
+from typing import Optional
+from unittest import TestCase
+
+from frl.object import (
+    Function,
+    Object,
+    ObjectType,
+)
+from frl.pipeline import OPTIMIZATION_LEVELS
+from frl.session import Session
+
+
+class SessionTest(TestCase):
+
+    def test_declarations_persist_between_inputs(self) -> None:
+        for level in OPTIMIZATION_LEVELS:
+            session = Session(level)
+
+            self.assertIsNone(session.run('var a = 2;'))
+            session.run('fun f(x) { x * a }')
+            session.run('fun g(x) { f(x) + 1 }')
+
+            self._test_object(session.run('g(3)'), ObjectType.INTEGERS, '7')
+
+            # Globals are never trusted by the optimizations, so a new
+            # declaration is seen by the functions already defined.
+            session.run('fun f(x) { x - a }')
+            self._test_object(session.run('g(3)'), ObjectType.INTEGERS, '2')
+
+    def test_errors_do_not_end_the_session(self) -> None:
+        session = Session()
+        session.run('var a = 1;')
+
+        self.assertIsNone(session.run('var b = ;'))
+        self.assertEqual(session.errors, ["No function found for parse ';'"])
+
+        self.assertIsNone(session.run('a + c'))
+        self.assertEqual(session.errors, ['Identifier not found: c'])
+
+        self._test_object(session.run('var d = 2; 1 / 0'),
+                          ObjectType.ERROR,
+                          'Error: Division by zero')
+        self.assertEqual(session.errors, [])
+
+        self._test_object(session.run('a + d'), ObjectType.INTEGERS, '3')
+
+    def test_functions_are_kept(self) -> None:
+        session = Session()
+        session.run('fun f(x) { x + 1 };')
+
+        function = session.env.store[0]
+        assert isinstance(function, Function)
+
+        for _ in range(3):
+            self._test_object(session.run('f(1)'), ObjectType.INTEGERS, '2')
+
+        self.assertIs(session.env.store[0], function)
+        self.assertEqual(function.calls, 3)
+
+    def test_hot_functions_are_compiled(self) -> None:
+        for level in OPTIMIZATION_LEVELS:
+            session = Session(level)
+            session.run('fun f(n, s) { if (n == 0) { return s; } '
+                        'f(n - 1, s + n * 2) }')
+
+            function = session.env.store[0]
+            assert isinstance(function, Function)
+
+            self._test_object(session.run('f(500, 0)'),
+                              ObjectType.INTEGERS,
+                              '250500')
+
+            tier = function.node.tier
+            if level == 0:
+                self.assertIsNone(tier)
+            else:
+                assert tier is not None
+                self.assertIsNotNone(tier.compiled)
+                self.assertEqual(tier.unboxed, level == 2)
+
+    def test_declarations_hide_builtins(self) -> None:
+        session = Session()
+        session.run('var sum = fun(v) { 7 };')
+
+        self._test_object(session.run('sum([1])'), ObjectType.INTEGERS, '7')
+
+    def _test_object(self,
+                     evaluated: Optional[Object],
+                     expected_type: ObjectType,
+                     expected: str) -> None:
+        assert evaluated is not None
+        self.assertEqual(evaluated.type(), expected_type)
+        self.assertEqual(evaluated.inspect(), expected)
@@ -0,0 +1,142 @@
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.inference import infer_types
+from frl.instrumentation import track_allocations
+from frl.lexer import Lexer
+from frl.machine import evaluate as run_machine
+from frl.object import (
+    Environment,
+    Object,
+    ObjectType,
+)
+from frl.parser import Parser
+from frl.pipeline import optimization_pipeline
+from frl.resolver import Resolver
+from frl.tiering import enable_tiering
+from frl.transpiler import compile_program
+
+
+SOURCES: List[Tuple[str, ObjectType, str]] = [
+    ('stream_range(0, 3)', ObjectType.STREAM, 'stream'),
+    ('collect(stream_range(0, 3))', ObjectType.LIST, 'list(0, 1, 2)'),
+    ('collect(take(stream_range(0, 1000000000000), 3))',
+     ObjectType.LIST, 'list(0, 1, 2)'),
+    ('collect(stream([1, 2]))', ObjectType.LIST, 'list(1.0, 2.0)'),
+    ('collect(stream("ab"))', ObjectType.LIST, 'list(a, b)'),
+    ('collect(stream(push(list(), true)))', ObjectType.LIST, 'list(true)'),
+    ('''
+        var squares = stream_map(stream_range(1, 4), fun(x) { x * x });
+        fold(squares, 0, fun(a, x) { a + x })
+     ''', ObjectType.INTEGERS, '14'),
+    ('''
+        var s = stream_map(stream_range(0, 3), fun(x) { x + 1 });
+        fold(s, 0, fun(a, x) { a + x }) + fold(s, 0, fun(a, x) { a + x })
+     ''', ObjectType.INTEGERS, '12'),
+    ('''
+        fun even(x) { x / 2 * 2 == x };
+        var naturals = iterate(0, fun(x) { x + 1 });
+        collect(take(stream_filter(naturals, even), 4))
+     ''', ObjectType.LIST, 'list(0, 2, 4, 6)'),
+    ('fold(stream_range(0, 3), "", fun(s, x) { s + string(x) })',
+     ObjectType.STRING, '012'),
+    ('fold(take(stream_range(0, 3), -1), 7, fun(a, x) { x })',
+     ObjectType.INTEGERS, '7'),
+    ('collect(stream_map(stream_range(0, 3), fun(x) { x / 0 }))',
+     ObjectType.ERROR, 'Error: Division by zero'),
+    ('collect(stream_map(stream_range(0, 3), fun(x, y) { x }))',
+     ObjectType.ERROR, 'Error: Wrong number of arguments: expected 2, got 1'),
+    ('stream_map(stream_range(0, 3), 1)', ObjectType.ERROR,
+     'Error: Wrong argument type for stream_map: expected FUNCTION, '
+     'got INTEGERS'),
+    ('stream(map())', ObjectType.ERROR,
+     'Error: Wrong argument type for stream: expected VECTOR or LIST or '
+     'STRING or STREAM, got MAP'),
+]
+
+
+class StreamTest(TestCase):
+
+    def test_evaluation(self) -> None:
+        for source, expected_type, expected in SOURCES:
+            self._test_object(evaluate(self._parse(source), Environment()),
+                              expected_type,
+                              expected)
+
+    def test_backends_give_same_results(self) -> None:
+        for source, expected_type, expected in SOURCES:
+            self._test_object(run_machine(self._parse(source), Environment()),
+                              expected_type,
+                              expected)
+            self._test_object(compile_program(self._parse(source)).run(),
+                              expected_type,
+                              expected)
+
+            for unboxed in (False, True):
+                program = self._parse(source)
+                infer_types(program, closed_world=True)
+                enable_tiering(program, threshold=1, unboxed=unboxed)
+
+                self._test_object(evaluate(program, Environment()),
+                                  expected_type,
+                                  expected)
+
+            program = self._parse(source)
+            optimization_pipeline(2, closed_world=True).run(program)
+
+            self._test_object(evaluate(program, Environment()),
+                              expected_type,
+                              expected)
+            self._test_object(compile_program(program).run(),
+                              expected_type,
+                              expected)
+
+    def test_streams_are_not_materialized(self) -> None:
+        program = self._parse('''
+            var values = stream_map(stream_range(0, 20000), fun(x) { x * 2 });
+            fold(stream_filter(values, fun(x) { x > 10 }), 0,
+                 fun(a, x) { a + 1 })
+        ''')
+
+        with track_allocations() as created:
+            self._test_object(evaluate(program, Environment()),
+                              ObjectType.INTEGERS,
+                              '19994')
+
+        self.assertEqual(created['PersistentList'], 0)
+
+    def test_inferred_types(self) -> None:
+        program = self._parse('stream_range(0, 1); collect(stream([1]));')
+        infer_types(program)
+
+        self.assertEqual(program.statements[0].expression.inferred,
+                         ObjectType.STREAM)
+        self.assertEqual(program.statements[1].expression.inferred,
+                         ObjectType.LIST)
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
+
+    def _test_object(self,
+                     evaluated: Optional[Object],
+                     expected_type: ObjectType,
+                     expected: str) -> None:
+        assert evaluated is not None
+        self.assertEqual(evaluated.type(), expected_type)
+        self.assertEqual(evaluated.inspect(), expected)
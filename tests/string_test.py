@@ -0,0 +1,118 @@
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.inference import infer_types
+from frl.lexer import Lexer
+from frl.machine import evaluate as run_machine
+from frl.object import (
+    Environment,
+    Object,
+    ObjectType,
+)
+from frl.parser import Parser
+from frl.pipeline import optimization_pipeline
+from frl.resolver import Resolver
+from frl.tiering import enable_tiering
+from frl.transpiler import compile_program
+
+
+SOURCES: List[Tuple[str, ObjectType, str]] = [
+    ('"hola"', ObjectType.STRING, 'hola'),
+    ('"a" + "b" + ""', ObjectType.STRING, 'ab'),
+    ('"comillas \\" y\\tbarra \\\\"', ObjectType.STRING,
+     'comillas " y\tbarra \\'),
+    ('var s = "hola"; s[1] + s[3]', ObjectType.STRING, 'oa'),
+    ('"a" == "a"', ObjectType.BOOLEAN, 'true'),
+    ('"a" != "a" + ""', ObjectType.BOOLEAN, 'false'),
+    ('"a" + "b" === "ab"', ObjectType.BOOLEAN, 'true'),
+    ('len("hola" + "mundo")', ObjectType.INTEGERS, '9'),
+    ('string(1.5) + " y " + string([1, 2])',
+     ObjectType.STRING, '1.5 y [1.0, 2.0]'),
+    ('''
+        fun build(n, s) {
+            if (n == 0) { return s; }
+            return build(n - 1, s + string(n));
+        };
+        var s = build(500, "");
+        s[0] + s[1388] + string(len(s))
+     ''', ObjectType.STRING, '541392'),
+    ('fun f(s) { s + "!" }; f("hola") + f("")', ObjectType.STRING, 'hola!!'),
+    ('lookup(put(map(), "cla" + "ve", 1), "clave")', ObjectType.INTEGERS, '1'),
+    ('"ab"[2]', ObjectType.ERROR, 'Error: Index out of range: 2'),
+    ('"a" + 1', ObjectType.ERROR, 'Error: Type mismatch: STRING + INTEGERS'),
+    ('"a" - "b"', ObjectType.ERROR,
+     'Error: Unknown operator: STRING - STRING'),
+    ('"a"[true]', ObjectType.ERROR,
+     'Error: Index operator not supported: STRING[BOOLEAN]'),
+]
+
+
+class StringTest(TestCase):
+
+    def test_evaluation(self) -> None:
+        for source, expected_type, expected in SOURCES:
+            self._test_object(evaluate(self._parse(source), Environment()),
+                              expected_type,
+                              expected)
+
+    def test_backends_give_same_results(self) -> None:
+        for source, expected_type, expected in SOURCES:
+            self._test_object(run_machine(self._parse(source), Environment()),
+                              expected_type,
+                              expected)
+            self._test_object(compile_program(self._parse(source)).run(),
+                              expected_type,
+                              expected)
+
+            for unboxed in (False, True):
+                program = self._parse(source)
+                infer_types(program, closed_world=True)
+                enable_tiering(program, threshold=1, unboxed=unboxed)
+
+                self._test_object(evaluate(program, Environment()),
+                                  expected_type,
+                                  expected)
+
+            program = self._parse(source)
+            optimization_pipeline(2, closed_world=True).run(program)
+
+            self._test_object(evaluate(program, Environment()),
+                              expected_type,
+                              expected)
+            self._test_object(compile_program(program).run(),
+                              expected_type,
+                              expected)
+
+    def test_inferred_types(self) -> None:
+        program = self._parse('fun f(s) { s[0] + "!" }; f("a");')
+        infer_types(program, closed_world=True)
+
+        body = program.statements[0].expression.body.statements[0]
+        self.assertEqual(body.expression.inferred, ObjectType.STRING)
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
+
+    def _test_object(self,
+                     evaluated: Optional[Object],
+                     expected_type: ObjectType,
+                     expected: str) -> None:
+        assert evaluated is not None
+        self.assertEqual(evaluated.type(), expected_type)
+        self.assertEqual(evaluated.inspect(), expected)
@@ -0,0 +1,189 @@
+from typing import (
+    cast,
+    List,
+    Optional,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.instrumentation import track_allocations
+from frl.lexer import Lexer
+from frl.object import (
+    Environment,
+    Integer,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.tiering import (
+    enable_tiering,
+    tier_stats,
+)
+
+
+class TieringTest(TestCase):
+
+    def test_compiled_code_gives_same_results(self) -> None:
+        sources: List[str] = [
+            'fun f(x) { -x }; f(5) + f(2.5)',
+            'fun f(x) { !x }; f(true)',
+            'fun f(x, y) { x / y }; f(7, 2) + f(7.0, 2)',
+            'fun f(x) { x + true }; f(1); 9;',
+            'fun f(x) { x / 0 }; f(1) + 1',
+            'fun f(x) { if (x > 1) { 10 } }; f(0)',
+            'fun f(x) { if (x) { 10 } else { 20 } }; f(false)',
+            'fun f() { 9; return 2 * 5; 9; }; f()',
+            'fun f() { var a = 5; var b = a; a + b }; f()',
+            'fun f() { var a = 1; }; f()',
+            'var g = 1; fun f() { g }; f()',
+            'var g = f(); fun f() { g };',
+            'fun f(x) { x(1) }; f(5)',
+            'fun f(x) { x }; f(1, 2)',
+            'fun f() { }; f()',
+            '''
+                var new_adder = fun(x) { fun(y) { x + y } };
+                new_adder(2)(3);
+            ''',
+            '''
+                fun outer(a) {
+                    fun middle(b) { fun(c) { a + b + c } };
+                    middle(2)(3);
+                };
+                outer(1);
+            ''',
+            '''
+                fun fact(n) {
+                    if (n < 2) { return 1; }
+                    return n * fact(n - 1);
+                };
+                fact(10);
+            ''',
+            '''
+                fun count(n, acc) {
+                    if (n == 0) { return acc; }
+                    count(n - 1, acc + 1);
+                };
+                count(100, 0) + 1;
+            ''',
+            'fun f(a, b) { a * b + a / b - -a }; f(7, 2) + f(7.5, 2)',
+            'fun f(a, b) { (a + b) * 2 < a * a }; f(1, 2) == f(5, 0.5)',
+            'fun f(a, b) { (a - b) / (b - b) }; f(1, 2)',
+            'fun f(a, b) { a * b + 1 }; f(true, 2)',
+            'fun f(a, b) { -(a + b) == a }; f(1, 2)',
+            'fun f(a) { !(a * 2) }; f(3)',
+            'fun f(a, g) { g(a) * 2 + a }; f(4, fun(x) { x * 1.5 })',
+            'fun f(a) { (a + 1) * (a + g) }; fun g() { 1 }; f(3)',
+            'fun f() { var x = if (true) { return 1; }; 5 }; f()',
+            'fun f() { 2 + if (true) { return 1; } }; f()',
+            'fun f() { -if (true) { return 1; } }; f()',
+            'fun f() { [if (true) { return 1; }] }; f()',
+            'fun f() { if (true) { return 1; }[0] }; f()',
+            'fun f(x) { g(if (x) { return 1; }, 2) }; fun g(a, b) { b }; f(1)',
+            'fun f() { return if (true) { return 1; } else { 2 }; }; f()',
+            '''
+                fun g(n) { n };
+                fun f() { var x = if (true) { return g(1); }; x + 1 };
+                f();
+            ''',
+            '''
+                fun f(a) { a * 2 + if (a > 3) { return 100; } else { 1 } };
+                f(2) + f(5);
+            ''',
+        ]
+
+        for source in sources:
+            expected = evaluate(*self._prepare(source))
+
+            for unboxed in (False, True):
+                program, env = self._prepare(source)
+                enable_tiering(program, threshold=1, unboxed=unboxed)
+                evaluated = evaluate(program, env)
+
+                self._test_same_object(evaluated, expected)
+
+    def test_unboxed_arithmetic_allocates_less(self) -> None:
+        source: str = '''
+            fun poly(x) { x * x * x + 2.5 * x * x - x / 3.0 + 1.0 };
+            fun sum(n, acc) {
+                if (n == 0) { return acc; }
+                return sum(n - 1, acc + poly(n * 1.0));
+            };
+            sum(50, 0.0);
+        '''
+        created = []
+
+        for unboxed in (False, True):
+            program, env = self._prepare(source)
+            enable_tiering(program, threshold=1, unboxed=unboxed)
+
+            with track_allocations() as floats:
+                evaluated = evaluate(program, env)
+
+            assert evaluated is not None
+            created.append((floats['Float'], evaluated.inspect()))
+
+        self.assertEqual(created[0][1], created[1][1])
+        self.assertLess(created[1][0], created[0][0] / 3)
+
+    def test_cold_functions_stay_interpreted(self) -> None:
+        source: str = '''
+            fun fib(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+            fun double(x) { x * 2 };
+            double(fib(15));
+        '''
+        program, env = self._prepare(source)
+        enable_tiering(program, threshold=100)
+        evaluated = evaluate(program, env)
+
+        self._test_integer_object(evaluated, 1220)
+        self.assertEqual([(stats.name, stats.compiled)
+                          for stats in tier_stats(program)],
+                         [('fib', True), ('double', False)])
+
+    def test_tail_recursion_counts_as_calls(self) -> None:
+        source: str = '''
+            fun count(n, acc) {
+                if (n == 0) { return acc; }
+                return count(n - 1, acc + 1);
+            };
+            count(200, 0);
+        '''
+        program, env = self._prepare(source)
+        enable_tiering(program, threshold=100)
+        evaluated = evaluate(program, env)
+
+        self._test_integer_object(evaluated, 200)
+        self.assertTrue(tier_stats(program)[0].compiled)
+
+    def _prepare(self, source: str) -> tuple:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program, Environment()
+
+    def _test_integer_object(self,
+                             evaluated: Optional[Object],
+                             expected: int) -> None:
+        self.assertIsInstance(evaluated, Integer)
+
+        evaluated = cast(Integer, evaluated)
+        self.assertEqual(evaluated.value, expected)
+
+    def _test_same_object(self,
+                          evaluated: Optional[Object],
+                          expected: Optional[Object]) -> None:
+        if expected is None:
+            self.assertIsNone(evaluated)
+            return
+
+        assert evaluated is not None
+        self.assertEqual(type(evaluated), type(expected))
+        self.assertEqual(evaluated.inspect(), expected.inspect())
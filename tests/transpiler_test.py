@@ -0,0 +1,205 @@
+from typing import (
+    cast,
+    List,
+    Optional,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.lexer import Lexer
+from frl.object import (
+    CompiledFunction,
+    Environment,
+    Error,
+    Integer,
+    Object,
+)
+from frl.parser import Parser
+from frl.resolver import Resolver
+from frl.transpiler import compile_program
+
+
+class TranspilerTest(TestCase):
+
+    def test_same_results_as_evaluator(self) -> None:
+        sources: List[str] = [
+            '5',
+            '-12.5',
+            '-true',
+            '!!true',
+            '!5',
+            '2 * (5 + 10) / 3',
+            '7.0 / 2',
+            '1 == 1.0',
+            '1 === 1.0',
+            '1 !== 1.0',
+            'true == 1',
+            'true != false',
+            '5 + true; 9;',
+            'true + false',
+            '1 < true',
+            '1 / 0',
+            'if (1 > 2) { 10 }',
+            'if (1 < 2) { 10 } else { 20 }',
+            'if (1) { var a = 1; }',
+            'if (1 > 2) { 1 }; 5',
+            '9; return 2 * 5; 9;',
+            'if (10 > 1) { if (20 > 10) { return 1; } return 0; }',
+            'var a = 5; var b = a; var c = a + b + 5; c;',
+            'var a = 5; var a = a + 1; a;',
+            'var a = 1;',
+            '''
+                var x = 1;
+                var y = x + if (x > 0) { var x = 10; x } else { 0 };
+                y;
+            ''',
+            'fun f(x) { x }; f(1, 2)',
+            'var x = 5; x(1)',
+            'f(); fun f() { 1 }',
+            'fun five() { }; five();',
+            'fun(x) { x }(5)',
+            'fun(x, x) { x }(1, 2)',
+            'var add = fun(x, y) { x + y }; add(5, add(5, 5));',
+            'var f = fun(g) { g(2) }; f(fun(x) { x * 3 })',
+            '''
+                var new_adder = fun(x) { fun(y) { x + y } };
+                new_adder(2)(3);
+            ''',
+            '''
+                var a = 1;
+                var f = fun(b) { fun(c) { fun(d) { a + b + c + d } } };
+                var a = 100;
+                f(10)(20)(30);
+            ''',
+            '''
+                fun fact(n) {
+                    if (n < 2) { return 1; }
+                    return n * fact(n - 1);
+                };
+                fact(20);
+            ''',
+            '''
+                var fib = fun(n) {
+                    if (n < 2) { n } else { fib(n - 1) + fib(n - 2) }
+                };
+                fib(15);
+            ''',
+            '''
+                fun is_even(n) {
+                    if (n == 0) { true } else { is_odd(n - 1) }
+                };
+                fun is_odd(n) {
+                    if (n == 0) { false } else { is_even(n - 1) }
+                };
+                is_even(11);
+            ''',
+            '''
+                fun f(n) {
+                    if (n == 0) { return 1 / 0; }
+                    return 1 + f(n - 1);
+                };
+                f(3);
+            ''',
+            'fun f() { var x = if (true) { return 1; }; 5 }; f()',
+            'fun f() { 2 + if (true) { return 1; } }; f()',
+            'fun f() { -if (true) { return 1; } }; f()',
+            'fun f() { [if (true) { return 1; }] }; f()',
+            'fun f() { if (true) { return 1; }[0] }; f()',
+            'fun f(x) { g(if (x) { return 1; }, 2) }; fun g(a, b) { b }; f(1)',
+            'fun f() { return if (true) { return 1; } else { 2 }; }; f()',
+            '''
+                fun g(n) { n };
+                fun f() { var x = if (true) { return g(1); }; x + 1 };
+                f();
+            ''',
+            '''
+                fun f(a) { a * 2 + if (a > 3) { return 100; } else { 1 } };
+                f(2) + f(5);
+            ''',
+        ]
+
+        for source in sources:
+            expected = evaluate(self._prepare(source), Environment())
+            evaluated = compile_program(self._prepare(source)).run()
+
+            self._test_same_object(evaluated, expected)
+
+    def test_self_tail_calls_are_loops(self) -> None:
+        source: str = '''
+            fun count(n, acc) {
+                if (n == 0) { return acc; }
+                return count(n - 1, acc + 1);
+            };
+            count(100000, 0);
+        '''
+        compiled = compile_program(self._prepare(source))
+
+        self.assertIn('while True:', compiled.source)
+        self._test_integer_object(compiled.run(), 100000)
+
+    def test_tail_calls(self) -> None:
+        sources: List[str] = [
+            '''
+                fun is_even(n) { if (n == 0) { 1 } else { is_odd(n - 1) } };
+                fun is_odd(n) { if (n == 0) { 0 } else { is_even(n - 1) } };
+                is_even(10000) + is_odd(10001);
+            ''',
+            '''
+                fun g(n, k) { if (n == 0) { 2 } else { k(n - 1, g) } };
+                fun h(n, k) { k(n, h) };
+                g(10000, h);
+            ''',
+        ]
+
+        for source in sources:
+            self._test_integer_object(
+                compile_program(self._prepare(source)).run(), 2)
+
+    def test_deep_recursion_is_an_error(self) -> None:
+        source: str = '''
+            fun f(n) { if (n == 0) { 0 } else { 1 + f(n - 1) } };
+            f(100000);
+        '''
+        evaluated = compile_program(self._prepare(source)).run()
+
+        self.assertIsInstance(evaluated, Error)
+        self.assertTrue(cast(Error, evaluated).message.startswith(
+            'RecursionError: '))
+
+    def test_function_values(self) -> None:
+        compiled = compile_program(self._prepare('fun(x) { x + 2; };'))
+        evaluated = compiled.run()
+
+        self.assertIsInstance(evaluated, CompiledFunction)
+        self.assertEqual(cast(Object, evaluated).inspect(), 'fun(x) (x + 2)')
+
+    def _prepare(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(parser.errors), 0)
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
+
+    def _test_integer_object(self,
+                             evaluated: Optional[Object],
+                             expected: int) -> None:
+        self.assertIsInstance(evaluated, Integer)
+
+        evaluated = cast(Integer, evaluated)
+        self.assertEqual(evaluated.value, expected)
+
+    def _test_same_object(self,
+                          evaluated: Optional[Object],
+                          expected: Optional[Object]) -> None:
+        if expected is None:
+            self.assertIsNone(evaluated)
+            return
+
+        assert evaluated is not None
+        self.assertEqual(evaluated.type(), expected.type())
+        self.assertEqual(evaluated.inspect(), expected.inspect())
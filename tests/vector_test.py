@@ -0,0 +1,147 @@
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+from unittest import TestCase
+
+from frl.ast import Program
+from frl.evaluator import evaluate
+from frl.inference import infer_types
+from frl.lexer import Lexer
+from frl.machine import evaluate as run_machine
+from frl.object import (
+    Environment,
+    Object,
+    ObjectType,
+)
+from frl.parser import Parser
+from frl.pipeline import optimization_pipeline
+from frl.resolver import Resolver
+from frl.tiering import enable_tiering
+from frl.transpiler import compile_program
+from frl.vector import (
+    new_vector,
+    vector_map,
+)
+
+
+SOURCES: List[Tuple[str, ObjectType, str]] = [
+    ('[1, 2.5, -3]', ObjectType.VECTOR, '[1.0, 2.5, -3.0]'),
+    ('[]', ObjectType.VECTOR, '[]'),
+    ('[1, 2.5] + 1', ObjectType.VECTOR, '[2.0, 3.5]'),
+    ('2 * [1, 2]', ObjectType.VECTOR, '[2.0, 4.0]'),
+    ('-[1, 2] * [3, 4]', ObjectType.VECTOR, '[-3.0, -8.0]'),
+    ('[3, 4] / [2, 8] - [1, 1]', ObjectType.VECTOR, '[0.5, -0.5]'),
+    ('[1, 2] < [2, 2]', ObjectType.VECTOR, '[1.0, 0.0]'),
+    ('[1, 2] >= 2', ObjectType.VECTOR, '[0.0, 1.0]'),
+    ('[1, 2] == 1', ObjectType.VECTOR, '[1.0, 0.0]'),
+    ('[1] != [1]', ObjectType.VECTOR, '[0.0]'),
+    ('[1] == true', ObjectType.BOOLEAN, 'false'),
+    ('var v = [1]; v === v', ObjectType.BOOLEAN, 'true'),
+    ('!![1]', ObjectType.BOOLEAN, 'true'),
+    ('var v = [1, 2, 3]; v[0] + v[2]', ObjectType.FLOAT, '4.0'),
+    ('[1, 2][0] + [3, 4] * [5, 6][1]', ObjectType.VECTOR, '[19.0, 25.0]'),
+    ('fun f(v, s) { v * s + v }; f([1, 2], 3)',
+     ObjectType.VECTOR, '[4.0, 8.0]'),
+    ('fun f(v) { v[1] }; f([4, 5]) + f([6, 7])', ObjectType.FLOAT, '12.0'),
+    ('fun f(x) { [x, x * 2] }; f(1) + f(2)', ObjectType.VECTOR, '[3.0, 6.0]'),
+    ('[1] + [1, 2]',
+     ObjectType.ERROR, 'Error: Vector length mismatch: 1 and 2'),
+    ('[1, true]',
+     ObjectType.ERROR, 'Error: Vector elements must be numbers, got BOOLEAN'),
+    ('[1][1]', ObjectType.ERROR, 'Error: Index out of range: 1'),
+    ('[1][-1]', ObjectType.ERROR, 'Error: Index out of range: -1'),
+    ('[1] / [0]', ObjectType.ERROR, 'Error: Division by zero'),
+    ('[1] + true', ObjectType.ERROR, 'Error: Type mismatch: VECTOR + BOOLEAN'),
+    ('true[0]', ObjectType.ERROR,
+     'Error: Index operator not supported: BOOLEAN[INTEGERS]'),
+    ('[1][0.5]', ObjectType.ERROR,
+     'Error: Index operator not supported: VECTOR[FLOAT]'),
+]
+
+
+class VectorTest(TestCase):
+
+    def test_evaluation(self) -> None:
+        for source, expected_type, expected in SOURCES:
+            self._test_object(evaluate(self._parse(source), Environment()),
+                              expected_type,
+                              expected)
+
+    def test_backends_give_same_results(self) -> None:
+        for source, expected_type, expected in SOURCES:
+            self._test_object(run_machine(self._parse(source), Environment()),
+                              expected_type,
+                              expected)
+            self._test_object(compile_program(self._parse(source)).run(),
+                              expected_type,
+                              expected)
+
+            for unboxed in (False, True):
+                program = self._parse(source)
+                infer_types(program, closed_world=True)
+                enable_tiering(program, threshold=1, unboxed=unboxed)
+
+                self._test_object(evaluate(program, Environment()),
+                                  expected_type,
+                                  expected)
+
+            program = self._parse(source)
+            optimization_pipeline(2, closed_world=True).run(program)
+
+            self._test_object(evaluate(program, Environment()),
+                              expected_type,
+                              expected)
+            self._test_object(compile_program(program).run(),
+                              expected_type,
+                              expected)
+
+    def test_inferred_types(self) -> None:
+        program = self._parse('fun f(v) { -v * 2 }; f([1]); f(1);')
+        infer_types(program, closed_world=True)
+
+        body = program.statements[0].expression.body.statements[0]
+        self.assertEqual(body.expression.inferred, None)
+
+        program = self._parse('fun f(v) { v[0] * 2 }; f([1]);')
+        infer_types(program, closed_world=True)
+
+        body = program.statements[0].expression.body.statements[0]
+        self.assertEqual(body.expression.inferred, ObjectType.FLOAT)
+
+    def test_vector_map(self) -> None:
+        values = new_vector([1, 2, 3]).values
+
+        self.assertEqual(
+            vector_map(lambda left, right: left + right, values, 1).inspect(),
+            '[2.0, 3.0, 4.0]')
+        self.assertEqual(
+            vector_map(lambda left, right: left > right, 2, values).inspect(),
+            '[1.0, 0.0, 0.0]')
+        self.assertEqual(
+            vector_map(lambda left, right: left * right,
+                       values,
+                       values).inspect(),
+            '[1.0, 4.0, 9.0]')
+
+    def _parse(self, source: str) -> Program:
+        parser: Parser = Parser(Lexer(source))
+        program: Program = parser.parse_program()
+
+        self.assertEqual(len(parser.errors), 0)
+
+        resolver: Resolver = Resolver()
+        resolver.resolve(program)
+
+        self.assertEqual(len(resolver.errors), 0)
+
+        return program
+
+    def _test_object(self,
+                     evaluated: Optional[Object],
+                     expected_type: ObjectType,
+                     expected: str) -> None:
+        assert evaluated is not None
+        self.assertEqual(evaluated.type(), expected_type)
+        self.assertEqual(evaluated.inspect(), expected)